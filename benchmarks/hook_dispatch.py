@@ -0,0 +1,62 @@
+"""
+Per-event overhead of hook dispatch.
+
+Compares the old path (``inspect.signature`` on every call, then
+``invoke_hook``) with the precompiled dispatch table, for an event with a
+few no-op listeners.
+
+    python benchmarks/hook_dispatch.py [listeners] [events]
+"""
+import inspect
+import sys
+import time
+
+from seleniumfw.listener_manager import HookDispatch, invoke_hook
+
+
+def _listener_with_args(context, step):
+    pass
+
+
+def _listener_without_args():
+    pass
+
+
+def _old_dispatch(listeners, *args):
+    for hook in listeners:
+        try:
+            if len(inspect.signature(hook).parameters) == 0:
+                invoke_hook(hook)
+            else:
+                invoke_hook(hook, *args)
+        except Exception:
+            pass
+
+
+def _measure(label, func, events):
+    started = time.perf_counter()
+    for _ in range(events):
+        func()
+    elapsed = time.perf_counter() - started
+    print(f"{label:<28} {elapsed / events * 1e9:>9.0f} ns/event")
+
+
+def main(listeners=4, events=200_000):
+    table = HookDispatch()
+    for n in range(listeners):
+        table.register('before_step', _listener_without_args if n % 2 else _listener_with_args)
+    registered = table.listeners['before_step']
+    context, step = object(), object()
+
+    def fast_path():
+        for call in table.calls('before_step'):
+            call(context, step)
+
+    print(f"{listeners} listeners, {events} events")
+    _measure("signature per call", lambda: _old_dispatch(registered, context, step), events)
+    _measure("dispatch.fire", lambda: table.fire('before_step', context, step), events)
+    _measure("dispatch.calls (step path)", fast_path, events)
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
@@ -5,60 +5,59 @@ report generator, and POM-based test execution. Inspired by Katalon.
 
 __version__ = "0.3.2"
 
+import asyncio
 import sys
-from pathlib import Path
-import yaml
 
 from .runner import Runner
+from .plan import compile_plan
+from .exception import PlanError
 from .utils   import Logger
 from .config import Config
 
 config = Config()  # global singleton instance
 
-def run(target=None):
+def run(target=None, dry_run=False):
     logger = Logger.get_logger()
 
     # grab argument
+    args = sys.argv[1:]
+    if "--dry-run" in args:
+        args.remove("--dry-run")
+        dry_run = True
     if not target:
-        if len(sys.argv) < 2:
-            logger.error("Usage: python main.py <test_file|test_collection.yml>")
+        if not args:
+            logger.error("Usage: python main.py <test_file|test_collection.yml> [--dry-run] | --rerun-failed [<stamp>|latest]")
             sys.exit(1)
-        target = sys.argv[1]
-
-    p = Path(target)
-    if not p.exists():
-        logger.error(f"File not found: {p}")
+        target = args[0]
+
+    if target == "--rerun-failed":
+        # python main.py --rerun-failed [<stamp>|latest]
+        stamp = args[1] if len(args) > 1 else "latest"
+        Runner().rerun_failed(stamp)
+        return
+
+    # resolve the whole target once: every suite and case must exist
+    try:
+        plan = compile_plan(target)
+    except PlanError as e:
+        for problem in e.problems:
+            logger.error(problem)
         sys.exit(1)
 
-    runner = Runner()
+    if dry_run:
+        print(plan.describe())
+        return plan
+    for warning in plan.warnings:
+        logger.warning(warning)
 
-    # dispatch by extension + content
-    suffix = p.suffix.lower()
-    if suffix in (".yml", ".yaml"):
-        # load minimal YAML to check for 'testsuites'
+    if str(config.get("async_runner", "false")).lower() == "true":
+        # one event loop; async cases and hooks are awaited, blocking work is offloaded
+        from .async_runner import AsyncRunner
+        runner = AsyncRunner()
         try:
-            spec = yaml.safe_load(p.read_text())
-        except Exception as e:
-            logger.error(f"Failed to parse YAML {p}: {e}")
-            sys.exit(1)
-
-        if isinstance(spec, dict) and "testsuites" in spec:
-            runner.run_suite_collection(str(p))
-        else:
-            runner.run_suite(str(p))
+            asyncio.run(runner.run_plan(plan))
+        finally:
+            runner.close()
+        return
 
-    elif suffix == ".py":
-        runner.run_case(str(p))
-
-    elif suffix == ".feature":
-        runner.run_feature(str(p))
-
-    else:
-        logger.error(
-            "Invalid file type. Provide:\n"
-            " • a .yml/.yaml (with top‑level testsuites: → collection)\n"
-            " • a .yml/.yaml (no testsuites → single suite)\n"
-            " • a .py test case\n"
-            " • a .feature file"
-        )
-        sys.exit(1)
+    Runner().run_plan(plan)
@@ -2,6 +2,8 @@
 
 from flask import Flask, jsonify, request
 import os
+import json
+import tempfile
 import yaml
 import subprocess
 import sys
@@ -11,6 +13,8 @@ from datetime import datetime
 from apscheduler.schedulers.background import BackgroundScheduler
 from pathlib import Path
 from dotenv import load_dotenv
+from seleniumfw.feature_index import get_feature_index, features_referenced_by
+from seleniumfw.distributed import DEFAULT_LEASE_TIMEOUT, Coordinator, build_work_items
 
 load_dotenv()
 
@@ -33,6 +37,15 @@ APP_PORT        = int(os.getenv("APP_PORT", 5006))
 SERVER_URL      = os.getenv("SERVER_URL", f"http://localhost:{APP_PORT}")
 WHATSAPP_API_URL = os.getenv("WHATSAPP_API_URL", f"http://localhost:3001")
 
+# 3. Distributed execution: workers that miss heartbeats for WORKER_TIMEOUT
+#    seconds are dropped and their work items handed to other workers, as
+#    are items still running after LEASE_TIMEOUT seconds
+HEARTBEAT_INTERVAL = int(os.getenv("HEARTBEAT_INTERVAL", 5))
+WORKER_TIMEOUT     = int(os.getenv("WORKER_TIMEOUT", 3 * HEARTBEAT_INTERVAL))
+LEASE_TIMEOUT      = int(os.getenv("LEASE_TIMEOUT", DEFAULT_LEASE_TIMEOUT))
+coordinator = Coordinator(worker_timeout=WORKER_TIMEOUT, lease_timeout=LEASE_TIMEOUT)
+scheduler.add_job(coordinator.reap, trigger="interval", seconds=HEARTBEAT_INTERVAL, id="sfw-worker-reaper")
+
 
 def get_python_interpreter():
     return sys.executable
@@ -65,11 +78,13 @@ def find_all_yaml_files():
             logical_path = f"{key}/{rel.as_posix()}"
             try:
                 yml_data = yaml.safe_load(full_path.read_text())
+                test_cases = yml_data.get("test_cases", [])
                 yaml_files.append({
                     "name":       rel.as_posix(),
                     "path":       logical_path,
-                    "test_cases": yml_data.get("test_cases", []),
-                    "testsuites": yml_data.get("testsuites")
+                    "test_cases": test_cases,
+                    "testsuites": yml_data.get("testsuites"),
+                    "features":   describe_features(test_cases)
                 })
             except Exception as e:
                 yaml_files.append({
@@ -80,6 +95,32 @@ def find_all_yaml_files():
     return yaml_files
 
 
+def describe_features(test_cases):
+    """Scenario counts and tags of the features a suite's test cases run (from the feature index)."""
+    index = get_feature_index(PROJECT_ROOT)
+    features, seen = [], set()
+    for case in test_cases or []:
+        case_path = PROJECT_ROOT / case.replace('\\', '/')
+        for feature_path in features_referenced_by(case_path):
+            if feature_path in seen:
+                continue
+            seen.add(feature_path)
+            try:
+                doc = index.get(PROJECT_ROOT / feature_path)
+            except Exception as e:
+                features.append({"path": feature_path, "error": str(e)})
+                continue
+            tags = sorted({t for sc in doc["scenarios"] for t in sc["tags"]})
+            features.append({
+                "path":      feature_path,
+                "name":      doc["name"],
+                "scenarios": len(doc["scenarios"]),
+                "tags":      tags
+            })
+    index.save()
+    return features
+
+
 @app.route('/api/suites', methods=['GET'])
 def list_test_suites():
     return jsonify(find_all_yaml_files())
@@ -122,7 +163,7 @@ def run_suite():
         reports = []
 
         # Detect all report folder stamps from stderr log
-        stamps = re.findall(r"Report generated at: reports[\\/](\d{8}_\d{6})", stderr)
+        stamps = re.findall(r"Report generated at: reports[\\/](\d{8}_\d{6}(?:_\d+)?)", stderr)
         for stamp in stamps:
             report_dir = PROJECT_ROOT / "reports" / stamp
             report_pdf = report_dir / f"{stamp}.pdf"
@@ -204,6 +245,93 @@ def schedule_suite():
     })
 
 
+@app.route('/api/workers/register', methods=['POST'])
+def register_worker():
+    data = request.get_json() or {}
+    worker = coordinator.register(data.get("name"), data.get("capacity", 1), data.get("host") or request.remote_addr)
+    return jsonify({"worker_id": worker["id"], "heartbeat_interval": HEARTBEAT_INTERVAL})
+
+
+@app.route('/api/workers', methods=['GET'])
+def list_workers():
+    return jsonify(coordinator.describe_workers())
+
+
+@app.route('/api/workers/<worker_id>/heartbeat', methods=['POST'])
+def worker_heartbeat(worker_id):
+    if not coordinator.heartbeat(worker_id):
+        return jsonify({"error": f"Unknown worker: {worker_id}"}), 404
+    return jsonify({"status": "ok"})
+
+
+@app.route('/api/workers/<worker_id>/next', methods=['POST'])
+def next_work_item(worker_id):
+    try:
+        item = coordinator.next_item(worker_id)
+    except KeyError:
+        return jsonify({"error": f"Unknown worker: {worker_id}"}), 404
+    if item is None:
+        return "", 204
+    return jsonify(item)
+
+
+@app.route('/api/workers/<worker_id>/items/<item_id>/result', methods=['POST'])
+def work_item_result(worker_id, item_id):
+    try:
+        result = json.loads(request.form.get("result") or "{}")
+    except ValueError as e:
+        return jsonify({"error": f"Invalid result: {e}"}), 400
+
+    archive = None
+    upload = request.files.get("artifacts")
+    if upload:
+        fd, archive = tempfile.mkstemp(suffix=".zip")
+        os.close(fd)
+        upload.save(archive)
+    try:
+        accepted = coordinator.complete(worker_id, item_id, result, archive)
+    except KeyError:
+        return jsonify({"error": f"Unknown work item: {item_id}"}), 404
+    finally:
+        if archive:
+            os.remove(archive)
+    return jsonify({"accepted": accepted})
+
+
+@app.route('/api/workers/<worker_id>/items/<item_id>/release', methods=['POST'])
+def release_work_item(worker_id, item_id):
+    data = request.get_json(silent=True) or {}
+    try:
+        released = coordinator.release(worker_id, item_id, data.get("reason"))
+    except KeyError:
+        return jsonify({"error": f"Unknown work item: {item_id}"}), 404
+    return jsonify({"released": released})
+
+
+@app.route('/api/jobs', methods=['POST'])
+def submit_job():
+    """Queue a collection for the registered workers; ``items`` defaults to one per suite."""
+    data = request.get_json() or {}
+    collection_path = data.get("collection_path", "")
+    items = data.get("items")
+    if items is None:
+        full = PROJECT_ROOT / collection_path
+        if not collection_path or not full.is_file():
+            return jsonify({"error": f"Not found: {collection_path}"}), 404
+        spec = yaml.safe_load(full.read_text()) or {}
+        items = build_work_items(spec, spec.get("distribute", "suite"), str(PROJECT_ROOT))
+    job = coordinator.submit(collection_path, items)
+    return jsonify(coordinator.job_status(job["id"]))
+
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def job_status(job_id):
+    status = coordinator.job_status(job_id)
+    if status is None:
+        return jsonify({"error": f"Unknown job: {job_id}"}), 404
+    return jsonify(status)
+
+
 def start_server(port=None):
     final_port = port or APP_PORT
     app.run(host="0.0.0.0", port=final_port, debug=True)
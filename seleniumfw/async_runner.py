@@ -0,0 +1,305 @@
+# File: seleniumfw/async_runner.py
+import asyncio
+import contextvars
+import functools
+import inspect
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from seleniumfw.config import Config
+from seleniumfw.driver_pool import release_leased_drivers
+from seleniumfw.exception import CaseTimeout
+from seleniumfw.fail_fast import FailFast, FAILING_STATUSES
+from seleniumfw.hook_profiler import hook_label
+from seleniumfw.listener_manager import dispatch
+from seleniumfw.memory import get_memory_monitor
+from seleniumfw.plan import compile_plan
+from seleniumfw.rerun import save_collection_run
+from seleniumfw.runner import Runner, SuiteRun
+from seleniumfw.thread_context import set_context, delete_context, new_context
+from seleniumfw.utils import Logger
+from seleniumfw.watchdog import stop_case_drivers, track_case_drivers
+
+# executor of the AsyncRunner driving the current task, for run_blocking()
+_active_executor = contextvars.ContextVar("sfw_blocking_executor", default=None)
+
+
+async def run_blocking(func, *args, **kwargs):
+    """
+    Await a blocking call (Selenium, file I/O) on the runner's bounded
+    executor, keeping the caller's context::
+
+        async def run():
+            driver = await run_blocking(BrowserFactory.create_driver)
+            await run_blocking(driver.get, "https://example.com")
+    """
+    loop = asyncio.get_running_loop()
+    ctx = contextvars.copy_context()
+    call = functools.partial(ctx.run, func, *args, **kwargs)
+    return await loop.run_in_executor(_active_executor.get(), call)
+
+
+class AsyncRunner:
+    """
+    asyncio counterpart of ``Runner``.
+
+    Suites and collections run as tasks on one event loop. ``async def``
+    hooks and ``async def run()`` test cases are awaited directly, so an
+    API-heavy case can keep many requests in flight without a thread per
+    request. Everything blocking (synchronous cases, Selenium calls through
+    ``run_blocking``, synchronous hooks such as the report listener) is
+    offloaded to two bounded executors: ``blocking_workers`` threads for
+    test code and ``hook_workers`` threads for hooks.
+
+    Collections with ``execution_method: process`` or ``distributed`` are
+    handed to the synchronous ``Runner`` on a helper thread.
+    """
+
+    def __init__(self, blocking_workers=None, hook_workers=None, runner=None):
+        cfg = Config()
+        self.logger = Logger.get_logger()
+        self.runner = runner or Runner()
+        self.blocking = ThreadPoolExecutor(
+            max_workers=int(blocking_workers or cfg.get("async_blocking_workers", 8)),
+            thread_name_prefix="sfw-blocking",
+        )
+        self.hooks = ThreadPoolExecutor(
+            max_workers=int(hook_workers or cfg.get("async_hook_workers", 2)),
+            thread_name_prefix="sfw-hooks",
+        )
+        # cases waiting for memory_budget_mb admission
+        self.admissions = ThreadPoolExecutor(thread_name_prefix="sfw-admission")
+
+    def close(self):
+        self.blocking.shutdown(wait=True)
+        self.hooks.shutdown(wait=True)
+        self.admissions.shutdown(wait=False)  # a case may still wait for memory
+
+    async def _offload(self, executor, func, *args):
+        loop = asyncio.get_running_loop()
+        ctx = contextvars.copy_context()
+        return await loop.run_in_executor(executor, functools.partial(ctx.run, func, *args))
+
+    async def _fire(self, event, *args):
+        """Run every hook of ``event`` in order, awaiting async ones."""
+        registry = dispatch.registry()
+        for hook in registry.hooks(event):
+            started = time.perf_counter()
+            try:
+                call_args = args if hook.takes_args else ()
+                if hook.background:
+                    # only queues the call, but a full queue may block
+                    await self._offload(self.hooks, hook.call, *args)
+                elif hook.is_async:
+                    await hook.func(*call_args)
+                else:
+                    await self._offload(self.hooks, hook.func, *call_args)
+            except Exception as e:
+                self.logger.error(f"Error invoking hook {hook.name}: {e}", exc_info=True)
+            if registry.profile is not None:
+                registry.profile.record(event, hook_label(hook), time.perf_counter() - started)
+
+    async def run_case(self, case_path):
+        self.logger.info(f"Running test case: {case_path}")
+        mod = self.runner.loader.load_module_from_path(case_path)
+        if not hasattr(mod, "run"):
+            raise Exception(f"No 'run()' function found in {case_path}")
+        if inspect.iscoroutinefunction(mod.run):
+            token = _active_executor.set(self.blocking)
+            try:
+                return await mod.run()
+            finally:
+                _active_executor.reset(token)
+        return await self._offload(self.blocking, mod.run)
+
+    async def run_suite(self, suite_path, abort=None, only_cases=None):
+        """
+        Same contract and result as ``Runner.run_suite``, sharing its suite
+        setup and teardown (``SuiteRun``, pre-warming, memory admission,
+        report bookkeeping); only the hooks and cases are awaited here.
+        """
+        new_context()
+        hook_registry = await self._offload(self.hooks, self.runner._open_suite, suite_path)
+        await self._fire('before_test_suite', suite_path)
+        await self._fire('setup', suite_path)
+
+        run = SuiteRun(self.runner, suite_path, abort, only_cases)
+        run.start_prewarmer()
+        slots = asyncio.Semaphore(run.parallel_cases)
+
+        async def _case_task(case):
+            async with slots:
+                new_context()
+                set_context("screenshots", [])
+                set_context("api_calls", [])
+                return await self._run_or_skip(case, run)
+
+        try:
+            case_results = list(await asyncio.gather(*(_case_task(case) for case in run.cases)))
+        finally:
+            await self._offload(self.blocking, run.stop_prewarmer)
+        for case in run.quarantined:
+            case_results.append(await self._skip_test_case(case, quarantined=True, flakiness=run.flakiness.get(case)))
+
+        await self._fire('teardown', suite_path)
+        rg = self.runner._suite_report(run, hook_registry)
+        await self._fire('after_test_suite', suite_path)
+        return await self._offload(self.hooks, self.runner._close_suite, run, hook_registry, rg, case_results)
+
+    async def _run_or_skip(self, case, run):
+        if run.should_skip():
+            return await self._skip_test_case(case)
+        admission = get_memory_monitor().admission(case)
+        await self._admit(admission)
+        try:
+            if run.should_skip():
+                return await self._skip_test_case(case)
+            data = await self._run_test_case(case, run.retry, run.flakiness.get(case), run.timeouts)
+        finally:
+            # shielded: a cancelled task must still hand its reservation back
+            await asyncio.shield(self._offload(self.admissions, admission.__exit__, None, None, None))
+        return self.runner._record_case(run, data)
+
+    async def _admit(self, admission):
+        """
+        Enter a memory admission. Waiting blocks a thread, so it runs on
+        the admission pool, where waiting cases cannot starve the blocking
+        pool running the others. If the task is cancelled while it waits,
+        the admission is exited as soon as the wait ends.
+        """
+        ctx = contextvars.copy_context()
+        entered = self.admissions.submit(ctx.run, admission.__enter__)
+        try:
+            await asyncio.shield(asyncio.wrap_future(entered))
+        except asyncio.CancelledError:
+            def _exit(future):
+                if not future.cancelled() and future.exception() is None:
+                    ctx.run(admission.__exit__, None, None, None)
+            entered.add_done_callback(_exit)
+            raise
+
+    async def _run_test_case(self, case, retry, flakiness=None, timeouts=None):
+        set_context("test_case", case)
+        await self._fire('setup_test_case', case, None)
+        await self._fire('before_test_case', case)
+
+        attempts = []
+        for attempt in range(1, retry.max_attempts + 1):
+            status, error, started = "passed", None, time.time()
+            seconds, scope = timeouts.for_case() if timeouts else (None, None)
+            try:
+                if seconds is None:
+                    await self.run_case(case)
+                else:
+                    track_case_drivers()
+                    if not await self._run_case_within(case, seconds):
+                        # an offloaded sync case keeps its thread; its browsers are killed
+                        await self._offload(self.hooks, stop_case_drivers, case, seconds, scope)
+                        # it also keeps the old context: this task moves on with a fresh one
+                        new_context()
+                        set_context("case_drivers", [])
+                        status, error = "timeout", CaseTimeout(seconds, scope)
+            except Exception as e:
+                self.logger.error(f"Error running test case {case}: {e}", exc_info=True)
+                status, error = "failed", e
+            attempts.append({
+                "attempt": attempt,
+                "status": status.upper(),
+                "duration": round(time.time() - started, 2),
+                "error": f"{type(error).__name__}: {error}" if error else None,
+            })
+            if not retry.should_retry(error, attempt) or (timeouts and timeouts.suite_expired()):
+                break
+            self.logger.warning(f"🔁 Retrying test case {case} (attempt {attempt + 1}/{retry.max_attempts})")
+            if retry.fresh_driver:
+                await self._offload(self.blocking, release_leased_drivers, True)
+
+        data = {"status": status, "name": case}
+        if retry.count:
+            data["attempts"] = attempts
+        if flakiness is not None:
+            data["flakiness"] = flakiness
+        if status == "timeout":
+            data["timeout"] = {"scope": error.scope, "seconds": round(error.seconds, 1)}
+
+        await self._fire('after_test_case', case, data)
+        await self._fire('teardown_test_case', case, data)
+        await self._offload(self.blocking, release_leased_drivers, status == "timeout")
+        delete_context("test_case")
+        return data
+
+    async def _run_case_within(self, case, seconds):
+        """
+        ``run_case`` with a deadline: ``False`` if it did not finish in time.
+        Errors of the case itself, ``TimeoutError`` from a driver pool
+        included, propagate as failures.
+        """
+        task = asyncio.ensure_future(self.run_case(case))
+        done, _ = await asyncio.wait({task}, timeout=seconds)
+        if not done:
+            task.cancel()
+            return False
+        task.result()
+        return True
+
+    async def _skip_test_case(self, case, quarantined=False, flakiness=None):
+        self.logger.info(f"Skipping test case{' (quarantined as flaky)' if quarantined else ''}: {case}")
+        data = {"status": "skipped", "name": case}
+        if quarantined:
+            data.update(quarantined=True, flakiness=flakiness)
+        await self._fire('after_test_case', case, data)
+        return data
+
+    async def run_collection(self, collection_path, plan=None):
+        """
+        Run a collection: ``sequential`` awaits the suites one by one,
+        ``parallel`` keeps up to ``max_concurrent_instances`` suite tasks
+        running. Results come back in YAML order like ``run_suite_collection``.
+        """
+        if plan is None:
+            plan = compile_plan(collection_path)
+            for warning in plan.warnings:
+                self.logger.warning(warning)
+        spec = plan.settings
+        method = spec.get("execution_method", "sequential")
+        if method in ("process", "distributed"):
+            return await asyncio.get_running_loop().run_in_executor(
+                None, functools.partial(self.runner.run_suite_collection, collection_path, plan)
+            )
+
+        project_root = os.getcwd()
+        max_inst = spec.get("max_concurrent_instances", 1) if method == "parallel" else 1
+        delay = spec.get("delay_between_instances(s)", 0) or 0
+        fail_fast = FailFast.from_spec(spec)
+        slots = asyncio.Semaphore(max(1, max_inst))
+
+        async def _suite_task(n, suite):
+            await asyncio.sleep(delay * n if max_inst > 1 else 0)
+            async with slots:
+                if fail_fast.tripped():
+                    self.logger.info(f"⏭ Skipping suite (fail-fast): {suite.path}")
+                    return {"suite_path": os.path.join(project_root, suite.path), "report_dir": None,
+                            "skipped": True, "testcase_results": []}
+                suite_path = os.path.join(project_root, suite.path)
+                self.logger.info(f"▶ Running suite: {suite_path}")
+                result = await self.run_suite(suite_path, abort=fail_fast.event if fail_fast.enabled else None)
+                fail_fast.record(any(c["status"] in FAILING_STATUSES for c in result["testcase_results"]))
+                if max_inst == 1 and delay:
+                    await asyncio.sleep(delay)
+                return result
+
+        results = list(await asyncio.gather(*(_suite_task(n, s) for n, s in enumerate(plan.suites))))
+        self.runner._log_collection_summary(collection_path, results)
+        save_collection_run(collection_path, results)
+        return results
+
+    async def run_plan(self, plan):
+        """Async counterpart of ``Runner.run_plan``."""
+        if plan.kind == "collection":
+            return await self.run_collection(plan.source, plan=plan)
+        if plan.kind == "suite":
+            return await self.run_suite(plan.source)
+        if plan.kind == "case":
+            return await self.run_case(plan.source)
+        return await self._offload(self.blocking, self.runner.run_feature, plan.source)
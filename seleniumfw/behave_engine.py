@@ -0,0 +1,169 @@
+# File: seleniumfw/behave_engine.py
+import threading
+from behave.configuration import Configuration
+from behave.formatter._registry import make_formatters
+from behave.runner import Context, Runner as BehaveRunner
+from behave.runner_util import parse_features
+from seleniumfw.feature_index import get_feature_index
+from seleniumfw.utils import Logger
+
+logger = Logger.get_logger()
+
+
+class _WarmRunner(BehaveRunner):
+    """behave Runner that takes hooks and step definitions from the engine."""
+
+    def __init__(self, config, engine):
+        super().__init__(config)
+        self._engine = engine
+
+    def load_hooks(self, filename=None):
+        self.hooks = self._engine._load_hooks(self, filename)
+
+    def load_step_definitions(self, extra_step_paths=None):
+        self._engine._load_steps(self, extra_step_paths)
+
+    def run_with_paths(self):
+        # behave's own run_with_paths, with parsing left to the engine
+        self.context = Context(self)
+        self.load_hooks()
+        self.load_step_definitions()
+        locations = [location for location in self.feature_locations() if not self.config.exclude(location)]
+        self.features.extend(self._engine._parse_features(locations, self.config.lang))
+        self.formatters = make_formatters(self.config, self.config.outputs)
+        return self.run_model()
+
+
+class BehaveEngine:
+    """
+    Long-lived replacement for calling ``behave.__main__.main`` per feature.
+
+    ``environment.py`` and the step modules of a base directory are loaded
+    once per process; later runs reuse the hooks and the warm step registry.
+    Only the (cheap) command-line configuration is rebuilt per run, because
+    behave keeps per-run reporter state on it.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._hooks = {}            # (base_dir, filename) -> hooks dict
+        self._steps_loaded = set()  # base dirs whose steps are registered
+
+    def run(self, feature_path, tags=None, names=None, extra_args=None):
+        """
+        Run one feature path and return a structured result::
+
+            {"exit_code": 0, "failed": False, "error": None, "undefined_steps": 0,
+             "features": [{"name", "filename", "status", "duration",
+                           "scenarios": [{"name", "status", "duration", "tags", "line"}]}]}
+        """
+        args = list(extra_args or [])
+        if tags:
+            args.extend(["--tags", tags])
+        for name in names or []:
+            args.extend(["--name", name])
+        args.append(feature_path)
+
+        try:
+            config = Configuration(args)
+        except Exception as e:
+            logger.error(f"Invalid behave configuration {args}: {e}")
+            return self._result(None, True, f"{e.__class__.__name__}: {e}")
+        self._apply_default_format(config)
+
+        runner = _WarmRunner(config, self)
+        failed, error = True, None
+        try:
+            failed = runner.run()
+        except Exception as e:
+            logger.error(f"behave run of {feature_path} failed: {e}", exc_info=True)
+            error = f"{e.__class__.__name__}: {e}"
+
+        if config.show_snippets and runner.undefined_steps:
+            from behave.__main__ import print_undefined_step_snippets
+            print_undefined_step_snippets(runner.undefined_steps)
+        return self._result(runner, failed, error)
+
+    def _apply_default_format(self, config):
+        # mirrors behave.__main__.run_behave
+        if not config.format:
+            config.format = [config.default_format]
+        elif "format" in config.defaults and len(config.format) == len(config.defaults["format"]):
+            config.format.append(config.default_format)
+
+    def _load_hooks(self, runner, filename):
+        key = (runner.base_dir, filename)
+        with self._lock:
+            hooks = self._hooks.get(key)
+            if hooks is None:
+                BehaveRunner.load_hooks(runner, filename)
+                self._hooks[key] = hooks = dict(runner.hooks)
+                logger.info(f"Loaded behave hooks from {runner.base_dir}")
+        return dict(hooks)
+
+    def _load_steps(self, runner, extra_step_paths):
+        with self._lock:
+            if runner.base_dir in self._steps_loaded:
+                return
+            BehaveRunner.load_step_definitions(runner, extra_step_paths)
+            self._steps_loaded.add(runner.base_dir)
+            logger.info(f"Loaded step definitions from {runner.base_dir}")
+
+    def _parse_features(self, locations, language):
+        """
+        Models for ``locations``. A whole-file location the feature index has
+        just parsed (a tag pre-filter on a cold cache) reuses that model, so
+        no feature is parsed twice; everything else goes to behave's parser.
+        """
+        features = []
+        for location in locations:
+            model = None
+            if not language and not getattr(location, "line", None):
+                model = get_feature_index().take_model(location.filename)
+            features.extend([model] if model is not None else parse_features([location], language=language))
+        return features
+
+    def _result(self, runner, failed, error):
+        features = []
+        for feature in getattr(runner, "features", []):
+            scenarios = [
+                {
+                    "name": scenario.name,
+                    "status": _status_name(scenario.status),
+                    "duration": round(scenario.duration, 2),
+                    "tags": list(scenario.tags),
+                    "line": scenario.line,
+                }
+                for scenario in feature.walk_scenarios()
+            ]
+            features.append({
+                "name": feature.name,
+                "filename": feature.filename,
+                "status": _status_name(feature.status),
+                "duration": round(feature.duration, 2),
+                "scenarios": scenarios,
+            })
+        return {
+            "exit_code": 1 if failed else 0,
+            "failed": bool(failed),
+            "error": error,
+            "undefined_steps": len(getattr(runner, "undefined_steps", [])),
+            "features": features,
+        }
+
+
+def _status_name(status):
+    return getattr(status, "name", str(status)).upper()
+
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def get_behave_engine():
+    """Process-wide engine shared by every Runner."""
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = BehaveEngine()
+        return _engine
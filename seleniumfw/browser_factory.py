@@ -1,42 +1,80 @@
 # File: seleniumfw/browser_factory.py
 import os
+import time
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options as ChromeOptions
 from selenium.webdriver.firefox.options import Options as FirefoxOptions
 from seleniumfw.config import Config
 from seleniumfw.thread_context import get_context, set_context
+from seleniumfw.driver_pool import get_driver_pool
+from seleniumfw.ramp_up import launch_monitor
+from seleniumfw.memory import get_memory_monitor
+from seleniumfw.screenshot_scaler import get_screenshot_scaler
 
 class BrowserFactory:
     @staticmethod
-    def create_driver():
+    def create_driver(browser=None, args=None):
         cfg = Config()
-        browser = cfg.get("browser", "chrome").lower()
-        extra_args = cfg.get_list("args")
-        print(f"Creating {browser} driver with args: {extra_args}")
+        browser = (browser or cfg.get("browser", "chrome")).lower()
+        extra_args = list(args) if args is not None else cfg.get_list("args")
 
-        if browser == "chrome":
-            options = ChromeOptions()
-            for arg in extra_args:
-                options.add_argument(arg)
-            driver = webdriver.Chrome(options=options)
+        # Ensure screenshots list exists for this thread
+        if get_context("screenshots") is None:
+            set_context("screenshots", [])
 
-        elif browser == "firefox":
-            options = FirefoxOptions()
-            for arg in extra_args:
-                if arg == "--headless":
-                    options.add_argument(arg)
-                elif arg == "--incognito":
-                    options.set_preference("browser.privatebrowsing.autostart", True)
-                else:
+        # A suite with prewarm_drivers may already have one booted for us
+        prewarmer = get_context("prewarmer")
+        if prewarmer is not None:
+            driver = prewarmer.take(browser, extra_args)
+            if driver is not None:
+                print(f"Using pre-warmed {browser} driver")
+                return BrowserFactory._track(driver)
+
+        return BrowserFactory._track(BrowserFactory._launch_driver(browser, extra_args))
+
+    @staticmethod
+    def _track(driver):
+        # the case timeout watchdog kills the drivers its case created
+        case_drivers = get_context("case_drivers")
+        if case_drivers is not None:
+            case_drivers.append(driver)
+        return driver
+
+    @staticmethod
+    def _launch_driver(browser, extra_args, owner=None):
+        print(f"Creating {browser} driver with args: {extra_args}")
+        # idle pooled browsers give way to this one when the budget is full
+        get_memory_monitor().make_room()
+
+        # launch latency feeds the adaptive ramp-up of collections
+        started = time.time()
+        try:
+            if browser == "chrome":
+                options = ChromeOptions()
+                for arg in extra_args:
                     options.add_argument(arg)
-            driver = webdriver.Firefox(options=options)
+                driver = webdriver.Chrome(options=options)
 
-        else:
-            raise Exception(f"Unsupported browser: {browser}")
+            elif browser == "firefox":
+                options = FirefoxOptions()
+                for arg in extra_args:
+                    if arg == "--headless":
+                        options.add_argument(arg)
+                    elif arg == "--incognito":
+                        options.set_preference("browser.privatebrowsing.autostart", True)
+                    else:
+                        options.add_argument(arg)
+                driver = webdriver.Firefox(options=options)
 
-        # Ensure screenshots list exists for this thread
-        if get_context("screenshots") is None:
-            set_context("screenshots", [])
+            else:
+                raise Exception(f"Unsupported browser: {browser}")
+        except Exception:
+            launch_monitor.record(time.time() - started, ok=False)
+            raise
+        launch_monitor.record(time.time() - started)
+        # resident memory of the browser tree counts against memory_budget_mb
+        # and towards the peak of its suite (``owner``, default: this context's)
+        get_memory_monitor().register(driver, owner=owner)
 
         original_save = driver.save_screenshot
 
@@ -64,7 +102,26 @@ class BrowserFactory:
             screenshots.append(abs_path)
             set_context("screenshots", screenshots)
 
-            return original_save(path, *a, **kw)
+            saved = original_save(path, *a, **kw)
+            if saved:
+                # start the report's downscaled copy while the test goes on
+                report = get_context("report")
+                if report is not None:
+                    get_screenshot_scaler().submit(abs_path, report.run_dir)
+            return saved
 
         driver.save_screenshot = save_to_report
         return driver
+
+    @staticmethod
+    def acquire_driver(browser=None, args=None, timeout=None):
+        """
+        Lease a driver from the shared pool instead of launching a new one.
+        Hand it back with ``release_driver``; anything still leased when the
+        test case ends is returned by the runner.
+        """
+        return get_driver_pool().acquire(browser, args, timeout=timeout)
+
+    @staticmethod
+    def release_driver(driver, discard=False):
+        get_driver_pool().release(driver, discard=discard)
@@ -0,0 +1,583 @@
+# File: seleniumfw/distributed.py
+import json
+import os
+import shutil
+import socket
+import tempfile
+import threading
+import time
+import uuid
+import zipfile
+
+import requests
+import yaml
+
+from seleniumfw.history import RunHistory, schedule_longest_first
+from seleniumfw.utils import Logger
+
+# seconds run_distributed waits for a job unless the collection sets job_timeout
+DEFAULT_JOB_TIMEOUT = 6 * 60 * 60
+# seconds a leased item may stay unfinished before the coordinator hands it to another worker
+DEFAULT_LEASE_TIMEOUT = 2 * 60 * 60
+
+
+def build_work_items(spec, granularity="suite", project_root=None):
+    """
+    Work items of a collection spec for ``execution_method: distributed``,
+    longest first according to report history::
+
+        [{"suite": "testsuites/login.yml", "cases": None}, ...]            # granularity: suite
+        [{"suite": "testsuites/login.yml", "cases": ["testcases/a.py"]}]   # granularity: case
+
+    ``cases`` None means the whole suite.
+    """
+    project_root = project_root or os.getcwd()
+    history = RunHistory(max_runs=spec.get("history_runs", 5))
+    items, estimates = [], {}
+    for suite in spec.get("testsuites", []):
+        if granularity != "case":
+            items.append({"suite": suite, "cases": None})
+            estimates[len(items) - 1] = history.estimate_suite(suite)
+            continue
+        with open(os.path.join(project_root, suite)) as f:
+            suite_spec = yaml.safe_load(f) or {}
+        for case in suite_spec.get("test_cases", []):
+            case = case.replace('\\', '/')
+            items.append({"suite": suite, "cases": [case]})
+            estimates[len(items) - 1] = history.estimate_case(case)
+
+    if spec.get("scheduling", "history") != "history":
+        return items
+    ordered, _ = schedule_longest_first(list(range(len(items))), estimates, 1)
+    return [items[i] for i in ordered]
+
+
+def _safe_extract(archive, dest):
+    """Extract a zip refusing members that would land outside ``dest``."""
+    dest = os.path.realpath(dest)
+    with zipfile.ZipFile(archive) as zf:
+        for member in zf.namelist():
+            target = os.path.realpath(os.path.join(dest, member))
+            if os.path.commonpath([dest, target]) != dest:
+                raise ValueError(f"Refusing to extract {member} outside {dest}")
+        zf.extractall(dest)
+
+
+class Coordinator:
+    """
+    In-memory work queue behind the ``/api/workers`` and ``/api/jobs``
+    endpoints of the API server.
+
+    A job is a list of work items (see ``build_work_items``). Workers lease
+    items one at a time and post back the result plus a zip of their report
+    folder. Workers that miss heartbeats for ``worker_timeout`` seconds are
+    dropped by ``reap()`` and their leased items go back to the queue, up to
+    ``max_attempts`` leases per item. So do items still leased after
+    ``lease_timeout`` seconds, even while their worker is alive, and items
+    a worker releases because it could not deliver the result. When every
+    item is done the results are merged into one report under ``reports/``.
+    """
+
+    def __init__(self, reports_dir="reports", worker_timeout=15, max_attempts=3, lease_timeout=DEFAULT_LEASE_TIMEOUT):
+        self.logger = Logger.get_logger()
+        self.reports_dir = reports_dir
+        self.worker_timeout = worker_timeout
+        self.lease_timeout = lease_timeout
+        self.max_attempts = max_attempts
+        self.workers = {}
+        self.jobs = {}
+        self._queue = []  # (job_id, item_id) in dispatch order
+        self._lock = threading.Lock()
+
+    # -- workers -----------------------------------------------------------
+
+    def register(self, name=None, capacity=1, host=None):
+        worker = {
+            "id": uuid.uuid4().hex[:12],
+            "name": name or f"worker-{len(self.workers) + 1}",
+            "host": host,
+            "capacity": int(capacity or 1),
+            "registered_at": time.time(),
+            "last_seen": time.time(),
+            "items": set(),
+        }
+        with self._lock:
+            self.workers[worker["id"]] = worker
+        self.logger.info(f"Worker registered: {worker['name']} ({worker['id']}) from {host}, capacity {worker['capacity']}")
+        return worker
+
+    def heartbeat(self, worker_id):
+        """False for unknown (e.g. reaped) workers, which should register again."""
+        with self._lock:
+            worker = self.workers.get(worker_id)
+            if worker is None:
+                return False
+            worker["last_seen"] = time.time()
+            return True
+
+    def reap(self):
+        """
+        Drop silent workers and requeue their items, and requeue items whose
+        lease ran past ``lease_timeout``; returns the requeued item ids.
+        """
+        now = time.time()
+        requeued = []
+        with self._lock:
+            for worker_id, worker in list(self.workers.items()):
+                if now - worker["last_seen"] <= self.worker_timeout:
+                    continue
+                del self.workers[worker_id]
+                self.logger.warning(f"Worker {worker['name']} ({worker_id}) missed heartbeats; reassigning {len(worker['items'])} item(s)")
+                for job_id, item_id in worker["items"]:
+                    if self._requeue(job_id, item_id, worker_id, worker["name"]):
+                        requeued.append(item_id)
+            for worker_id, worker in self.workers.items():
+                for job_id, item_id in list(worker["items"]):
+                    item = self.jobs[job_id]["items"][item_id]
+                    if item["state"] == "leased" and now - item["leased_at"] > self.lease_timeout:
+                        self.logger.warning(f"Item {item_id} still running on {worker['name']} after "
+                                            f"{self.lease_timeout:.0f}s; reassigning it")
+                        worker["items"].discard((job_id, item_id))
+                        if self._requeue(job_id, item_id, worker_id, worker["name"]):
+                            requeued.append(item_id)
+            finished = [job_id for job_id, job in self.jobs.items() if self._all_done(job)]
+        for job_id in finished:
+            self._finish(job_id)
+        return requeued
+
+    def release(self, worker_id, item_id, reason=None):
+        """
+        A worker gives a leased item back (e.g. it could not deliver the
+        result); it is requeued or, after ``max_attempts`` leases, failed.
+        """
+        job_id = item_id.rsplit("-", 1)[0]
+        with self._lock:
+            job = self.jobs.get(job_id)
+            if job is None or item_id not in job["items"]:
+                raise KeyError(item_id)
+            worker = self.workers.get(worker_id)
+            if worker is not None:
+                worker["items"].discard((job_id, item_id))
+            name = worker["name"] if worker is not None else worker_id
+            self.logger.warning(f"Worker {name} released item {item_id}" + (f": {reason}" if reason else ""))
+            released = self._requeue(job_id, item_id, worker_id, name)
+            finished = self._all_done(job)
+        if finished:
+            self._finish(job_id)
+        return released
+
+    def _requeue(self, job_id, item_id, worker_id, worker_name):
+        """Take an item back from the worker holding it (caller holds the lock)."""
+        item = self.jobs[job_id]["items"][item_id]
+        if item["state"] != "leased" or item["worker"] != worker_id:
+            return False
+        if item["leases"] >= self.max_attempts:
+            self._lost(self.jobs[job_id], item, worker_name)
+            return False
+        item.update(state="pending", worker=None)
+        self._queue.insert(0, (job_id, item_id))
+        return True
+
+    def _lost(self, job, item, worker_name):
+        cases = item["cases"] or [item["suite"]]
+        item.update(state="done", result={
+            "suite_path": item["suite"],
+            "worker": worker_name,
+            "error": f"worker lost {item['leases']} time(s)",
+            "testcase_results": [{"name": c, "status": "failed"} for c in cases],
+        })
+
+    def describe_workers(self):
+        with self._lock:
+            return [
+                {k: (sorted(v) if k == "items" else v) for k, v in w.items()}
+                for w in self.workers.values()
+            ]
+
+    # -- jobs --------------------------------------------------------------
+
+    def submit(self, collection_path, items):
+        job_id = uuid.uuid4().hex[:12]
+        job = {
+            "id": job_id,
+            "collection_path": collection_path,
+            "status": "running",
+            "submitted_at": time.time(),
+            "finished_at": None,
+            "report_dir": None,
+            "items": {},
+        }
+        for n, spec in enumerate(items, start=1):
+            item_id = f"{job_id}-{n}"
+            job["items"][item_id] = {
+                "id": item_id, "job_id": job_id, "suite": spec["suite"], "cases": spec.get("cases"),
+                "state": "pending", "worker": None, "leases": 0, "result": None, "artifacts": None,
+            }
+        with self._lock:
+            self.jobs[job_id] = job
+            self._queue.extend((job_id, item_id) for item_id in job["items"])
+        self.logger.info(f"Job {job_id} submitted: {collection_path} with {len(items)} work item(s)")
+        if not items:
+            self._finish(job_id)
+        return job
+
+    def next_item(self, worker_id):
+        """Lease the next pending item to a worker, or None when the queue is empty."""
+        with self._lock:
+            worker = self.workers.get(worker_id)
+            if worker is None:
+                raise KeyError(worker_id)
+            worker["last_seen"] = time.time()
+            while self._queue:
+                job_id, item_id = self._queue.pop(0)
+                item = self.jobs[job_id]["items"][item_id]
+                if item["state"] != "pending":
+                    continue
+                item.update(state="leased", worker=worker_id, leased_at=time.time())
+                item["leases"] += 1
+                worker["items"].add((job_id, item_id))
+                return {k: item[k] for k in ("id", "job_id", "suite", "cases", "leases")}
+        return None
+
+    def complete(self, worker_id, item_id, result, artifacts=None):
+        """
+        Store a worker's result. ``artifacts`` is a path to a zip of its report
+        folder. The first result for an item wins, so a worker that was reaped
+        but finished anyway is accepted unless the item was already done.
+
+        Artifacts are unpacked (outside the lock, into a scratch folder)
+        before the item is marked done, so the merge never sees a done item
+        without its report files.
+        """
+        job_id = item_id.rsplit("-", 1)[0]
+        with self._lock:
+            job = self.jobs.get(job_id)
+            item = job and job["items"].get(item_id)
+            if item is None:
+                raise KeyError(item_id)
+            worker = self.workers.get(worker_id)
+            if worker is not None:
+                worker["items"].discard((job_id, item_id))
+                worker["last_seen"] = time.time()
+            if item["state"] == "done":
+                return False
+
+        unpacked = None
+        if artifacts:
+            job_dir = os.path.join(self.reports_dir, "distributed", job_id)
+            os.makedirs(job_dir, exist_ok=True)
+            unpacked = tempfile.mkdtemp(prefix=f".{item_id}-", dir=job_dir)
+            try:
+                _safe_extract(artifacts, unpacked)
+            except (OSError, ValueError, zipfile.BadZipFile) as e:
+                self.logger.error(f"Could not unpack artifacts of {item_id}: {e}")
+                shutil.rmtree(unpacked, ignore_errors=True)
+                unpacked = None
+
+        with self._lock:
+            if item["state"] == "done":
+                # another worker's result for the same item got in first
+                if unpacked:
+                    shutil.rmtree(unpacked, ignore_errors=True)
+                return False
+            if unpacked:
+                dest = os.path.join(self.reports_dir, "distributed", job_id, item_id)
+                os.replace(unpacked, dest)
+                item["artifacts"] = dest
+            item.update(state="done", result=result, worker=worker_id)
+            finished = self._all_done(job)
+
+        if finished:
+            self._finish(job_id)
+        return True
+
+    def _all_done(self, job):
+        return job["status"] == "running" and all(i["state"] == "done" for i in job["items"].values())
+
+    def _finish(self, job_id):
+        with self._lock:
+            job = self.jobs[job_id]
+            if job["status"] != "running":
+                return
+            job["status"] = "merging"
+        try:
+            job["report_dir"] = self._merge_report(job)
+        except Exception as e:
+            self.logger.error(f"Could not merge report for job {job_id}: {e}", exc_info=True)
+        job["finished_at"] = time.time()
+        job["status"] = "finished"
+        self.logger.info(f"Job {job_id} finished; merged report: {job['report_dir']}")
+
+    def _merge_report(self, job):
+        """One report for the whole job, from the workers' result.json/cucumber.json."""
+        from seleniumfw.report_generator import ReportGenerator
+
+        rg = ReportGenerator(base_dir=self.reports_dir)
+        for item in job["items"].values():
+            overview, scenarios = self._item_report(item)
+            worker_dir = (item["result"] or {}).get("report_dir") or ""
+            for case in overview.get("testcase_results", []):
+                rg.record_test_case_result(
+                    case["name"], case["status"].upper(), case.get("duration", 0),
+                    attempts=case.get("attempts"), flakiness=case.get("flakiness"),
+                    quarantined=case.get("quarantined", False),
+                )
+            for sc in scenarios:
+                # screenshots were uploaded with the artifacts
+                shots = [self._local_path(p, worker_dir, item["artifacts"]) for p in sc.get("screenshot", [])]
+                rg.record(sc["feature"], sc["scenario"], sc["status"], sc["duration"], shots,
+                          sc.get("steps"), sc.get("category", "positive"), sc.get("api_calls"),
+                          testcase=sc.get("testcase"))
+        rg.record_overview(job["collection_path"], round(time.time() - job["submitted_at"], 2),
+                           job["submitted_at"], time.time())
+        rg.overriew["distributed"] = {
+            "job_id": job["id"],
+            "items": [
+                {"id": i["id"], "suite": i["suite"], "cases": i["cases"], "leases": i["leases"],
+                 "worker": (i["result"] or {}).get("worker"), "artifacts": i["artifacts"],
+                 "error": (i["result"] or {}).get("error")}
+                for i in job["items"].values()
+            ],
+        }
+        return rg.finalize(job["collection_path"])
+
+    def _item_report(self, item):
+        result = item["result"] or {}
+        overview = {"testcase_results": [
+            {"name": c["name"], "status": c["status"], "duration": 0} for c in result.get("testcase_results", [])
+        ]}
+        scenarios = []
+        if item["artifacts"]:
+            overview_path = os.path.join(item["artifacts"], "result.json")
+            cucumber_path = os.path.join(item["artifacts"], "cucumber.json")
+            if os.path.isfile(overview_path):
+                with open(overview_path) as f:
+                    overview = json.load(f)
+            if os.path.isfile(cucumber_path):
+                with open(cucumber_path) as f:
+                    scenarios = json.load(f)
+        return overview, scenarios
+
+    @staticmethod
+    def _local_path(path, worker_dir, artifacts_dir):
+        norm = path.replace('\\', '/')
+        worker_dir = worker_dir.replace('\\', '/').rstrip('/')
+        if artifacts_dir and worker_dir and norm.startswith(worker_dir + "/"):
+            return os.path.join(artifacts_dir, norm[len(worker_dir) + 1:])
+        return path
+
+    def job_status(self, job_id):
+        job = self.jobs.get(job_id)
+        if job is None:
+            return None
+        items = list(job["items"].values())
+        return {
+            "id": job["id"],
+            "collection_path": job["collection_path"],
+            "status": job["status"],
+            "report_dir": job["report_dir"],
+            "total": len(items),
+            "pending": sum(1 for i in items if i["state"] == "pending"),
+            "leased": sum(1 for i in items if i["state"] == "leased"),
+            "done": sum(1 for i in items if i["state"] == "done"),
+            "items": [{k: i[k] for k in ("id", "suite", "cases", "state", "worker", "leases", "result")} for i in items],
+        }
+
+
+class Worker:
+    """
+    Worker node for a coordinator (``sfw worker --coordinator URL``).
+
+    Runs in a checkout of the same project: registers, sends heartbeats from
+    a background thread, pulls work items with up to ``capacity`` running at
+    once, and posts each result together with a zip of its report folder.
+    With ``idle_timeout`` set it exits after that many seconds without work.
+    """
+
+    def __init__(self, coordinator_url, name=None, capacity=1, heartbeat_interval=5,
+                 poll_interval=2, idle_timeout=None):
+        self.logger = Logger.get_logger()
+        self.url = coordinator_url.rstrip("/")
+        self.name = name or f"{socket.gethostname()}-{os.getpid()}"
+        self.capacity = max(1, int(capacity))
+        self.heartbeat_interval = heartbeat_interval
+        self.poll_interval = poll_interval
+        self.idle_timeout = idle_timeout
+        self.worker_id = None
+        self._stop = threading.Event()
+        self._last_work = time.time()
+        self._lock = threading.Lock()
+
+    def register(self):
+        resp = requests.post(f"{self.url}/api/workers/register", json={
+            "name": self.name, "capacity": self.capacity, "host": socket.gethostname(),
+        }, timeout=10)
+        resp.raise_for_status()
+        self.worker_id = resp.json()["worker_id"]
+        self.heartbeat_interval = resp.json().get("heartbeat_interval", self.heartbeat_interval)
+        self.logger.info(f"Registered with {self.url} as {self.name} ({self.worker_id})")
+
+    def _heartbeat_loop(self):
+        while not self._stop.wait(self.heartbeat_interval):
+            try:
+                resp = requests.post(f"{self.url}/api/workers/{self.worker_id}/heartbeat", timeout=10)
+                if resp.status_code == 404:
+                    self.logger.warning("Coordinator no longer knows this worker; registering again")
+                    self.register()
+            except requests.RequestException as e:
+                self.logger.warning(f"Heartbeat failed: {e}")
+
+    def run(self):
+        self.register()
+        threading.Thread(target=self._heartbeat_loop, name="sfw-heartbeat", daemon=True).start()
+        slots = [threading.Thread(target=self._slot_loop, name=f"sfw-slot-{n}") for n in range(self.capacity)]
+        for t in slots:
+            t.start()
+        try:
+            for t in slots:
+                t.join()
+        except KeyboardInterrupt:
+            self.logger.info("Stopping worker after the running items finish")
+            self._stop.set()
+            for t in slots:
+                t.join()
+        self._stop.set()
+
+    def _slot_loop(self):
+        while not self._stop.is_set():
+            try:
+                item = self._next_item()
+            except requests.RequestException as e:
+                self.logger.warning(f"Could not reach coordinator: {e}")
+                item = None
+            if item is None:
+                with self._lock:
+                    idle = time.time() - self._last_work
+                if self.idle_timeout is not None and idle >= self.idle_timeout:
+                    self._stop.set()
+                    break
+                self._stop.wait(self.poll_interval)
+                continue
+            self.run_item(item)
+            with self._lock:
+                self._last_work = time.time()
+
+    def _next_item(self):
+        resp = requests.post(f"{self.url}/api/workers/{self.worker_id}/next", timeout=10)
+        if resp.status_code == 404:
+            self.register()
+            return None
+        if resp.status_code == 204:
+            return None
+        resp.raise_for_status()
+        with self._lock:
+            self._last_work = time.time()
+        return resp.json()
+
+    def run_item(self, item):
+        from seleniumfw.runner import Runner
+        from seleniumfw.thread_context import set_context, clear_context
+
+        suite_path = os.path.join(os.getcwd(), item["suite"])
+        self.logger.info(f"▶ Work item {item['id']}: {item['suite']}" + (f" {item['cases']}" if item["cases"] else ""))
+        set_context("screenshots", [])
+        set_context("api_calls", [])
+        try:
+            summary = Runner().run_suite(suite_path, only_cases=item["cases"])
+            result = {
+                "suite_path": item["suite"],
+                "report_dir": summary.get("report_dir"),
+                "testcase_results": summary.get("testcase_results", []),
+            }
+        except Exception as e:
+            self.logger.error(f"Work item {item['id']} crashed: {e}", exc_info=True)
+            result = {
+                "suite_path": item["suite"], "report_dir": None, "error": str(e),
+                "testcase_results": [{"name": c, "status": "failed"} for c in item["cases"] or [item["suite"]]],
+            }
+        finally:
+            clear_context()
+        result["worker"] = self.name
+        self._post_result(item, result)
+
+    def _post_result(self, item, result, attempts=5):
+        """
+        Post a result with its report zip, retrying with back-off while the
+        coordinator is unreachable. If it is never accepted the item is
+        released so the coordinator requeues it; should even that fail, the
+        coordinator's lease timeout takes it back.
+        """
+        archive = None
+        report_dir = result.get("report_dir")
+        if report_dir and os.path.isdir(report_dir):
+            base = os.path.join(tempfile.mkdtemp(prefix="sfw_"), "report")
+            archive = shutil.make_archive(base, "zip", report_dir)
+            # paths in the report are relative to the project; the coordinator remaps them
+            result["report_dir"] = os.path.relpath(report_dir, os.getcwd())
+        item_url = f"{self.url}/api/workers/{self.worker_id}/items/{item['id']}"
+        files = None
+        error = None
+        try:
+            if archive:
+                files = {"artifacts": ("report.zip", open(archive, "rb"), "application/zip")}
+            for attempt in range(1, attempts + 1):
+                try:
+                    resp = requests.post(f"{item_url}/result", data={"result": json.dumps(result)},
+                                         files=files, timeout=120)
+                    if 400 <= resp.status_code < 500:
+                        # rejected, not lost: retrying the same request won't help
+                        error = f"HTTP {resp.status_code}: {resp.text[:200]}"
+                        break
+                    resp.raise_for_status()
+                    return True
+                except requests.RequestException as e:
+                    error = str(e)
+                    self.logger.warning(f"Posting result of {item['id']} failed ({e}); attempt {attempt}/{attempts}")
+                    if files:
+                        files["artifacts"][1].seek(0)
+                    if attempt < attempts:
+                        time.sleep(min(self.poll_interval * 2 ** (attempt - 1), 60))
+        except OSError as e:
+            error = f"Could not read report archive: {e}"
+        finally:
+            if files:
+                files["artifacts"][1].close()
+            if archive:
+                shutil.rmtree(os.path.dirname(archive), ignore_errors=True)
+
+        self.logger.error(f"Result of {item['id']} was not delivered ({error}); releasing it")
+        try:
+            requests.post(f"{item_url}/release", json={"reason": error}, timeout=10).raise_for_status()
+        except requests.RequestException as e:
+            self.logger.error(f"Could not release {item['id']} ({e}); the coordinator reassigns it after its lease timeout")
+        return False
+
+
+def run_distributed(coordinator_url, collection_path, items, poll_interval=2, timeout=DEFAULT_JOB_TIMEOUT):
+    """
+    Submit a job to a coordinator and wait for it; returns the final job
+    status. Raises ``TimeoutError`` when the job has not finished after
+    ``timeout`` seconds (the coordinator keeps the job).
+    """
+    logger = Logger.get_logger()
+    deadline = time.monotonic() + timeout
+    url = coordinator_url.rstrip("/")
+    resp = requests.post(f"{url}/api/jobs", json={"collection_path": collection_path, "items": items}, timeout=30)
+    resp.raise_for_status()
+    job_id = resp.json()["id"]
+    logger.info(f"Submitted {len(items)} work item(s) to {url} as job {job_id}")
+
+    last = None
+    while True:
+        status = requests.get(f"{url}/api/jobs/{job_id}", timeout=30).json()
+        progress = (status["done"], status["leased"], status["pending"])
+        if progress != last:
+            logger.info(f"Job {job_id}: {status['done']}/{status['total']} done, "
+                        f"{status['leased']} running, {status['pending']} pending")
+            last = progress
+        if status["status"] == "finished":
+            return status
+        if time.monotonic() >= deadline:
+            raise TimeoutError(f"Job {job_id} not finished after {timeout:.0f}s: {status['done']}/{status['total']} "
+                               f"done, {status['leased']} running, {status['pending']} pending")
+        time.sleep(poll_interval)
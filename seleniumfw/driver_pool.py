@@ -0,0 +1,217 @@
+# File: seleniumfw/driver_pool.py
+import atexit
+import threading
+import time
+from seleniumfw.config import Config
+from seleniumfw.memory import get_memory_monitor
+from seleniumfw.utils import Logger
+from seleniumfw.thread_context import get_context, set_context
+
+logger = Logger.get_logger()
+
+
+class DriverPool:
+    """
+    Keeps launched WebDrivers alive between test cases.
+
+    Drivers are keyed by ``(browser, args)``. ``acquire`` hands out an idle
+    driver for the key (or launches one through ``BrowserFactory``) and
+    ``release`` resets it (cookies, storage, about:blank) before putting it
+    back. Drivers that fail the reset or the liveness check are evicted.
+    ``max_size`` caps the number of live drivers, leased and idle together.
+    Idle drivers are reported to the ``MemoryMonitor``, which does not hold
+    them against ``memory_budget_mb`` and may ask the pool to drop them.
+
+    The screenshot wrapper installed by ``BrowserFactory.create_driver``
+    looks up the report from the calling thread at save time, so a pooled
+    driver reports into whichever test case currently holds it.
+    """
+
+    def __init__(self, max_size=None, factory=None):
+        cfg = Config()
+        self.max_size = int(max_size or cfg.get("driver_pool_size", 4))
+        self._factory = factory
+        self._idle = {}     # key -> [driver, ...]
+        self._leased = {}   # id(driver) -> key
+        self._live = 0
+        self._closed = False
+        self._cond = threading.Condition()
+
+    @staticmethod
+    def make_key(browser=None, args=None):
+        cfg = Config()
+        browser = (browser or cfg.get("browser", "chrome")).lower()
+        args = tuple(args if args is not None else cfg.get_list("args"))
+        return (browser, args)
+
+    def acquire(self, browser=None, args=None, timeout=None):
+        """Lease a driver, waiting up to ``timeout`` seconds if the pool is full."""
+        key = self.make_key(browser, args)
+        deadline = None if timeout is None else time.time() + timeout
+        while True:
+            driver = victim = None
+            with self._cond:
+                if self._closed:
+                    raise RuntimeError("Driver pool is shut down")
+                idle = self._idle.get(key)
+                if idle:
+                    driver = idle.pop()
+                elif self._live >= self.max_size:
+                    # Full: make room by dropping an idle driver of another key
+                    victim = self._pop_any_idle()
+                    if victim is None:
+                        remaining = None if deadline is None else deadline - time.time()
+                        if remaining is not None and remaining <= 0:
+                            raise TimeoutError(f"No driver available within {timeout}s (pool size {self.max_size})")
+                        self._cond.wait(remaining)
+                        continue
+                    # the victim's slot is handed straight to the new driver
+                else:
+                    self._live += 1
+
+            if driver is not None:
+                if self._is_alive(driver):
+                    return self._lease(driver, key)
+                logger.info("Evicting stale pooled driver")
+                self._evict(driver)
+                continue
+
+            if victim is not None:
+                self._quit(victim)
+            try:
+                driver = self._create(key)
+            except Exception:
+                with self._cond:
+                    self._live -= 1
+                    self._cond.notify()
+                raise
+            return self._lease(driver, key)
+
+    def release(self, driver, discard=False):
+        """Return a leased driver; ``discard=True`` quits it instead of reusing it."""
+        with self._cond:
+            key = self._leased.pop(id(driver), None)
+        if key is None:
+            return  # not one of ours (or already released)
+
+        leased = get_context("leased_drivers")
+        if leased and driver in leased:
+            leased.remove(driver)
+
+        if discard or self._closed or not self._reset(driver):
+            self._evict(driver)
+            return
+
+        with self._cond:
+            self._idle.setdefault(key, []).append(driver)
+            self._cond.notify()
+        get_memory_monitor().set_idle(driver, True)
+
+    def release_leased(self, discard=False):
+        """Release every driver the current thread still holds."""
+        for driver in list(get_context("leased_drivers") or []):
+            self.release(driver, discard=discard)
+
+    def shutdown(self):
+        """Quit all idle drivers and refuse new leases."""
+        with self._cond:
+            self._closed = True
+            drivers = [d for idle in self._idle.values() for d in idle]
+            self._idle.clear()
+            self._live -= len(drivers)
+            self._cond.notify_all()
+        for driver in drivers:
+            self._quit(driver)
+
+    def drop_idle(self):
+        """Quit one idle driver of any key; ``False`` when none is idle."""
+        with self._cond:
+            driver = self._pop_any_idle()
+            if driver is None:
+                return False
+        logger.info("Quitting idle pooled driver to stay within the memory budget")
+        self._evict(driver)
+        return True
+
+    def _lease(self, driver, key):
+        with self._cond:
+            self._leased[id(driver)] = key
+        get_memory_monitor().set_idle(driver, False)
+        leased = get_context("leased_drivers")
+        if leased is None:
+            leased = []
+            set_context("leased_drivers", leased)
+        leased.append(driver)
+        return driver
+
+    def _create(self, key):
+        browser, args = key
+        if self._factory is not None:
+            return self._factory(browser, list(args))
+        from seleniumfw.browser_factory import BrowserFactory
+        return BrowserFactory.create_driver(browser=browser, args=list(args))
+
+    def _pop_any_idle(self):
+        for idle in self._idle.values():
+            if idle:
+                return idle.pop(0)
+        return None
+
+    def _is_alive(self, driver):
+        try:
+            driver.current_url
+            return True
+        except Exception:
+            return False
+
+    def _reset(self, driver):
+        try:
+            handles = driver.window_handles
+            for handle in handles[1:]:
+                driver.switch_to.window(handle)
+                driver.close()
+            driver.switch_to.window(handles[0])
+            driver.delete_all_cookies()
+            # storage is per origin, so clear it before leaving the page
+            try:
+                driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+            except Exception:
+                pass  # about:blank / data: pages have no storage
+            driver.get("about:blank")
+            return True
+        except Exception as e:
+            logger.warning(f"Failed to reset pooled driver, evicting it: {e}")
+            return False
+
+    def _evict(self, driver):
+        with self._cond:
+            self._live -= 1
+            self._cond.notify()
+        self._quit(driver)
+
+    def _quit(self, driver):
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+
+_default_pool = None
+_default_pool_lock = threading.Lock()
+
+
+def get_driver_pool():
+    """Process-wide pool used by ``BrowserFactory.acquire_driver``."""
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is None:
+            _default_pool = DriverPool()
+            atexit.register(_default_pool.shutdown)
+            get_memory_monitor().reclaim = _default_pool.drop_idle
+        return _default_pool
+
+
+def release_leased_drivers(discard=False):
+    """Return any drivers the current test case did not release itself."""
+    if _default_pool is not None and get_context("leased_drivers"):
+        _default_pool.release_leased(discard=discard)
@@ -0,0 +1,119 @@
+# File: seleniumfw/driver_prewarmer.py
+import threading
+import time
+from seleniumfw.driver_pool import DriverPool
+from seleniumfw.thread_context import get_context
+from seleniumfw.utils import Logger
+
+logger = Logger.get_logger()
+
+
+class DriverPrewarmer:
+    """
+    Boots drivers in a background thread so browser start-up overlaps with
+    the test case that is currently running.
+
+    Up to ``depth`` drivers are kept ready (or launching) at any time;
+    ``max_launches`` bounds the total number launched, e.g. to the number of
+    cases left in the suite. ``BrowserFactory.create_driver`` takes from the
+    prewarmer stored in the thread context under ``"prewarmer"``.
+
+    The launching thread has no context of its own, so the suite that
+    creates the prewarmer is captured here and its browsers' memory is
+    charged to that suite.
+    """
+
+    def __init__(self, depth=1, browser=None, args=None, max_launches=None):
+        self.depth = max(1, int(depth))
+        self.key = DriverPool.make_key(browser, args)
+        self.max_launches = max_launches
+        self.owner = get_context("suite_path")
+        self._ready = []
+        self._launching = 0
+        self._launched = 0
+        self._stopped = False
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._fill, name="driver-prewarmer", daemon=True)
+
+    def start(self):
+        logger.info(f"Pre-warming {self.depth} {self.key[0]} driver(s) ahead")
+        self._thread.start()
+        return self
+
+    def take(self, browser=None, args=None):
+        """
+        Return a ready driver for the given browser/args, or None if the
+        prewarmer cannot supply one. Waits for a launch already in flight
+        rather than letting the caller start a second browser.
+        """
+        if DriverPool.make_key(browser, args) != self.key:
+            return None
+        with self._cond:
+            while not self._ready and self._launching and not self._stopped:
+                self._cond.wait()
+            if not self._ready:
+                return None
+            driver = self._ready.pop(0)
+            self._cond.notify_all()
+            return driver
+
+    def stop(self, timeout=5):
+        """Stop launching and quit every driver nobody took."""
+        with self._cond:
+            self._stopped = True
+            unused, self._ready = self._ready, []
+            self._cond.notify_all()
+        for driver in unused:
+            self._quit(driver)
+        self._thread.join(timeout)
+        if unused:
+            logger.info(f"Pre-warmer shut down {len(unused)} unused driver(s)")
+
+    def _exhausted(self):
+        return self.max_launches is not None and self._launched >= self.max_launches
+
+    def _fill(self):
+        from seleniumfw.browser_factory import BrowserFactory
+        failures = 0
+        while True:
+            with self._cond:
+                while not self._stopped and not self._exhausted() and \
+                        len(self._ready) + self._launching >= self.depth:
+                    self._cond.wait()
+                if self._stopped or self._exhausted():
+                    self._cond.notify_all()
+                    return
+                self._launching += 1
+                self._launched += 1
+
+            driver = None
+            try:
+                driver = BrowserFactory._launch_driver(*self.key, owner=self.owner)
+                failures = 0
+            except Exception as e:
+                failures += 1
+                logger.warning(f"Pre-warming driver failed ({failures}): {e}")
+
+            with self._cond:
+                self._launching -= 1
+                if driver is not None and not self._stopped:
+                    self._ready.append(driver)
+                    driver = None
+                self._cond.notify_all()
+            if driver is not None:
+                self._quit(driver)  # finished booting after stop()
+
+            if failures >= 3:
+                logger.error("Giving up on pre-warming drivers after repeated failures")
+                with self._cond:
+                    self._stopped = True
+                    self._cond.notify_all()
+                return
+            if failures:
+                time.sleep(failures)
+
+    def _quit(self, driver):
+        try:
+            driver.quit()
+        except Exception:
+            pass
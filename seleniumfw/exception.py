@@ -4,3 +4,18 @@ class FeatureException(Exception):
         if message is None:
             message = "Feature failed"
         super().__init__(message)
+
+
+class PlanError(Exception):
+    """Raised when a suite or collection cannot be compiled into an execution plan."""
+    def __init__(self, problems):
+        self.problems = list(problems)
+        super().__init__("Invalid execution plan:\n  - " + "\n  - ".join(self.problems))
+
+
+class CaseTimeout(Exception):
+    """Raised by the watchdog when a test case or its suite runs out of time."""
+    def __init__(self, seconds, scope="case"):
+        self.seconds = seconds
+        self.scope = scope
+        super().__init__(f"{scope} timeout after {seconds:.0f}s")
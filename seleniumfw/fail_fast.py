@@ -0,0 +1,39 @@
+# File: seleniumfw/fail_fast.py
+import threading
+
+# test case statuses that count as failures
+FAILING_STATUSES = ("failed", "timeout")
+
+
+class FailFast:
+    """
+    Failure counter for ``fail_fast`` suites and collections.
+
+    Once ``max_failures`` failures are recorded the ``event`` is set; the
+    runner then stops starting new work and reports the rest as SKIPPED.
+    ``event`` can be any object with ``set``/``is_set`` (e.g. a
+    ``multiprocessing.Manager().Event()`` shared with worker processes).
+    """
+
+    def __init__(self, enabled=False, max_failures=1, event=None):
+        self.enabled = bool(enabled)
+        self.max_failures = max(1, int(max_failures or 1))
+        self.event = event if event is not None else threading.Event()
+        self.failures = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_spec(cls, spec, event=None):
+        """Build from a suite/collection YAML dict (``fail_fast``, ``max_failures``)."""
+        return cls(spec.get("fail_fast", False), spec.get("max_failures", 1), event=event)
+
+    def record(self, failed):
+        if not (failed and self.enabled):
+            return
+        with self._lock:
+            self.failures += 1
+            if self.failures >= self.max_failures:
+                self.event.set()
+
+    def tripped(self):
+        return self.event.is_set()
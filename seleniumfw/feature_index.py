@@ -0,0 +1,281 @@
+# File: seleniumfw/feature_index.py
+import hashlib
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+from behave.parser import parse_feature
+from seleniumfw.utils import Logger
+
+logger = Logger.get_logger()
+
+CACHE_DIR = ".sfw_cache"
+FEATURE_DIR = os.path.join("include", "features")
+# behave models of features parsed by this process, kept for one handoff to behave
+MAX_FRESH_MODELS = 32
+
+
+class FeatureIndex:
+    """
+    Parse cache and index for ``.feature`` files.
+
+    Parsed features are stored as JSON under ``.sfw_cache/features/<sha256>.json``
+    so unchanged content is never parsed twice, not even across runs.
+    ``.sfw_cache/feature_index.json`` maps each file to its stamp, hash and
+    the name/tags of its scenarios, which is enough to answer tag queries
+    without opening the parsed documents.
+
+    behave needs its own model objects to run a feature and they cannot be
+    stored, so a feature the index had to parse hands that model to the
+    behave engine once (``take_model``) instead of behave parsing it again.
+
+    A parsed feature looks like::
+
+        {"name", "filename", "tags", "background": [steps],
+         "scenarios": [{"name", "type", "line", "tags", "steps": [{"keyword", "step_type", "name"}],
+                        "examples": [{"name", "tags", "headings", "rows"}]}]}
+    """
+
+    def __init__(self, root=None):
+        self.root = os.path.abspath(root or os.getcwd())
+        self.cache_dir = os.path.join(self.root, CACHE_DIR)
+        self.index_path = os.path.join(self.cache_dir, "feature_index.json")
+        self._lock = threading.RLock()
+        self._docs = {}  # sha -> parsed feature
+        self._fresh = OrderedDict()  # path -> (sha, behave Feature) not yet run
+        self._dirty = False
+        self._entries = self._load_index()
+
+    def get(self, path):
+        """Parsed feature for ``path`` (re-parsed only if its content changed)."""
+        entry = self._refresh(path)
+        return self._load_doc(entry["sha"])
+
+    def scan(self, directory=FEATURE_DIR):
+        """Refresh the index for every feature below ``directory``; returns the paths."""
+        base = os.path.join(self.root, directory)
+        paths = []
+        for dirpath, _, filenames in os.walk(base):
+            for name in sorted(filenames):
+                if name.endswith(".feature"):
+                    paths.append(self._key(os.path.join(dirpath, name)))
+        for path in paths:
+            self._refresh(path)
+        with self._lock:
+            # forget files that were deleted
+            for stale in [p for p in self._entries if p.startswith(self._key(base)) and p not in paths]:
+                del self._entries[stale]
+                self._dirty = True
+        self.save()
+        return paths
+
+    def scenarios_matching(self, tags, paths=None):
+        """
+        Scenarios whose effective tags satisfy ``tags`` (a behave tag
+        expression such as ``"@smoke"``, ``"@a,@b"`` or ``"not @slow"``).
+        Scenario outlines yield one row per examples block.
+        """
+        expression = make_tag_matcher(tags)
+        paths = [self._key(p) for p in paths] if paths is not None else self.scan()
+        matches = []
+        for path in paths:
+            entry = self._refresh(path)
+            for scenario in entry["scenarios"]:
+                if expression(scenario["tags"]):
+                    matches.append(dict(scenario, path=path, feature=entry["name"]))
+        self.save()
+        return matches
+
+    def take_model(self, path):
+        """
+        behave ``Feature`` this index parsed for ``path``, if its content is
+        unchanged since; each model is handed out once, as running it
+        mutates it. ``None`` when behave has to parse the file itself.
+        """
+        key = self._key(path)
+        with self._lock:
+            fresh = self._fresh.pop(key, None)
+        if fresh is None or self._refresh(key)["sha"] != fresh[0]:
+            return None
+        return fresh[1]
+
+    def save(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp = f"{self.index_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp, "w") as f:
+                json.dump(self._entries, f, indent=1)
+            os.replace(tmp, self.index_path)
+            self._dirty = False
+
+    def _key(self, path):
+        return os.path.relpath(os.path.abspath(path), self.root).replace("\\", "/")
+
+    def _load_index(self):
+        try:
+            with open(self.index_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _refresh(self, path):
+        key = self._key(path)
+        full = os.path.join(self.root, key)
+        st = os.stat(full)
+        stamp = [st.st_mtime_ns, st.st_size]
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry["stamp"] == stamp:
+                return entry
+
+        with open(full, "rb") as f:
+            raw = f.read()
+        sha = hashlib.sha256(raw).hexdigest()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry["sha"] == sha:
+                entry["stamp"] = stamp  # touched, not changed
+            else:
+                doc = self._load_doc(sha) or self._parse(key, raw, sha)
+                entry = {
+                    "stamp": stamp,
+                    "sha": sha,
+                    "name": doc["name"],
+                    "scenarios": [
+                        {"name": row["name"], "line": row["line"], "tags": row["tags"]}
+                        for row in _tag_rows(doc)
+                    ],
+                }
+                self._entries[key] = entry
+            self._dirty = True
+            return entry
+
+    def _doc_path(self, sha):
+        return os.path.join(self.cache_dir, "features", f"{sha}.json")
+
+    def _load_doc(self, sha):
+        doc = self._docs.get(sha)
+        if doc is not None:
+            return doc
+        try:
+            with open(self._doc_path(sha)) as f:
+                doc = json.load(f)
+        except (OSError, ValueError):
+            return None
+        self._docs[sha] = doc
+        return doc
+
+    def _parse(self, key, raw, sha):
+        logger.info(f"Parsing feature: {key}")
+        # same filename behave's own parser would use, so the model can run as is
+        feature = parse_feature(raw.decode("utf-8"), filename=os.path.join(self.root, key))
+        doc = _feature_to_dict(feature, key)
+        self._fresh[key] = (sha, feature)
+        while len(self._fresh) > MAX_FRESH_MODELS:
+            self._fresh.popitem(last=False)
+        os.makedirs(os.path.dirname(self._doc_path(sha)), exist_ok=True)
+        with open(self._doc_path(sha), "w") as f:
+            json.dump(doc, f)
+        self._docs[sha] = doc
+        return doc
+
+
+def _steps_to_list(steps):
+    return [
+        {"keyword": step.keyword, "step_type": step.step_type, "name": step.name}
+        for step in steps or []
+    ]
+
+
+def _feature_to_dict(feature, filename):
+    feature_tags = [str(t) for t in feature.tags]
+
+    def scenario_dict(scenario, inherited_tags):
+        tags = inherited_tags + [str(t) for t in scenario.tags if str(t) not in inherited_tags]
+        examples = []
+        for ex in getattr(scenario, "examples", None) or []:
+            table = ex.table
+            examples.append({
+                "name": ex.name,
+                "tags": [str(t) for t in getattr(ex, "tags", [])],
+                "headings": list(table.headings) if table else [],
+                "rows": [list(row.cells) for row in table.rows] if table else [],
+            })
+        return {
+            "name": scenario.name,
+            "type": "scenario_outline" if examples else "scenario",
+            "line": scenario.line,
+            "tags": tags,
+            "steps": _steps_to_list(scenario.steps),
+            "examples": examples,
+        }
+
+    scenarios = [scenario_dict(s, feature_tags) for s in feature.scenarios]
+    for rule in getattr(feature, "rules", None) or []:
+        rule_tags = feature_tags + [str(t) for t in rule.tags if str(t) not in feature_tags]
+        scenarios.extend(scenario_dict(s, rule_tags) for s in rule.scenarios)
+
+    background = feature.background.steps if feature.background else []
+    return {
+        "name": feature.name,
+        "filename": filename,
+        "tags": feature_tags,
+        "background": _steps_to_list(background),
+        "scenarios": scenarios,
+    }
+
+
+def _tag_rows(doc):
+    """One taggable row per scenario, one per examples block for outlines."""
+    for scenario in doc["scenarios"]:
+        if not scenario["examples"]:
+            yield scenario
+            continue
+        for ex in scenario["examples"]:
+            yield {
+                "name": scenario["name"],
+                "line": scenario["line"],
+                "tags": scenario["tags"] + [t for t in ex["tags"] if t not in scenario["tags"]],
+            }
+
+
+def make_tag_matcher(tags):
+    """Callable checking a list of tags (without ``@``) against a behave tag expression."""
+    if not tags:
+        return lambda _tags: True
+    try:
+        from behave.tag_expression import make_tag_expression
+        expression = make_tag_expression(tags)
+    except ImportError:  # behave < 1.2.7
+        from behave.tag_expression import TagExpression
+        expression = TagExpression(tags.split() if isinstance(tags, str) else list(tags))
+    return expression.check
+
+
+_FEATURE_REF = re.compile(r"""["']([^"']+\.feature)["']""")
+
+
+def features_referenced_by(case_path):
+    """Feature paths a test case file mentions as string literals (e.g. in run_feature)."""
+    try:
+        with open(case_path, encoding="utf-8") as f:
+            source = f.read()
+    except OSError:
+        return []
+    return list(dict.fromkeys(_FEATURE_REF.findall(source)))
+
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def get_feature_index(root=None):
+    """Shared index for a project root (defaults to the working directory)."""
+    root = os.path.abspath(root or os.getcwd())
+    with _indexes_lock:
+        if root not in _indexes:
+            _indexes[root] = FeatureIndex(root)
+        return _indexes[root]
@@ -0,0 +1,112 @@
+# File: seleniumfw/history.py
+import glob
+import json
+import os
+import statistics
+
+
+def normalize_suite_id(path):
+    """The ``testsuite_id`` a suite path is recorded under in result.json."""
+    if os.path.isabs(path):
+        path = os.path.relpath(path, os.getcwd())
+    return os.path.normpath(path).replace("\\", "/")
+
+
+class RunHistory:
+    """
+    Durations and statuses of past runs, read from ``reports/*/result.json``.
+
+    Only the newest ``scan_limit`` report folders are opened and at most
+    ``max_runs`` results are kept per suite and per test case, newest first.
+    """
+
+    def __init__(self, reports_dir="reports", max_runs=5, scan_limit=200):
+        self.reports_dir = reports_dir
+        self.max_runs = max_runs
+        self.scan_limit = scan_limit
+        self._suites = None
+        self._cases = None
+
+    def _load(self):
+        if self._suites is not None:
+            return
+        self._suites, self._cases = {}, {}
+        paths = sorted(glob.glob(os.path.join(self.reports_dir, "*", "result.json")), reverse=True)
+        for path in paths[:self.scan_limit]:
+            try:
+                with open(path) as f:
+                    result = json.load(f)
+            except (OSError, ValueError):
+                continue
+            suite_id = normalize_suite_id(result.get("testsuite_id", ""))
+            runs = self._suites.setdefault(suite_id, [])
+            if len(runs) < self.max_runs:
+                runs.append({"duration": result.get("duration", 0), "stamp": os.path.basename(os.path.dirname(path))})
+            for case in result.get("testcase_results", []):
+                runs = self._cases.setdefault(case["name"], [])
+                if len(runs) < self.max_runs:
+                    runs.append(case)
+
+    def suite_runs(self, suite_path):
+        self._load()
+        return self._suites.get(normalize_suite_id(suite_path), [])
+
+    def case_runs(self, case):
+        """Past ``testcase_results`` entries of a case, newest first."""
+        self._load()
+        return self._cases.get(case, [])
+
+    def estimate_suite(self, suite_path):
+        """Median of recent suite durations, or None without history."""
+        runs = self.suite_runs(suite_path)
+        return statistics.median(r["duration"] for r in runs) if runs else None
+
+    def estimate_case(self, case):
+        runs = self.case_runs(case)
+        return statistics.median(r.get("duration", 0) for r in runs) if runs else None
+
+    def flakiness(self, case):
+        """Flakiness score of a case over its recent runs, or None without history."""
+        runs = self.case_runs(case)
+        return flakiness_score(runs) if runs else None
+
+
+def flakiness_score(runs):
+    """
+    Score from 0 (stable) to 1 (flaky) for ``testcase_results`` entries,
+    newest first: the larger of the share of runs that only passed after an
+    in-run retry (``flaky``) and the share of consecutive runs whose outcome
+    flipped between passed and failed. Skipped runs are ignored.
+    """
+    runs = [r for r in runs if r.get("status", "").upper() in ("PASSED", "FAILED")]
+    if not runs:
+        return 0.0
+    flaky_rate = sum(1 for r in runs if r.get("flaky")) / len(runs)
+    statuses = [r["status"].upper() for r in runs]
+    flips = sum(1 for a, b in zip(statuses, statuses[1:]) if a != b)
+    flip_rate = flips / (len(statuses) - 1) if len(statuses) > 1 else 0.0
+    return round(max(flaky_rate, flip_rate), 2)
+
+
+def schedule_longest_first(items, estimates, workers):
+    """
+    Order ``items`` for a pool of ``workers`` using longest-processing-time
+    first. Items without an estimate (None) keep their original order and go
+    first, since nothing says they are short. Returns ``(ordered, bins)``
+    where ``bins`` is the expected per-worker assignment
+    ``[{"items": [...], "load": seconds}, ...]``; unknown items count with
+    the mean of the known estimates there.
+    """
+    unknown = [i for i in items if estimates.get(i) is None]
+    known = sorted((i for i in items if estimates.get(i) is not None),
+                   key=lambda i: estimates[i], reverse=True)
+    ordered = unknown + known
+    fallback = statistics.mean(estimates[i] for i in known) if known else 0.0
+
+    bins = [{"items": [], "load": 0.0} for _ in range(max(1, workers))]
+    for item in ordered:
+        target = min(bins, key=lambda b: b["load"])
+        target["items"].append(item)
+        estimate = estimates.get(item)
+        target["load"] += fallback if estimate is None else estimate
+    return ordered, bins
@@ -0,0 +1,105 @@
+# File: seleniumfw/hook_profiler.py
+import json
+import random
+import threading
+import time
+
+from seleniumfw.config import Config
+
+# samples kept per hook for the percentiles; beyond that a uniform reservoir
+MAX_SAMPLES = 2048
+
+
+def hook_profiling_enabled():
+    return str(Config().get("hook_profiling", "true")).strip().lower() != "false"
+
+
+class _HookStats:
+    __slots__ = ("count", "total", "max", "samples")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.samples = []
+
+
+class HookProfile:
+    """
+    Wall-clock time of every hook call of one suite run, per event and per
+    listener function: count, total, p50/p95 and max. Recording is a lock,
+    a few additions and (once ``MAX_SAMPLES`` is reached) a random draw, so
+    it stays on by default; set ``hook_profiling=false`` to turn it off.
+
+    For ``background=True`` hooks the time measured is what the test thread
+    spent handing the call to the listener queue.
+    """
+
+    def __init__(self):
+        self._stats = {}  # (event, hook) -> _HookStats
+        self._lock = threading.Lock()
+
+    def record(self, event, hook, seconds):
+        with self._lock:
+            stats = self._stats.get((event, hook))
+            if stats is None:
+                stats = self._stats[(event, hook)] = _HookStats()
+            stats.count += 1
+            stats.total += seconds
+            if seconds > stats.max:
+                stats.max = seconds
+            if len(stats.samples) < MAX_SAMPLES:
+                stats.samples.append(seconds)
+            else:
+                slot = random.randrange(stats.count)
+                if slot < MAX_SAMPLES:
+                    stats.samples[slot] = seconds
+
+    def timed(self, event, hook):
+        """``hook.call`` wrapped so every call is recorded under ``event``."""
+        call, record, name = hook.call, self.record, hook_label(hook)
+
+        def timed_call(*args):
+            started = time.perf_counter()
+            try:
+                return call(*args)
+            finally:
+                record(event, name, time.perf_counter() - started)
+        return timed_call
+
+    def summary(self):
+        """One row per hook, slowest total first; times in milliseconds."""
+        with self._lock:
+            items = [(key, stats.count, stats.total, stats.max, sorted(stats.samples))
+                     for key, stats in self._stats.items()]
+        rows = []
+        for (event, hook), count, total, longest, samples in items:
+            rows.append({
+                "event": event,
+                "hook": hook,
+                "count": count,
+                "total_ms": round(total * 1000, 3),
+                "p50_ms": round(_percentile(samples, 50) * 1000, 3),
+                "p95_ms": round(_percentile(samples, 95) * 1000, 3),
+                "max_ms": round(longest * 1000, 3),
+            })
+        rows.sort(key=lambda row: row["total_ms"], reverse=True)
+        return rows
+
+    def save(self, path):
+        with open(path, "w") as f:
+            json.dump({"hooks": self.summary()}, f, indent=2)
+        return path
+
+
+def hook_label(hook):
+    """``module.function`` of a compiled hook, as shown in the profile."""
+    name = f"{getattr(hook.func, '__module__', '?')}.{getattr(hook.func, '__qualname__', hook.name)}"
+    return name + " (queued)" if hook.background else name
+
+
+def _percentile(sorted_samples, pct):
+    if not sorted_samples:
+        return 0.0
+    rank = max(0, int(round(pct / 100 * len(sorted_samples))) - 1)
+    return sorted_samples[min(rank, len(sorted_samples) - 1)]
@@ -0,0 +1,172 @@
+# File: seleniumfw/hook_queue.py
+import atexit
+import itertools
+import queue
+import threading
+from collections import Counter
+
+from seleniumfw.config import Config
+from seleniumfw.thread_context import get_context, snapshot_context, restore_context, clear_context
+from seleniumfw.utils import Logger
+
+OVERFLOW_POLICIES = ("block", "drop", "inline")
+
+
+class HookQueue:
+    """
+    Bounded queue of hook calls run by ``workers`` background threads, for
+    listeners registered with ``background=True`` (notifications, log
+    shipping, ...) so they do not add to test latency.
+
+    A call runs with a copy of the submitting thread's context, so
+    ``get_context("report")`` and friends work as they would inline. A
+    failing hook is logged and never reaches the test. When the queue is
+    full ``overflow`` decides: ``block`` waits for room, ``drop`` discards
+    the call (counted in ``dropped``), ``inline`` runs it in the caller.
+
+    Calls are grouped by the suite that submitted them; ``flush(suite)``
+    waits for that suite's calls only, so parallel suites don't wait on
+    each other. Each suite's calls go to one worker (``size`` is split
+    between the workers), so they run in the order they were made, e.g.
+    a suite's before hooks ahead of its after hooks; more workers only
+    help when several suites run at once. Calls still queued when
+    ``flush`` gives up are discarded (see ``abandon``).
+    """
+
+    def __init__(self, size=1000, workers=2, overflow="block", flush_timeout=None):
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"listener_overflow must be one of {', '.join(OVERFLOW_POLICIES)}, got {overflow!r}")
+        self.logger = Logger.get_logger()
+        self.overflow = overflow
+        self.flush_timeout = flush_timeout
+        self.dropped = 0
+        workers = max(1, workers)
+        self._queues = [queue.Queue(maxsize=max(1, size // workers)) for _ in range(workers)]
+        self._pending = {}  # owner -> Counter of queued or running calls by hook name
+        self._cutoff = {}   # owner -> calls numbered up to here were abandoned
+        self._seq = itertools.count(1)
+        self._cond = threading.Condition()
+        self._threads = [
+            threading.Thread(target=self._work, args=(q,), name=f"sfw-hook-worker-{n}", daemon=True)
+            for n, q in enumerate(self._queues)
+        ]
+        for t in self._threads:
+            t.start()
+
+    def submit(self, name, func, *args):
+        owner = get_context("suite_path")
+        with self._cond:
+            job = (next(self._seq), owner, name, func, args, snapshot_context())
+            self._pending.setdefault(owner, Counter())[name] += 1
+        shard = self._queues[hash(owner) % len(self._queues)]
+        try:
+            if self.overflow == "block":
+                shard.put(job)
+            else:
+                shard.put_nowait(job)
+        except queue.Full:
+            self._done(owner, name)
+            if self.overflow == "drop":
+                with self._cond:
+                    self.dropped += 1
+                self.logger.warning(f"Listener queue full; dropped background hook {name}")
+            else:
+                self._call(name, func, args)
+
+    def _work(self, shard):
+        while True:
+            seq, owner, name, func, args, snapshot = shard.get()
+            try:
+                with self._cond:
+                    abandoned = seq <= self._cutoff.get(owner, 0)
+                if not abandoned:
+                    restore_context(snapshot)
+                    self._call(name, func, args)
+            finally:
+                clear_context()
+                self._done(owner, name)
+                shard.task_done()
+
+    def _call(self, name, func, args):
+        try:
+            func(*args)
+        except Exception as e:
+            self.logger.error(f"Error in background hook {name}: {e}", exc_info=True)
+
+    def _done(self, owner, name):
+        with self._cond:
+            calls = self._pending[owner]
+            calls[name] -= 1
+            if calls[name] <= 0:
+                del calls[name]
+            if not calls:
+                del self._pending[owner]
+            self._cond.notify_all()
+
+    def pending(self, owner=None):
+        with self._cond:
+            return sum(self._pending.get(owner, Counter()).values())
+
+    def abandon(self, owner=None):
+        """
+        Give up on the calls ``owner`` has made so far: those still queued
+        are skipped (a running one finishes). Returns ``{hook name: count}``
+        of the calls that were outstanding.
+        """
+        with self._cond:
+            self._cutoff[owner] = next(self._seq)
+            outstanding = dict(self._pending.get(owner, {}))
+            return outstanding
+
+    def flush(self, owner=None, timeout=None):
+        """
+        Wait until the calls of ``owner`` (a suite path; ``None`` for calls
+        made outside a suite) have run. Returns False on timeout.
+        """
+        with self._cond:
+            return self._cond.wait_for(lambda: owner not in self._pending, timeout=timeout)
+
+    def flush_all(self, timeout=None):
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._pending, timeout=timeout)
+
+
+_hook_queue = None
+_hook_queue_lock = threading.Lock()
+
+
+def get_hook_queue():
+    """Process-wide queue configured from ``listener_queue_size``/``listener_workers``/``listener_overflow``."""
+    global _hook_queue
+    with _hook_queue_lock:
+        if _hook_queue is None:
+            cfg = Config()
+            _hook_queue = HookQueue(
+                size=int(cfg.get("listener_queue_size", 1000)),
+                workers=int(cfg.get("listener_workers", 2)),
+                overflow=str(cfg.get("listener_overflow", "block")).strip().lower(),
+                flush_timeout=float(cfg.get("listener_flush_timeout", 60)) or None,
+            )
+            # don't lose queued notifications when the run ends
+            atexit.register(_hook_queue.flush_all, timeout=60)
+        return _hook_queue
+
+
+def flush_background_hooks(owner=None, timeout=None):
+    """
+    Wait for queued background hooks of ``owner``; no-op when none were
+    ever queued. After ``timeout`` (default ``listener_flush_timeout``
+    seconds) the remaining calls are abandoned and logged; returns False.
+    """
+    if _hook_queue is None:
+        return True
+    timeout = timeout if timeout is not None else _hook_queue.flush_timeout
+    if _hook_queue.flush(owner, timeout=timeout):
+        return True
+    outstanding = _hook_queue.abandon(owner)
+    if outstanding:
+        calls = ", ".join(f"{name} x{count}" if count > 1 else name for name, count in outstanding.items())
+        Logger.get_logger().warning(
+            f"Background hooks of {owner or 'this run'} did not finish within {timeout:g}s; abandoned: {calls}"
+        )
+    return False
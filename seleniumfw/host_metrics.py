@@ -0,0 +1,162 @@
+# File: seleniumfw/host_metrics.py
+import os
+import signal
+import subprocess
+
+try:
+    import psutil
+except ImportError:  # optional: /proc is read directly on Linux
+    psutil = None
+
+
+def _proc_stat_times():
+    """``(busy, total)`` CPU jiffies of all cores from /proc/stat, or None."""
+    try:
+        with open("/proc/stat") as f:
+            fields = [int(v) for v in f.readline().split()[1:]]
+    except (OSError, ValueError):
+        return None
+    idle = fields[3] + (fields[4] if len(fields) > 4 else 0)  # idle + iowait
+    total = sum(fields[:8])  # guest time is already counted in user/nice
+    return total - idle, total
+
+
+class CpuSampler:
+    """
+    Share of CPU time (0.0-1.0 over all cores) spent busy between two
+    ``sample()`` calls, so every reading reflects only the last interval.
+    Uses psutil or /proc/stat; elsewhere falls back to the 1-minute load
+    average per CPU, which lags (``lagging`` is then True).
+    """
+
+    def __init__(self):
+        self.lagging = False
+        if psutil is not None:
+            psutil.cpu_percent(interval=None)  # first call only sets the baseline
+            self._source = "psutil"
+        elif _proc_stat_times() is not None:
+            self._last = _proc_stat_times()
+            self._source = "proc"
+        else:
+            self._source = "loadavg"
+            self.lagging = True
+
+    def sample(self):
+        """Busy share since the previous sample, or None if unknown."""
+        if self._source == "psutil":
+            return psutil.cpu_percent(interval=None) / 100.0
+        if self._source == "proc":
+            current = _proc_stat_times()
+            if current is None:
+                return None
+            (busy0, total0), (busy1, total1), self._last = self._last, current, current
+            return (busy1 - busy0) / (total1 - total0) if total1 > total0 else None
+        try:
+            return os.getloadavg()[0] / (os.cpu_count() or 1)
+        except (AttributeError, OSError):
+            return None
+
+
+def available_memory_mb():
+    """Memory available to new processes in MB, or None if unknown."""
+    if psutil is not None:
+        return psutil.virtual_memory().available / (1024 * 1024)
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def _proc_children():
+    """{ppid: [pid, ...]} from /proc."""
+    children = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                # the command name may contain spaces; fields resume after ')'
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(ppid, []).append(int(entry))
+    return children
+
+
+def process_tree_rss_mb(pids):
+    """
+    Resident memory in MB of each process tree rooted at ``pids``
+    (e.g. chromedriver plus every Chrome it started): ``{pid: mb}``.
+    Trees whose root has exited are left out.
+    """
+    usage = {}
+    if psutil is not None:
+        for pid in pids:
+            try:
+                root = psutil.Process(pid)
+                procs = [root] + root.children(recursive=True)
+            except psutil.Error:
+                continue
+            total = 0
+            for p in procs:
+                try:
+                    total += p.memory_info().rss
+                except psutil.Error:
+                    pass
+            usage[pid] = total / (1024 * 1024)
+        return usage
+
+    if not os.path.isdir("/proc"):
+        return usage
+    children = _proc_children()
+    page_mb = os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    for pid in pids:
+        if not os.path.exists(f"/proc/{pid}"):
+            continue
+        total, stack = 0.0, [pid]
+        while stack:
+            current = stack.pop()
+            try:
+                with open(f"/proc/{current}/statm") as f:
+                    total += int(f.read().split()[1]) * page_mb
+            except (OSError, IndexError, ValueError):
+                continue
+            stack.extend(children.get(current, []))
+        usage[pid] = total
+    return usage
+
+
+def kill_process_tree(pid):
+    """Force-kill a process and all of its descendants (e.g. a hung chromedriver and its Chromes)."""
+    if psutil is not None:
+        try:
+            root = psutil.Process(pid)
+            procs = root.children(recursive=True) + [root]
+        except psutil.Error:
+            return
+        for p in procs:
+            try:
+                p.kill()
+            except psutil.Error:
+                pass
+        return
+
+    if os.name == "nt":
+        subprocess.run(["taskkill", "/T", "/F", "/PID", str(pid)], capture_output=True)
+        return
+
+    children = _proc_children() if os.path.isdir("/proc") else {}
+    tree, stack = [], [pid]
+    while stack:
+        current = stack.pop()
+        tree.append(current)
+        stack.extend(children.get(current, []))
+    for p in reversed(tree):
+        try:
+            os.kill(p, signal.SIGKILL)
+        except OSError:
+            pass
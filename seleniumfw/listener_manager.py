@@ -4,64 +4,233 @@ project_root = os.getcwd()
 if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
+import asyncio
+import contextvars
 import importlib
+import importlib.util
+import inspect
 import os
 import glob
+import threading
+from seleniumfw.hook_profiler import HookProfile, hook_profiling_enabled
+from seleniumfw.hook_queue import get_hook_queue
+from seleniumfw.thread_context import get_context, set_context, delete_context
 from seleniumfw.utils import Logger
 
 logger = Logger.get_logger()
 
-# Global registry for lifecycle hooks
-enabled_listeners = {
-    'before_test_suite': [],
-    'after_test_suite': [],
-    'setup': [],              # suite-level setup (@SetUp)
-    'teardown': [],           # suite-level teardown (@Teardown)
-    'before_feature': [],
-    'after_feature': [],
-    'before_scenario': [],
-    'after_scenario': [],
-    'before_step': [],
-    'after_step': [],
-    'before_test_case': [],
-    'after_test_case': [],
-    'setup_test_case': [],    # per-case setup (@SetupTestCase)
-    'teardown_test_case': [], # per-case teardown (@TeardownTestCase)
-}
-
-# Decorators for users to register hooks
-
-def BeforeTestSuite(func):
-    enabled_listeners['before_test_suite'].append(func)
-    return func
-
-def AfterTestSuite(func):
-    enabled_listeners['after_test_suite'].append(func)
-    return func
-
-def BeforeScenario(func):
-    enabled_listeners['before_scenario'].append(func)
-    return func
-
-def AfterScenario(func):
-    enabled_listeners['after_scenario'].append(func)
-    return func
-
-def BeforeStep(func):
-    enabled_listeners['before_step'].append(func)
-    return func
-
-def AfterStep(func):
-    enabled_listeners['after_step'].append(func)
-    return func
-
-def BeforeTestCase(func):
-    enabled_listeners['before_test_case'].append(func)
-    return func
-
-def AfterTestCase(func):
-    enabled_listeners['after_test_case'].append(func)
-    return func
+# Lifecycle events, in the order they were introduced
+HOOK_EVENTS = (
+    'before_test_suite',
+    'after_test_suite',
+    'setup',              # suite-level setup (@SetUp)
+    'teardown',           # suite-level teardown (@Teardown)
+    'before_feature',
+    'after_feature',
+    'before_scenario',
+    'after_scenario',
+    'before_step',
+    'after_step',
+    'before_test_case',
+    'after_test_case',
+    'setup_test_case',    # per-case setup (@SetupTestCase)
+    'teardown_test_case', # per-case teardown (@TeardownTestCase)
+)
+
+
+class CompiledHook:
+    """
+    A registered hook with its calling convention resolved once: hooks
+    without parameters are called without arguments, ``async def`` hooks
+    are driven to completion, ``background`` hooks are handed to the
+    listener queue. ``call(*args)`` is what the dispatchers run.
+    """
+    __slots__ = ("func", "name", "takes_args", "is_async", "background", "call")
+
+    def __init__(self, func, background=False):
+        self.func = func
+        self.background = background
+        self.name = getattr(func, "__name__", repr(func))
+        try:
+            self.takes_args = bool(inspect.signature(func).parameters)
+        except (TypeError, ValueError):  # builtins without a signature
+            self.takes_args = True
+        self.is_async = inspect.iscoroutinefunction(func)
+
+        if self.is_async:
+            if self.takes_args:
+                self.call = lambda *args: run_coroutine(func(*args))
+            else:
+                self.call = lambda *args: run_coroutine(func())
+        elif self.takes_args:
+            self.call = func
+        else:
+            self.call = lambda *args: func()
+
+        if background:
+            name, run = self.name, self.call
+            self.call = lambda *args: get_hook_queue().submit(name, run, *args)
+
+
+# bumped whenever any registration list changes; compiled tables built at
+# an older generation are rebuilt on their next dispatch
+_generation = 0
+
+def _registrations_changed():
+    global _generation
+    _generation += 1
+
+
+class _HookList(list):
+    """Registration list that invalidates the compiled tables when it changes."""
+
+
+def _mutator(name):
+    def method(self, *args):
+        result = getattr(list, name)(self, *args)
+        _registrations_changed()
+        return result
+    method.__name__ = name
+    return method
+
+
+for _name in ("append", "extend", "insert", "remove", "pop", "clear",
+              "__setitem__", "__delitem__", "__iadd__"):
+    setattr(_HookList, _name, _mutator(_name))
+
+
+class HookDispatch:
+    """
+    Hook registry compiled into a dispatch table: per event, a tuple of
+    ``CompiledHook`` and a tuple of their bare callables, rebuilt when the
+    registrations change instead of on every call. ``listeners`` keeps the
+    plain registration lists (exposed as ``enabled_listeners``); hooks
+    appended to those lists directly are picked up as well.
+
+    A registry with a ``parent`` dispatches the parent's hooks first, then
+    its own; suite runs use one layered over the global registry. With a
+    ``profile`` every call dispatched through this registry is timed.
+    """
+
+    def __init__(self, events=HOOK_EVENTS, parent=None, profile=None):
+        self.parent = parent
+        self.profile = profile
+        self.listeners = {event: _HookList() for event in events}
+        self._background = set()  # ids of hooks registered with background=True
+        self._compiled_at = -1
+        self._hooks = {}
+        self._calls = {}
+
+    def register(self, event, func, background=False):
+        if background:
+            self._background.add(id(func))
+        self.listeners[event].append(func)
+        return func
+
+    def _compile(self):
+        generation = _generation
+        for event, funcs in self.listeners.items():
+            base = self.parent.hooks(event) if self.parent is not None else ()
+            hooks = base + tuple(CompiledHook(func, id(func) in self._background) for func in funcs)
+            self._hooks[event] = hooks
+            if self.profile is not None:
+                self._calls[event] = tuple(self.profile.timed(event, hook) for hook in hooks)
+            else:
+                self._calls[event] = tuple(hook.call for hook in hooks)
+        self._compiled_at = generation
+
+    def hooks(self, event):
+        """Compiled hooks of ``event`` (empty for unknown events)."""
+        if self._compiled_at != _generation:
+            self._compile()
+        return self._hooks.get(event, ())
+
+    def calls(self, event):
+        """
+        Bare callables of ``event``, the fast path for per-step dispatch::
+
+            for call in dispatch.calls('before_step'):
+                call(context, step)
+        """
+        if self._compiled_at != _generation:
+            self._compile()
+        return self._calls[event]
+
+    def fire(self, event, *args):
+        """Run every hook of ``event``; a failing hook is logged and the rest still run."""
+        hooks = self.hooks(event)
+        for hook, call in zip(hooks, self._calls.get(event, ())):
+            try:
+                call(*args)
+            except Exception as e:
+                logger.error(f"Error invoking hook {hook.name}: {e}", exc_info=True)
+
+
+class ActiveDispatch:
+    """
+    ``dispatch``: forwards to the hook registry of the suite running in this
+    thread or task (see ``load_suite_listeners``), or to the global registry
+    outside a suite. Decorators register through it too, so the hooks of a
+    ``testsuites/<name>.py`` module land in that suite's registry.
+    """
+
+    def __init__(self, global_registry):
+        self.global_registry = global_registry
+
+    def registry(self):
+        return get_context("hook_registry") or self.global_registry
+
+    def register(self, event, func, background=False):
+        return self.registry().register(event, func, background=background)
+
+    def hooks(self, event):
+        return self.registry().hooks(event)
+
+    def calls(self, event):
+        return self.registry().calls(event)
+
+    def fire(self, event, *args):
+        self.registry().fire(event, *args)
+
+
+# Global registry for lifecycle hooks: core and project listeners
+global_hooks = HookDispatch()
+enabled_listeners = global_hooks.listeners
+dispatch = ActiveDispatch(global_hooks)
+
+# Decorators for users to register hooks. ``background=True`` runs the hook
+# on the listener queue instead of the test thread, e.g.
+#   @AfterTestCase(background=True)
+# Leave hooks inline when later code depends on their effect.
+
+def _hook(func, event, background):
+    if func is None:
+        return lambda f: dispatch.register(event, f, background=background)
+    return dispatch.register(event, func, background=background)
+
+def BeforeTestSuite(_func=None, *, background=False):
+    return _hook(_func, 'before_test_suite', background)
+
+def AfterTestSuite(_func=None, *, background=False):
+    return _hook(_func, 'after_test_suite', background)
+
+def BeforeScenario(_func=None, *, background=False):
+    return _hook(_func, 'before_scenario', background)
+
+def AfterScenario(_func=None, *, background=False):
+    return _hook(_func, 'after_scenario', background)
+
+def BeforeStep(_func=None, *, background=False):
+    return _hook(_func, 'before_step', background)
+
+def AfterStep(_func=None, *, background=False):
+    return _hook(_func, 'after_step', background)
+
+def BeforeTestCase(_func=None, *, background=False):
+    return _hook(_func, 'before_test_case', background)
+
+def AfterTestCase(_func=None, *, background=False):
+    return _hook(_func, 'after_test_case', background)
 
 def SetUp(_func=None, *, skipped=True):
     """
@@ -72,7 +241,7 @@ def SetUp(_func=None, *, skipped=True):
     """
     def decorator(func):
         if not skipped:
-            enabled_listeners['setup'].append(func)
+            dispatch.register('setup', func)
         return func
 
     # Support both @SetUp and @SetUp(skipped=False)
@@ -89,7 +258,7 @@ def Teardown(_func=None, *, skipped=True):
     """
     def decorator(func):
         if not skipped:
-            enabled_listeners['teardown'].append(func)
+            dispatch.register('teardown', func)
         return func
 
     if _func:
@@ -104,7 +273,7 @@ def SetupTestCase(_func=None, *, skipped=True):
     """
     def decorator(func):
         if not skipped:
-            enabled_listeners['setup_test_case'].append(func)
+            dispatch.register('setup_test_case', func)
         return func
 
     if _func:
@@ -119,13 +288,48 @@ def TeardownTestCase(_func=None, *, skipped=True):
     """
     def decorator(func):
         if not skipped:
-            enabled_listeners['teardown_test_case'].append(func)
+            dispatch.register('teardown_test_case', func)
         return func
 
     if _func:
         return decorator(_func)
     return decorator
 
+# Hooks may be plain functions or ``async def``
+
+def run_coroutine(coro):
+    """
+    Run a coroutine to completion from synchronous code. Uses asyncio.run
+    when this thread has no running loop, otherwise a helper thread so the
+    caller's loop is not re-entered.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    outcome = {}
+
+    def _target():
+        try:
+            outcome["result"] = asyncio.run(coro)
+        except BaseException as e:
+            outcome["error"] = e
+    # the coroutine still sees the caller's context (report, screenshots, ...)
+    ctx = contextvars.copy_context()
+    t = threading.Thread(target=ctx.run, args=(_target,), name="sfw-coroutine")
+    t.start()
+    t.join()
+    if "error" in outcome:
+        raise outcome["error"]
+    return outcome.get("result")
+
+def invoke_hook(func, *args):
+    """Call a hook synchronously, awaiting it if it is async."""
+    result = func(*args)
+    if inspect.isawaitable(result):
+        return run_coroutine(result)
+    return result
+
 # Core & user listener discovery (no suite-specific loading here)
 def load_core_and_user_listeners():
     # Load built-in listeners
@@ -153,15 +357,37 @@ def load_core_and_user_listeners():
 # Suite-specific listener loader called at runtime
 
 def load_suite_listeners(suite_path):
+    """
+    Give this suite run its own hook registry, layered over the global one,
+    and run ``testsuites/<name>.py`` into it. The module is executed afresh
+    for every run instead of being imported once, so its hooks neither pile
+    up nor leak into other suites. The registry is active in the current
+    context until ``unload_suite_listeners()``.
+    """
+    profile = HookProfile() if hook_profiling_enabled() else None
+    registry = HookDispatch(parent=global_hooks, profile=profile)
+    set_context("hook_registry", registry)
+
     basename = os.path.splitext(os.path.basename(suite_path))[0]
     suite_module = f"testsuites.{basename}"
     try:
-        importlib.import_module(suite_module)
+        spec = importlib.util.find_spec(suite_module)
+    except ImportError:
+        spec = None
+    if spec is None:
+        logger.debug(f"No suite listener {basename}.py found")
+        return registry
+    try:
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
         logger.info(f"Loaded suite listener: {basename}")
-    except ImportError as e:
-        logger.debug(f"No suite listener {basename}.py found: {e}")
     except Exception as ex:
         logger.error(f"Failed to load suite listener {basename}: {ex}")
+    return registry
+
+def unload_suite_listeners():
+    """Drop the registry of the suite that ran in this context."""
+    delete_context("hook_registry")
 
 # Initialize core and user listeners at import
 try:
@@ -1,8 +1,72 @@
+import hashlib
+import importlib.machinery
 import importlib.util
+import os
+import re
+import sys
+import threading
+
 
 class Loader:
-    def load_module_from_path(self, path):
-        spec = importlib.util.spec_from_file_location("module.name", path)
+    """
+    Loads test case modules from file paths.
+
+    Compiled code objects are cached per absolute path and invalidated when
+    the file's mtime or size changes; the first compile goes through
+    ``SourceFileLoader`` so the bytecode is also persisted in ``__pycache__``.
+    Each file gets its own module name. With ``reuse_modules=True`` an
+    unchanged file is not re-executed and the previous module is returned.
+    """
+
+    # shared by all Loader instances: test cases create their own Runner()
+    _code_cache = {}    # abs path -> (mtime_ns, size, code)
+    _module_cache = {}  # abs path -> (mtime_ns, size, module)
+    _lock = threading.Lock()
+
+    def __init__(self, reuse_modules=False):
+        self.reuse_modules = reuse_modules
+
+    def load_module_from_path(self, path, reuse=None):
+        abs_path = os.path.abspath(path)
+        st = os.stat(abs_path)
+        stamp = (st.st_mtime_ns, st.st_size)
+        reuse = self.reuse_modules if reuse is None else reuse
+
+        if reuse:
+            cached = self._module_cache.get(abs_path)
+            if cached and cached[:2] == stamp:
+                return cached[2]
+
+        name = self.module_name(abs_path)
+        code = self._get_code(name, abs_path, stamp)
+
+        spec = importlib.util.spec_from_file_location(name, abs_path)
         mod = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(mod)
-        return mod
\ No newline at end of file
+        sys.modules[name] = mod
+        try:
+            exec(code, mod.__dict__)
+        except BaseException:
+            sys.modules.pop(name, None)
+            raise
+
+        if reuse:
+            with self._lock:
+                self._module_cache[abs_path] = stamp + (mod,)
+        return mod
+
+    @staticmethod
+    def module_name(abs_path):
+        """Unique, stable module name for a file, e.g. ``sfw_case_login_1a2b3c4d``."""
+        stem = re.sub(r"\W", "_", os.path.splitext(os.path.basename(abs_path))[0])
+        digest = hashlib.sha1(abs_path.encode("utf-8")).hexdigest()[:8]
+        return f"sfw_case_{stem}_{digest}"
+
+    def _get_code(self, name, abs_path, stamp):
+        cached = self._code_cache.get(abs_path)
+        if cached and cached[:2] == stamp:
+            return cached[2]
+        # reads a valid __pycache__ entry or compiles and writes one
+        code = importlib.machinery.SourceFileLoader(name, abs_path).get_code(name)
+        with self._lock:
+            self._code_cache[abs_path] = stamp + (code,)
+        return code
@@ -0,0 +1,220 @@
+# File: seleniumfw/memory.py
+import threading
+import time
+from contextlib import contextmanager
+
+from seleniumfw.config import Config
+from seleniumfw.host_metrics import available_memory_mb, process_tree_rss_mb
+from seleniumfw.thread_context import get_context, set_context
+from seleniumfw.utils import Logger
+
+
+class MemoryMonitor:
+    """
+    Resident memory of the browser process trees this process launched.
+
+    ``BrowserFactory`` registers every driver's service process (chromedriver,
+    geckodriver) under the suite that launched it; a sampler thread sums the
+    RSS of each tree and keeps the peak per suite.
+
+    With a ``budget_mb`` set, ``admission()`` makes a new suite or test case
+    wait while current usage, plus one browser for each admitted case that
+    has not launched yet, plus one more browser would exceed the budget or
+    the memory the host has available. One browser is estimated at
+    ``per_browser_mb`` until real drivers have been measured. Work is always
+    admitted when none of our browsers are up, so a tight budget slows a run
+    down but never deadlocks it. The budget applies per process, i.e. per
+    worker with ``execution_method: process``.
+
+    Drivers parked idle in the ``DriverPool`` are reclaimable: they do not
+    count against the budget at admission, an admitted case reuses one, and
+    ``make_room()`` quits idle ones before a new browser is launched into
+    a full budget.
+    """
+
+    def __init__(self, budget_mb=None, per_browser_mb=500, interval=1.0):
+        self.logger = Logger.get_logger()
+        self.budget_mb = budget_mb
+        self.per_browser_mb = per_browser_mb
+        self.interval = interval
+        self._drivers = {}  # service pid -> owner
+        self._idle = set()  # service pids of drivers parked in a pool
+        self.reclaim = None  # callable quitting one idle pooled driver, True if it did
+        self._usage = {}    # service pid -> last sampled MB
+        self._peaks = {}    # owner -> peak MB
+        self._measured = 0.0
+        self._reserved = 0  # admitted cases whose browser is not up yet
+        self._active = 0
+        self._cond = threading.Condition()
+        self._thread = None
+
+    # -- drivers -----------------------------------------------------------
+
+    def register(self, driver, owner=None):
+        pid = _service_pid(driver)
+        if pid is None:
+            return  # remote drivers have no local process tree
+        ticket = get_context("memory_ticket")
+        with self._cond:
+            self._drivers[pid] = owner or get_context("suite_path")
+            if ticket is not None and not ticket["launched"]:
+                ticket["launched"] = True
+                self._reserved -= 1
+            self._ensure_sampler()
+        self.sample()
+
+    def set_idle(self, driver, idle):
+        """Mark a pooled driver as parked (``True``) or leased again (``False``)."""
+        pid = _service_pid(driver)
+        if pid is None:
+            return
+        with self._cond:
+            if idle:
+                self._idle.add(pid)
+            else:
+                self._idle.discard(pid)
+            self._cond.notify_all()
+
+    def sample(self):
+        with self._cond:
+            pids = list(self._drivers)
+        usage = process_tree_rss_mb(pids)
+        with self._cond:
+            for pid in pids:
+                if pid not in usage:
+                    # the driver quit; its tree is gone
+                    self._drivers.pop(pid, None)
+                    self._idle.discard(pid)
+            self._usage = usage
+            per_owner = {}
+            for pid, mb in usage.items():
+                owner = self._drivers.get(pid)
+                per_owner[owner] = per_owner.get(owner, 0.0) + mb
+                self._measured = max(self._measured, mb)
+            for owner, mb in per_owner.items():
+                self._peaks[owner] = max(self._peaks.get(owner, 0.0), mb)
+            self._cond.notify_all()
+        return usage
+
+    def usage_mb(self):
+        with self._cond:
+            return sum(self._usage.values())
+
+    def peak_mb(self, owner):
+        with self._cond:
+            peak = self._peaks.get(owner)
+        return round(peak, 1) if peak is not None else None
+
+    def _ensure_sampler(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._loop, name="sfw-memory-sampler", daemon=True)
+            self._thread.start()
+
+    def _loop(self):
+        while True:
+            time.sleep(self.interval)
+            self.sample()
+            with self._cond:
+                if not self._drivers and not self._active:
+                    self._thread = None
+                    return
+
+    # -- admission ---------------------------------------------------------
+
+    def estimate_mb(self):
+        """Expected memory of one more browser: the largest tree measured so far."""
+        return self._measured or self.per_browser_mb
+
+    def _fits(self):
+        idle = len(self._idle)
+        if idle > self._reserved:
+            return True  # an idle pooled browser serves this case, or makes room for it
+        busy = {pid: mb for pid, mb in self._usage.items() if pid not in self._idle}
+        if not busy and self._reserved == 0:
+            return True  # nothing of ours is running: always make progress
+        estimate = self.estimate_mb()
+        launches = self._reserved + 1 - idle
+        if sum(busy.values()) + launches * estimate > self.budget_mb:
+            return False
+        free = available_memory_mb()
+        reclaimable = sum(mb for pid, mb in self._usage.items() if pid in self._idle)
+        return free is None or free + reclaimable >= launches * estimate
+
+    def make_room(self):
+        """
+        Before launching a browser: quit idle pooled drivers while current
+        usage plus the new browser would exceed the budget.
+        """
+        if not self.budget_mb or self.reclaim is None:
+            return
+        while True:
+            with self._cond:
+                over = sum(self._usage.values()) + self.estimate_mb() > self.budget_mb
+                if not (over and self._idle):
+                    return
+            if not self.reclaim():
+                return
+            self.sample()
+
+    @contextmanager
+    def admission(self, label, reserve=True):
+        """
+        Wait until one more browser fits. ``reserve`` holds that browser's
+        share until the caller launches a driver or leaves the block; use
+        False for suites, whose cases are admitted one by one.
+        """
+        if not self.budget_mb:
+            yield
+            return
+        waited = time.time()
+        with self._cond:
+            while not self._fits():
+                if time.time() - waited < self.interval:
+                    self.logger.info(
+                        f"⏳ Waiting for memory: {label} (in use {sum(self._usage.values()):.0f}MB, "
+                        f"budget {self.budget_mb}MB, ~{self.estimate_mb():.0f}MB per browser)"
+                    )
+                self._cond.wait(timeout=self.interval)
+            self._active += 1
+            ticket = {"launched": not reserve}
+            if reserve:
+                self._reserved += 1
+            self._ensure_sampler()
+        if time.time() - waited > self.interval:
+            self.logger.info(f"Admitted {label} after {time.time() - waited:.1f}s")
+
+        previous = get_context("memory_ticket")
+        set_context("memory_ticket", ticket if reserve else previous)
+        try:
+            yield
+        finally:
+            set_context("memory_ticket", previous)
+            with self._cond:
+                self._active -= 1
+                if not ticket["launched"]:
+                    self._reserved -= 1
+                self._cond.notify_all()
+
+
+def _service_pid(driver):
+    service = getattr(driver, "service", None)
+    process = getattr(service, "process", None)
+    return getattr(process, "pid", None)
+
+
+_monitor = None
+_monitor_lock = threading.Lock()
+
+
+def get_memory_monitor():
+    """Process-wide monitor configured from ``memory_budget_mb``/``memory_per_browser_mb``."""
+    global _monitor
+    with _monitor_lock:
+        if _monitor is None:
+            cfg = Config()
+            budget = cfg.get("memory_budget_mb")
+            _monitor = MemoryMonitor(
+                budget_mb=float(budget) if budget else None,
+                per_browser_mb=float(cfg.get("memory_per_browser_mb", 500)),
+            )
+        return _monitor
@@ -0,0 +1,236 @@
+# File: seleniumfw/plan.py
+import os
+import threading
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Optional, Tuple
+
+import yaml
+
+from seleniumfw.exception import PlanError
+from seleniumfw.feature_index import features_referenced_by
+from seleniumfw.history import RunHistory, schedule_longest_first
+from seleniumfw.ramp_up import RAMP_UP_OPTIONS
+
+EXECUTION_METHODS = ("sequential", "parallel", "process", "distributed")
+
+_yaml_cache = {}
+_yaml_lock = threading.Lock()
+
+
+def load_yaml(path):
+    """
+    Parsed YAML document, cached per absolute path until the file's mtime or
+    size changes. Callers must treat the result as read-only.
+    """
+    full = os.path.abspath(path)
+    st = os.stat(full)
+    stamp = (st.st_mtime_ns, st.st_size)
+    with _yaml_lock:
+        cached = _yaml_cache.get(full)
+        if cached and cached[0] == stamp:
+            return cached[1]
+    with open(full) as f:
+        doc = yaml.safe_load(f)
+    with _yaml_lock:
+        _yaml_cache[full] = (stamp, doc)
+    return doc
+
+
+@dataclass(frozen=True)
+class CasePlan:
+    path: str
+    features: Tuple[str, ...] = ()
+    estimate: Optional[float] = None
+
+
+@dataclass(frozen=True)
+class SuitePlan:
+    path: str
+    settings: MappingProxyType = field(default_factory=lambda: MappingProxyType({}))
+    cases: Tuple[CasePlan, ...] = ()
+    estimate: Optional[float] = None
+
+
+@dataclass(frozen=True)
+class ExecutionPlan:
+    """
+    What a target will run, resolved and checked up front: ``kind`` is
+    ``collection``, ``suite``, ``case`` or ``feature``. For collections
+    ``suites`` is already in execution order and ``settings`` holds the
+    collection YAML; ``estimate`` is the expected wall time in seconds from
+    report history (None without any history). ``warnings`` lists what
+    looked wrong but may still work at run time.
+    """
+    kind: str
+    source: str
+    settings: MappingProxyType = field(default_factory=lambda: MappingProxyType({}))
+    suites: Tuple[SuitePlan, ...] = ()
+    estimate: Optional[float] = None
+    warnings: Tuple[str, ...] = ()
+
+    @property
+    def method(self):
+        return self.settings.get("execution_method", "sequential")
+
+    def describe(self):
+        """Human readable plan, as printed by ``--dry-run``."""
+        lines = [f"Plan for {self.kind} {self.source}"]
+        if self.kind == "collection":
+            lines[0] += f" ({self.method}, max {self.settings.get('max_concurrent_instances', 1)} at once)"
+        for n, suite in enumerate(self.suites, start=1):
+            extras = ", ".join(f"{k}: {suite.settings[k]}" for k in (
+                "parallel_cases", "retry", "fail_fast", "flaky_policy") if k in suite.settings)
+            lines.append(f"  {n}. {suite.path}  {_fmt(suite.estimate)}" + (f"  [{extras}]" if extras else ""))
+            for case in suite.cases:
+                lines.append(f"       - {case.path}  {_fmt(case.estimate)}")
+                for feature in case.features:
+                    lines.append(f"           * {feature}")
+        lines.append(f"Estimated duration: {_fmt(self.estimate, 'unknown (no history in reports/)')}")
+        lines.extend(f"Warning: {warning}" for warning in self.warnings)
+        return "\n".join(lines)
+
+
+def _fmt(seconds, unknown="(no history)"):
+    if seconds is None:
+        return unknown
+    return f"~{int(seconds // 60)}m {int(seconds % 60)}s"
+
+
+def compile_plan(target, history=None):
+    """
+    Compile a collection/suite YAML, test case or feature into an
+    ``ExecutionPlan``. Every referenced suite and test case is checked; all
+    problems are reported together in one ``PlanError``. Feature paths are
+    only sniffed from string literals in the test cases, so one that does
+    not exist (built at run time, relative to another base, ...) is a
+    warning on the plan rather than a problem.
+    """
+    problems, warnings = [], []
+    if not os.path.exists(target):
+        raise PlanError([f"File not found: {target}"])
+
+    suffix = os.path.splitext(target)[1].lower()
+    if suffix == ".py":
+        case = _compile_case(target, history or RunHistory(), problems, warnings)
+        if problems:
+            raise PlanError(problems)
+        return ExecutionPlan("case", target, suites=(SuitePlan(target, cases=(case,), estimate=case.estimate),),
+                             estimate=case.estimate, warnings=tuple(warnings))
+    if suffix == ".feature":
+        return ExecutionPlan("feature", target)
+    if suffix not in (".yml", ".yaml"):
+        raise PlanError([f"Unsupported target {target}: expected .yml/.yaml, .py or .feature"])
+
+    spec = _load(target, problems)
+    if spec is None:
+        raise PlanError(problems)
+    history = history or RunHistory(max_runs=spec.get("history_runs", 5))
+
+    if "testsuites" not in spec:
+        suite = _compile_suite(target, spec, history, problems, warnings)
+        if problems:
+            raise PlanError(problems)
+        return ExecutionPlan("suite", target, suites=(suite,), estimate=suite.estimate, warnings=tuple(warnings))
+
+    method = spec.get("execution_method", "sequential")
+    if method not in EXECUTION_METHODS:
+        problems.append(f"{target}: execution_method must be one of {', '.join(EXECUTION_METHODS)}, got {method!r}")
+    workers = spec.get("max_concurrent_instances", 1)
+    if not isinstance(workers, int) or workers < 1:
+        problems.append(f"{target}: max_concurrent_instances must be a positive integer, got {workers!r}")
+        workers = 1
+    job_timeout = spec.get("job_timeout")
+    if job_timeout is not None and (isinstance(job_timeout, bool) or not isinstance(job_timeout, (int, float))
+                                    or job_timeout <= 0):
+        problems.append(f"{target}: job_timeout must be a positive number of seconds, got {job_timeout!r}")
+    _check_ramp_up(target, spec, problems)
+    paths = spec.get("testsuites") or []
+    if not isinstance(paths, list):
+        problems.append(f"{target}: testsuites must be a list")
+        paths = []
+
+    suites = []
+    for path in paths:
+        suite_spec = _load(path, problems, referenced_by=target)
+        if suite_spec is not None:
+            suites.append(_compile_suite(path, suite_spec, history, problems, warnings))
+    if problems:
+        raise PlanError(problems)
+
+    suites = tuple(suites)
+    estimates = {s.path: s.estimate for s in suites}
+    parallel = method in ("parallel", "process") and workers > 1
+    if parallel and spec.get("scheduling", "history") == "history":
+        order, _ = schedule_longest_first([s.path for s in suites], estimates, workers)
+        by_path = {s.path: s for s in suites}
+        suites = tuple(by_path[p] for p in order)
+
+    estimate = None
+    if any(e is not None for e in estimates.values()):
+        if parallel:
+            _, bins = schedule_longest_first([s.path for s in suites], estimates, workers)
+            estimate = max(b["load"] for b in bins)
+        else:
+            delay = spec.get("delay_between_instances(s)", 0) or 0
+            estimate = sum(e or 0 for e in estimates.values()) + delay * max(0, len(suites) - 1)
+    return ExecutionPlan("collection", target, MappingProxyType(dict(spec)), suites, estimate, tuple(warnings))
+
+
+def _check_ramp_up(target, spec, problems):
+    ramp_up = spec.get("ramp_up")
+    if ramp_up not in (None, "adaptive"):
+        problems.append(f"{target}: ramp_up must be 'adaptive' when set, got {ramp_up!r}")
+    options = spec.get("ramp_up_options")
+    if options is None:
+        return
+    if not isinstance(options, dict):
+        problems.append(f"{target}: ramp_up_options must be a mapping")
+        return
+    for key, value in options.items():
+        if key not in RAMP_UP_OPTIONS:
+            problems.append(f"{target}: unknown ramp_up_options key {key!r} "
+                            f"(expected one of {', '.join(RAMP_UP_OPTIONS)})")
+        elif isinstance(value, bool) or not isinstance(value, (int, float)) or value <= 0:
+            problems.append(f"{target}: ramp_up_options.{key} must be a positive number, got {value!r}")
+
+
+def _load(path, problems, referenced_by=None):
+    where = f" (listed in {referenced_by})" if referenced_by else ""
+    if not os.path.isfile(path):
+        problems.append(f"Suite not found: {path}{where}")
+        return None
+    try:
+        spec = load_yaml(path)
+    except yaml.YAMLError as e:
+        problems.append(f"Invalid YAML in {path}: {e}")
+        return None
+    if not isinstance(spec, dict):
+        problems.append(f"{path}: expected a mapping at the top level")
+        return None
+    return spec
+
+
+def _compile_suite(path, spec, history, problems, warnings):
+    cases = spec.get("test_cases") or []
+    if not isinstance(cases, list):
+        problems.append(f"{path}: test_cases must be a list")
+        cases = []
+    compiled = tuple(_compile_case(case.replace('\\', '/'), history, problems, warnings, path) for case in cases)
+    estimate = history.estimate_suite(path)
+    if estimate is None and any(c.estimate is not None for c in compiled):
+        estimate = sum(c.estimate or 0 for c in compiled)
+    return SuitePlan(path, MappingProxyType(dict(spec)), compiled, estimate)
+
+
+def _compile_case(path, history, problems, warnings, suite=None):
+    if not os.path.isfile(path):
+        problems.append(f"Test case not found: {path}" + (f" (listed in {suite})" if suite else ""))
+        return CasePlan(path)
+    features = []
+    for feature in features_referenced_by(path):
+        if os.path.isfile(feature):
+            features.append(feature)
+        else:
+            warnings.append(f"Feature not found: {feature} (mentioned in {path})")
+    return CasePlan(path, tuple(features), history.estimate_case(path))
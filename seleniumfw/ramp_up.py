@@ -0,0 +1,167 @@
+# File: seleniumfw/ramp_up.py
+import collections
+import statistics
+import threading
+import time
+
+from seleniumfw.host_metrics import CpuSampler, available_memory_mb
+from seleniumfw.utils import Logger
+
+# keys accepted under a collection's ramp_up_options (checked by compile_plan)
+RAMP_UP_OPTIONS = ("start", "min_limit", "interval", "cpu_high", "cpu_low", "min_free_mb",
+                   "latency_factor", "launch_timeout")
+# window of the load average used where no instantaneous CPU measure exists
+LOADAVG_WINDOW = 60
+
+
+class LaunchMonitor:
+    """Recent browser launch latencies, fed by ``BrowserFactory._launch_driver``."""
+
+    def __init__(self, size=50):
+        self._launches = collections.deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def record(self, seconds, ok=True):
+        with self._lock:
+            self._launches.append((time.time(), seconds, ok))
+
+    def since(self, timestamp):
+        """``[(latency, ok), ...]`` of launches that finished after ``timestamp``."""
+        with self._lock:
+            return [(s, ok) for t, s, ok in self._launches if t >= timestamp]
+
+
+launch_monitor = LaunchMonitor()
+
+
+class AdaptiveLauncher:
+    """
+    Concurrency limit for ``ramp_up: adaptive`` collections, in place of a
+    fixed ``delay_between_instances(s)``.
+
+    Starts at ``start`` concurrent suites. Every ``interval`` seconds it
+    samples host CPU load (busy share of CPU time since the last sample),
+    available memory and browser launch latency:
+
+    * backs off (halves the limit) when load is above ``cpu_high``, memory
+      is below ``min_free_mb``, a launch failed or took over
+      ``launch_timeout`` seconds, or launches got ``latency_factor`` times
+      slower than the fastest median seen so far;
+    * adds one slot when every slot is busy and load is below ``cpu_low``;
+    * otherwise holds.
+
+    Each change is logged and kept in ``history`` for capacity planning.
+    Where only the 1-minute load average is available, CPU load is ignored
+    for ``LOADAVG_WINDOW`` seconds after a change, until it reflects it.
+    """
+
+    def __init__(self, max_limit, start=1, min_limit=1, interval=5, cpu_high=0.85, cpu_low=0.6,
+                 min_free_mb=1024, latency_factor=2.0, launch_timeout=60, monitor=None):
+        self.logger = Logger.get_logger()
+        self.max_limit = max(1, int(max_limit))
+        self.min_limit = max(1, min(int(min_limit), self.max_limit))
+        self.limit = max(self.min_limit, min(int(start), self.max_limit))
+        self.interval = interval
+        self.cpu_high = cpu_high
+        self.cpu_low = cpu_low
+        self.min_free_mb = min_free_mb
+        self.latency_factor = latency_factor
+        self.launch_timeout = launch_timeout
+        self.monitor = monitor or launch_monitor
+        self.cpu = CpuSampler()
+        self.running = 0
+        self.history = []
+        self._baseline = None
+        self._last_sample = time.time()
+        self._last_change = 0.0
+        self._cond = threading.Condition()
+        self._stop = threading.Event()
+        self._thread = None
+
+    @classmethod
+    def from_spec(cls, spec, max_limit):
+        """From a collection YAML: ``ramp_up: adaptive`` plus optional ``ramp_up_options``."""
+        return cls(max_limit, **(spec.get("ramp_up_options") or {}))
+
+    def start(self):
+        self._note(self.limit, "start", {})
+        self._thread = threading.Thread(target=self._loop, name="sfw-ramp-up", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        with self._cond:
+            self._cond.notify_all()
+        if self.history:
+            timeline = ", ".join(f"+{h['elapsed']:.0f}s→{h['limit']}" for h in self.history)
+            self.logger.info(f"Adaptive ramp-up concurrency timeline: {timeline}")
+
+    def acquire(self, should_stop=None):
+        """Block until a slot is free under the current limit. False if ``should_stop()`` fired."""
+        with self._cond:
+            while self.running >= self.limit:
+                if should_stop is not None and should_stop():
+                    return False
+                self._cond.wait(timeout=1)
+            self.running += 1
+            return True
+
+    def release(self):
+        with self._cond:
+            self.running = max(0, self.running - 1)
+            self._cond.notify_all()
+
+    def _loop(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.adjust()
+            except Exception as e:
+                self.logger.error(f"Adaptive ramp-up sampling failed: {e}", exc_info=True)
+
+    def adjust(self):
+        since, self._last_sample = self._last_sample, time.time()
+        launches = self.monitor.since(since)
+        load, free_mb = self.cpu.sample(), available_memory_mb()
+        if self.cpu.lagging and time.time() - self._last_change < LOADAVG_WINDOW:
+            load = None  # still mostly shows the load from before the last change
+        latency = statistics.median(s for s, _ in launches) if launches else None
+        if latency is not None:
+            self._baseline = latency if self._baseline is None else min(self._baseline, latency)
+        metrics = {
+            "cpu_load": round(load, 2) if load is not None else None,
+            "free_mb": round(free_mb) if free_mb is not None else None,
+            "launch_latency": round(latency, 2) if latency is not None else None,
+            "running": self.running,
+        }
+
+        reason = None
+        if any(not ok or s > self.launch_timeout for s, ok in launches):
+            reason = "browser launch failed or timed out"
+        elif load is not None and load > self.cpu_high:
+            reason = f"CPU load {load:.2f} > {self.cpu_high}"
+        elif free_mb is not None and free_mb < self.min_free_mb:
+            reason = f"free memory {free_mb:.0f}MB < {self.min_free_mb}MB"
+        elif latency is not None and latency > self._baseline * self.latency_factor:
+            reason = f"launch latency {latency:.1f}s > {self.latency_factor}x baseline {self._baseline:.1f}s"
+
+        with self._cond:
+            if reason:
+                new_limit = max(self.min_limit, self.limit // 2)
+            elif self.running >= self.limit and (load is None or load < self.cpu_low):
+                new_limit = min(self.max_limit, self.limit + 1)
+                reason = "all slots busy, host has headroom"
+            else:
+                new_limit = self.limit
+            if new_limit != self.limit:
+                self.limit = new_limit
+                self._last_change = time.time()
+                self._cond.notify_all()
+                self._note(new_limit, reason, metrics)
+        return self.limit
+
+    def _note(self, limit, reason, metrics):
+        started = self.history[0]["at"] if self.history else time.time()
+        self.history.append({"at": time.time(), "elapsed": time.time() - started, "limit": limit,
+                             "reason": reason, **metrics})
+        self.logger.info(f"⚙ Concurrency limit {limit}/{self.max_limit} ({reason}) {metrics}")
@@ -1,7 +1,11 @@
 import os
+import io
+import hashlib
 import json
 import platform
 import textwrap
+import threading
+from contextlib import contextmanager
 from datetime import datetime
 from reportlab.lib.pagesizes import letter
 from reportlab.pdfgen import canvas
@@ -10,6 +14,13 @@ from reportlab.lib import colors
 from reportlab.lib.colors import HexColor
 
 from seleniumfw.config import Config
+from seleniumfw.screenshot_scaler import get_screenshot_scaler
+from seleniumfw.utils import Logger
+
+try:
+    from pypdf import PdfReader, PdfWriter
+except ImportError:  # optional: report_incremental=true needs it to merge the parts
+    PdfReader = PdfWriter = None
 
 class ReportGenerator:
     def __init__(self, base_dir="reports"):
@@ -17,9 +28,9 @@ class ReportGenerator:
         # timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         timestamp = self.generate_report_name(datetime.now())
         if not os.path.exists(base_dir):
-            os.makedirs(base_dir)
-        self.run_dir = os.path.join(base_dir, timestamp)
-        os.makedirs(self.run_dir, exist_ok=True)
+            os.makedirs(base_dir, exist_ok=True)
+        self.run_dir = self._create_run_dir(base_dir, timestamp)
+        timestamp = os.path.basename(self.run_dir)
         self.screenshots_dir = os.path.join(self.run_dir, "screenshots")
         os.makedirs(self.screenshots_dir, exist_ok=True)
 
@@ -28,16 +39,70 @@ class ReportGenerator:
         self.overview_path = os.path.join(self.run_dir, "result.json")
         self.screenshot_path = os.path.join(self.run_dir, "screenshot.json")
 
-        self.c = canvas.Canvas(self.pdf_path, pagesize=letter)
         self.width, self.height = letter
         self.y = self.height - 50
+        self._setup_incremental()
+        # incremental mode draws the cover (header, summary, tables) separately
+        self.c = canvas.Canvas(self.cover_path if self.incremental else self.pdf_path, pagesize=letter)
         self.results = []
         self.testcase_result = []  # Track test case results
         self.overview = {}
         self.testcase_screenshots = []  # Track screenshots per test case
         self.current_page = 1  # Track current page number
         self.testcase_api_calls = {}  
+        self._lock = threading.Lock()  # test cases may record from parallel workers
+        self.rerun_of = None  # stamp of the report this run reruns
+        self.peak_memory_mb = None  # peak RSS of the suite's browsers, set by the runner
+        self.hook_profile = None  # HookProfile of the suite run, set by the runner
+        self.scaler = get_screenshot_scaler()  # downscaled copies of screenshots for embedding
+        self._image_digests = {}  # (path, size, mtime) of a screenshot -> content hash
+        self._images = {}  # content hash -> (file to embed, (width, height))
     
+    def _setup_incremental(self):
+        """
+        ``report_incremental=true``: sections are drawn as soon as they are
+        recorded, each kind into its own part document (scenarios, test
+        case screenshot attachments, test case API calls); ``finalize`` only
+        draws the cover pages and merges the parts the final layout keeps
+        (attachments without scenarios, case API calls when no scenario has
+        any), stamping footers on every page. The layout matches the
+        end-of-suite one, except that each part starts on a fresh page.
+        """
+        self.incremental = str(self.config.get("report_incremental", "false")).strip().lower() == "true"
+        if self.incremental and PdfWriter is None:
+            Logger.get_logger().warning("report_incremental needs the pypdf package; rendering the report at the end")
+            self.incremental = False
+        self._detail_started = False  # "Cucumber Detail" title drawn
+        self._current_feature = None
+        if not self.incremental:
+            return
+        self.cover_path = os.path.join(self.run_dir, ".cover.pdf")
+        self._parts = {
+            kind: {
+                "path": os.path.join(self.run_dir, f".{kind}.pdf"),
+                "canvas": canvas.Canvas(os.path.join(self.run_dir, f".{kind}.pdf"), pagesize=letter),
+                "y": self.height - 50,
+                "page": 1,
+                "used": False,
+            }
+            for kind in ("scenarios", "attachments", "api")
+        }
+        self._attachments = 0
+
+    @contextmanager
+    def _drawing_on(self, kind):
+        """Point the drawing methods at a part document (caller holds the lock)."""
+        part = self._parts[kind]
+        cover = (self.c, self.y, self.current_page)
+        self.c, self.y, self.current_page = part["canvas"], part["y"], part["page"]
+        try:
+            yield
+        finally:
+            if (self.y, self.current_page) != (part["y"], part["page"]):
+                part["used"] = True
+            part["y"], part["page"] = self.y, self.current_page
+            self.c, self.y, self.current_page = cover
+
     def generate_report_name(self, timestamp):
         now = timestamp
         ts_sec = now.strftime("%Y%m%d_%H%M%S")          # e.g. "20250707_221530"
@@ -45,9 +110,23 @@ class ReportGenerator:
         # ts     = f"{ts_sec}_{ms}"                       # e.g. "20250707_221530_123"
         return ts_sec
 
-    def record(self, feature, scenario, status, duration, screenshot_paths=None, steps_info=None, category="positive", api_calls=None):
-        """Record scenario with screenshots, steps, and API calls"""
-        self.results.append({
+    def _create_run_dir(self, base_dir, timestamp):
+        # Suites started within the same second (parallel/process collections)
+        # must not share a report folder, so suffix the stamp until it is free.
+        candidate = os.path.join(base_dir, timestamp)
+        i = 1
+        while True:
+            try:
+                os.makedirs(candidate)
+                return candidate
+            except FileExistsError:
+                candidate = os.path.join(base_dir, f"{timestamp}_{i}")
+                i += 1
+
+    def record(self, feature, scenario, status, duration, screenshot_paths=None, steps_info=None, category="positive", api_calls=None,
+               testcase=None):
+        """Record scenario with screenshots, steps, and API calls; ``testcase`` is the case that ran it"""
+        item = {
             "feature": feature,
             "scenario": scenario,
             "status": status,
@@ -56,26 +135,85 @@ class ReportGenerator:
             "steps": steps_info or [],
             "category": category,
             "api_calls": api_calls or []  # Add API calls to scenario record
-        })
-
-    def record_test_case_result(self, name, status, duration):
-        self.testcase_result.append({
+        }
+        if testcase:
+            item["testcase"] = testcase  # lets --rerun-failed scope scenarios per case
+        for path in item["screenshot"]:
+            self.scaler.submit(path, self.run_dir)
+        if self.incremental:
+            # reportlab canvases are not thread safe, so parallel cases draw
+            # one at a time; images are resolved before taking the lock
+            self._resolve_images(item["screenshot"])
+        with self._lock:
+            self.results.append(item)
+            if self.incremental:
+                with self._drawing_on("scenarios"):
+                    self.add_result_section(item)
+
+    def finish_test_case(self, name):
+        """
+        Called once a case's result, screenshots and API calls are recorded.
+        In incremental mode draws its screenshot attachment and its API
+        calls; ``finalize`` decides whether they are part of the report.
+        """
+        if not self.incremental:
+            return
+        with self._lock:
+            entry = next((e for e in self.testcase_screenshots if e["testcase_name"] == name), None)
+        if entry is not None:
+            self._resolve_images(entry["screenshots"][-1:])
+        with self._lock:
+            if entry is not None:
+                with self._drawing_on("attachments"):
+                    if not self._attachments:
+                        self.add_screenshot_attachment_title()
+                    self._attachments += 1
+                    self.add_screenshot_attachment_row(self._attachments, entry)
+            if self.testcase_api_calls.get(name):
+                with self._drawing_on("api"):
+                    self.add_api_section_for_test_case(name)
+
+    def record_test_case_result(self, name, status, duration, attempts=None, flakiness=None, quarantined=False,
+                                timeout=None):
+        """
+        ``attempts`` lists every try of a retried case ({attempt, status, duration, error});
+        ``timeout`` describes a watchdog timeout ({scope, seconds}).
+        """
+        entry = {
             "name": name,
             "status": status,
             "duration": duration
-        }) 
+        }
+        if attempts:
+            entry["attempts"] = attempts
+            # passed only after a retry
+            entry["flaky"] = status.upper() == "PASSED" and len(attempts) > 1
+        if flakiness is not None:
+            entry["flakiness"] = flakiness
+        if quarantined:
+            entry["quarantined"] = True
+        if timeout:
+            entry["timeout"] = timeout
+        with self._lock:
+            self.testcase_result.append(entry)
 
     def record_screenshot(self, testcase_name, screenshot_path):
-        # Check if testcase entry exists
-        for entry in self.testcase_screenshots:
-            if entry["testcase_name"] == testcase_name:
-                entry["screenshots"].append(screenshot_path)
-                return
-        # If not found, create new entry
-        self.testcase_screenshots.append({
-            "testcase_name": testcase_name,
-            "screenshots": [screenshot_path]
-        })
+        self.scaler.submit(screenshot_path, self.run_dir)
+        with self._lock:
+            # Check if testcase entry exists
+            for entry in self.testcase_screenshots:
+                if entry["testcase_name"] == testcase_name:
+                    entry["screenshots"].append(screenshot_path)
+                    return
+            # If not found, create new entry
+            self.testcase_screenshots.append({
+                "testcase_name": testcase_name,
+                "screenshots": [screenshot_path]
+            })
+
+    def record_api_calls(self, testcase_name, api_calls):
+        with self._lock:
+            self.testcase_api_calls[testcase_name] = api_calls
 
     def record_overview(self, suite_path, duration, start_time, end_time):
         self.overriew = {
@@ -91,8 +229,14 @@ class ReportGenerator:
             "passed": sum(1 for r in self.testcase_result if r['status'].lower() == 'passed'),
             "failed": sum(1 for r in self.testcase_result if r['status'].lower() == 'failed'),
             "skipped": sum(1 for r in self.testcase_result if r['status'].lower() == 'skipped'),
+            "timeout": sum(1 for r in self.testcase_result if r['status'].lower() == 'timeout'),
+            "flaky": sum(1 for r in self.testcase_result if r.get('flaky')),
             "testcase_results": self.testcase_result,
         }
+        if self.rerun_of:
+            self.overriew["rerun_of"] = self.rerun_of
+        if self.peak_memory_mb is not None:
+            self.overriew["peak_memory_mb"] = self.peak_memory_mb
 
     def save_json(self):
         with open(self.json_path, 'w') as f:
@@ -104,6 +248,38 @@ class ReportGenerator:
         with open(os.path.join(self.screenshot_path), 'w') as f:
             json.dump(self.testcase_screenshots, f, indent=2)
 
+    def _embeddable_image(self, path):
+        """
+        ``(file, (width, height))`` to draw for a screenshot. Screenshots
+        with the same content resolve to the same file, and reportlab
+        writes one image XObject per file name however often it is drawn;
+        handing it file names instead of ImageReader objects also spares it
+        decoding every image just to compare pixels.
+        """
+        st = os.stat(path)
+        key = (path, st.st_size, st.st_mtime_ns)  # a file saved again under the same name is new
+        digest = self._image_digests.get(key)
+        if digest is None:
+            sha = hashlib.sha1()
+            with open(path, "rb") as f:
+                for chunk in iter(lambda: f.read(1 << 20), b""):
+                    sha.update(chunk)
+            digest = self._image_digests[key] = sha.hexdigest()
+        image = self._images.get(digest)
+        if image is None:
+            # the first screenshot with this content is embedded for all of them
+            embedded = self.scaler.scaled(path, self.run_dir)
+            image = self._images[digest] = (embedded, ImageReader(embedded).getSize())
+        return image
+
+    def _resolve_images(self, paths):
+        """Hash and scale screenshots ahead of drawing them; failures surface when drawn."""
+        for path in paths:
+            try:
+                self._embeddable_image(path)
+            except Exception:
+                pass
+
     def _new_page_if_needed(self, height_needed=100):
         if self.y < height_needed:
             self._add_footer()  # Add footer before new page
@@ -175,21 +351,26 @@ class ReportGenerator:
 
     def _add_footer(self):
         """Add copyright footer with clickable LinkedIn link and page numbering"""
+        if self.incremental:
+            return  # stamped on the merged document, once page numbers are known
+        self._draw_footer(self.c, self.current_page)
+
+    def _draw_footer(self, c, page_number):
         footer_y = 20  # Position from bottom
         copyright_text = "© Copyright Muhamad Badru Salam"
-        page_text = f"Page {self.current_page}"
+        page_text = f"Page {page_number}"
         linkedin_url = "https://www.linkedin.com/in/muhamad-badru-salam-3bab2531b/"
         
         # Save current state
-        self.c.saveState()
+        c.saveState()
         
         # Set footer font and color
-        self.c.setFont("Helvetica", 8)
-        self.c.setFillColor(colors.grey)
+        c.setFont("Helvetica", 8)
+        c.setFillColor(colors.grey)
         
         # Calculate positions
-        copyright_width = self.c.stringWidth(copyright_text, "Helvetica", 8)
-        page_width = self.c.stringWidth(page_text, "Helvetica", 8)
+        copyright_width = c.stringWidth(copyright_text, "Helvetica", 8)
+        page_width = c.stringWidth(page_text, "Helvetica", 8)
         
         # Center the copyright text
         copyright_x = (self.width - copyright_width) / 2
@@ -198,14 +379,14 @@ class ReportGenerator:
         page_x = self.width - 50 - page_width
         
         # Draw the copyright footer with clickable LinkedIn link
-        self.c.linkURL(linkedin_url, (copyright_x, footer_y - 2, copyright_x + copyright_width, footer_y + 10))
-        self.c.drawString(copyright_x, footer_y, copyright_text)
+        c.linkURL(linkedin_url, (copyright_x, footer_y - 2, copyright_x + copyright_width, footer_y + 10))
+        c.drawString(copyright_x, footer_y, copyright_text)
         
         # Draw page number
-        self.c.drawString(page_x, footer_y, page_text)
+        c.drawString(page_x, footer_y, page_text)
         
         # Restore state
-        self.c.restoreState()
+        c.restoreState()
 
     def add_header(self, suite_name):
         self.c.setFont("Helvetica-Bold", 16)
@@ -213,6 +394,9 @@ class ReportGenerator:
         self.y -= 20
         self.c.setFont("Helvetica", 10)
         self.c.drawString(50, self.y, f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        if self.rerun_of:
+            self.y -= 15
+            self.c.drawString(50, self.y, f"Rerun of report: {self.rerun_of}")
         self.y -= 30
 
     def add_section_title(self, title, font_size=14, spacing=10):
@@ -260,7 +444,10 @@ class ReportGenerator:
         self.c.setFillColor(colors.green)
         self.c.drawString(mid,         self.y - 7*line_h, str(data.get("passed", 0)))
         self.c.setFillColor(colors.red)
-        self.c.drawString(mid,         self.y - 8*line_h, str(data.get("failed", 0)))
+        failed_str = str(data.get("failed", 0))
+        if data.get("timeout"):
+            failed_str += f" (+{data['timeout']} timed out)"
+        self.c.drawString(mid,         self.y - 8*line_h, failed_str)
 
         # Block 3: time info
         self.c.setFillColor(colors.black)
@@ -391,12 +578,19 @@ class ReportGenerator:
             # Prepare row data
             dur = case['duration']
             dur_str = f"{int(dur//60)}m - {int(dur%60)}s"
+            status_str = case['status'].upper()
+            if len(case.get('attempts', [])) > 1:
+                status_str += f" ({len(case['attempts'])} attempts)"
+            elif case.get('quarantined'):
+                status_str += " (quarantined)"
+            if case.get('timeout'):
+                status_str += f" ({case['timeout']['scope']} limit {case['timeout']['seconds']:.0f}s)"
             
             row_data = [
                 str(idx),
                 case['name'],
                 dur_str,
-                case['status'].upper()
+                status_str
             ]
             
             # Calculate row height based on wrapped text
@@ -409,7 +603,7 @@ class ReportGenerator:
             x = left_margin
             for i, (text, width) in enumerate(zip(row_data, col_widths)):
                 if i == 3:  # Status column - colored text
-                    status = text
+                    status = case['status'].upper()
                     color = colors.green if status == "PASSED" else (colors.red if status == "FAILED" else colors.orange)
                     self._draw_wrapped_text_in_cell(text, x, self.y, width, color=color)
                 else:
@@ -422,6 +616,57 @@ class ReportGenerator:
         self.c.setFillColor(colors.black)
         self.y -= 10
 
+    def add_hook_profile_section(self, limit=10):
+        """The slowest hooks by total time; AfterTestSuite hooks are still running at this point."""
+        rows = self.hook_profile.summary()[:limit] if self.hook_profile is not None else []
+        if not rows:
+            return
+        self.y -= 10
+        self.add_section_title("Hook Timing", font_size=12, spacing=8)
+
+        left_margin = 50
+        table_width = self.width - 100
+        col_widths = [
+            table_width * 0.18,   # Event
+            table_width * 0.42,   # Hook
+            table_width * 0.10,   # Calls
+            table_width * 0.10,   # Total
+            table_width * 0.10,   # p95
+            table_width * 0.10,   # Max
+        ]
+
+        header_height = 25
+        self._new_page_if_needed(header_height + 10)
+        self.c.setFillColor(HexColor("#4a90e2"))
+        self.c.rect(left_margin, self.y - header_height, table_width, header_height, fill=1, stroke=0)
+        self.c.setFillColor(colors.white)
+        self.c.setFont("Helvetica-Bold", 11)
+        x = left_margin
+        for header, w in zip(["Event", "Hook", "Calls", "Total", "p95", "Max"], col_widths):
+            self.c.drawString(x + 5, self.y - 18, header)
+            x += w
+        self.y -= header_height
+
+        for row in rows:
+            row_data = [
+                row["event"],
+                row["hook"],
+                str(row["count"]),
+                f"{row['total_ms']:.0f}ms",
+                f"{row['p95_ms']:.1f}ms",
+                f"{row['max_ms']:.1f}ms",
+            ]
+            row_height = self._calculate_row_height(row_data, col_widths, font_size=10, min_height=20)
+            self._new_page_if_needed(row_height + 5)
+            x = left_margin
+            for text, width in zip(row_data, col_widths):
+                self._draw_wrapped_text_in_cell(text, x, self.y, width)
+                x += width
+            self.y -= row_height
+
+        self.c.setFillColor(colors.black)
+        self.y -= 10
+
     def add_feature_section(self, feature_name):
         # Calculate height needed for wrapped feature name
         full_width = self.width - 100
@@ -557,8 +802,7 @@ class ReportGenerator:
             
             for img_file in scenario_data['screenshot']:
                 try:
-                    img_reader = ImageReader(img_file)
-                    iw, ih = img_reader.getSize()
+                    img_src, (iw, ih) = self._embeddable_image(img_file)
                     scale = min(max_w/iw, max_h/ih)
                     w, h = iw*scale, ih*scale
                     
@@ -567,7 +811,7 @@ class ReportGenerator:
                     
                     x = 50  # Match left margin
                     y_pos = self.y - h
-                    self.c.drawImage(img_reader, x, y_pos, width=w, height=h, preserveAspectRatio=True)
+                    self.c.drawImage(img_src, x, y_pos, width=w, height=h, preserveAspectRatio=True)
                     self.y = y_pos - 20  # Add spacing after screenshot
                     
                 except Exception as e:
@@ -754,107 +998,132 @@ class ReportGenerator:
         self.y -= 15
         self.add_api_section(calls, f"API Calls for {case_name}")
 
-    def finalize(self, suite_path):
-        suite_name = os.path.basename(suite_path)
-        
-        # 1. Add header
-        self.add_header(suite_name)
-        
-        # 2. Add summary section
-        self.add_summary_section()
-        
-        # 3. Add test case table (always first)
-        self.add_testcase_table()
-
-        # 4. If we have cucumber results, add cucumber sections
-        if self.results:
-            # Add cucumber summary table
-            self.add_cucumber_summary_table()
-            
-            # Add detailed cucumber scenarios
+    def add_result_section(self, item):
+        """One recorded scenario, preceded by the detail title and its feature header when they change."""
+        if not self._detail_started:
             self.y -= 20
             self.add_section_title("Cucumber Detail", font_size=12, spacing=8)
+            self._detail_started = True
 
-            # Group scenarios by feature and display them properly
-            current_feature = None
-            for item in self.results:
-                # Add feature header if this is a new feature
-                if item['feature'] != current_feature:
-                    if current_feature is not None:  # Add spacing between features
-                        self.y -= 20
-                    self.add_feature_section(item['feature'])
-                    current_feature = item['feature']
-                
-                # Add the scenario with its steps and screenshots
-                self.add_scenario_section(item)
+        # Add feature header if this is a new feature
+        if item['feature'] != self._current_feature:
+            if self._current_feature is not None:  # Add spacing between features
+                self.y -= 20
+            self.add_feature_section(item['feature'])
+            self._current_feature = item['feature']
 
-        # 5. Screenshot-only summary when no cucumber scenarios but we have screenshots
-        elif self.testcase_screenshots:
+        # Add the scenario with its steps and screenshots
+        self.add_scenario_section(item)
+
+    def add_screenshot_attachment_title(self):
+        if self.y < self.height - 50:  # start on a fresh page
+            self._add_footer()
             self.c.showPage()
             self.current_page += 1
             self.y = self.height - 50
-            self.add_section_title("Screenshot Attachment", font_size=14, spacing=12)
+        self.add_section_title("Screenshot Attachment", font_size=14, spacing=12)
 
-            left = 50
-            line_h = 18
-            table_width = self.width - 100
-            col_widths = [30, 270, 80, 80]
+        left = 50
+        line_h = 18
+        table_width = self.width - 100
+        col_widths = [30, 270, 80, 80]
 
-            # Header row background and white text
-            self._new_page_if_needed(line_h + 5)
-            self.c.setFillColor(HexColor("#4a90e2"))
-            self.c.rect(left, self.y - line_h, table_width, line_h, fill=1, stroke=0)
-            self.c.setFillColor(colors.white)
-            self.c.setFont("Helvetica-Bold", 11)
-            x = left
-            for header, w in zip(["#", "Description", "Elapsed", "Status"], col_widths):
-                self.c.drawString(x + 5, self.y - 15, header)
-                x += w
+        # Header row background and white text
+        self._new_page_if_needed(line_h + 5)
+        self.c.setFillColor(HexColor("#4a90e2"))
+        self.c.rect(left, self.y - line_h, table_width, line_h, fill=1, stroke=0)
+        self.c.setFillColor(colors.white)
+        self.c.setFont("Helvetica-Bold", 11)
+        x = left
+        for header, w in zip(["#", "Description", "Elapsed", "Status"], col_widths):
+            self.c.drawString(x + 5, self.y - 15, header)
+            x += w
 
-            self.y -= line_h
+        self.y -= line_h
 
-            # Data rows without outlines
-            self.c.setFont("Helvetica", 10)
-            for idx, entry in enumerate(self.testcase_screenshots, start=1):
-                name = entry["testcase_name"]
-                match = next((r for r in self.testcase_result if r["name"] == name), {})
-                dur = match.get("duration", 0)
-                elapsed = f"{int(dur//60)}m {int(dur%60)}s"
-                status = match.get("status", "").upper()
+        # Data rows without outlines
+        self.c.setFont("Helvetica", 10)
 
-                self._new_page_if_needed(line_h + 120)
-                y_top = self.y
+    def add_screenshot_attachment_row(self, idx, entry):
+        """A test case with its last screenshot, below ``add_screenshot_attachment_title``."""
+        left = 50
+        line_h = 18
+        col_widths = [30, 270, 80, 80]
 
-                # Text columns
-                self.c.setFillColor(colors.black)
-                self.c.drawString(left + 5, y_top - 15, str(idx))
-                self.c.drawString(left + col_widths[0] + 5, y_top - 15, name)
-                self.c.drawString(left + sum(col_widths[:2]) + 5, y_top - 15, elapsed)
-                color = colors.green if status == "PASSED" else (colors.red if status == "FAILED" else colors.orange)
-                self.c.setFillColor(color)
-                self.c.drawString(left + sum(col_widths[:3]) + 5, y_top - 15, status)
+        name = entry["testcase_name"]
+        match = next((r for r in self.testcase_result if r["name"] == name), {})
+        dur = match.get("duration", 0)
+        elapsed = f"{int(dur//60)}m {int(dur%60)}s"
+        status = match.get("status", "").upper()
+
+        self._new_page_if_needed(line_h + 120)
+        y_top = self.y
+
+        # Text columns
+        self.c.setFillColor(colors.black)
+        self.c.drawString(left + 5, y_top - 15, str(idx))
+        self.c.drawString(left + col_widths[0] + 5, y_top - 15, name)
+        self.c.drawString(left + sum(col_widths[:2]) + 5, y_top - 15, elapsed)
+        color = colors.green if status == "PASSED" else (colors.red if status == "FAILED" else colors.orange)
+        self.c.setFillColor(color)
+        self.c.drawString(left + sum(col_widths[:3]) + 5, y_top - 15, status)
+        self.c.setFillColor(colors.black)
+
+        # Draw screenshot image below text
+        if entry["screenshots"]:
+            img_path = entry["screenshots"][-1]
+            try:
+                img, (iw, ih) = self._embeddable_image(img_path)
+                max_w = col_widths[1]
+                max_h = 100
+                scale = min(max_w/iw, max_h/ih)
+                w, h = iw*scale, ih*scale
+                img_x = left + col_widths[0] + 5
+                img_y = y_top - line_h - h - 5
+                self.c.drawImage(img, img_x, img_y, width=w, height=h, preserveAspectRatio=True)
+            except Exception:
+                # Draw placeholder if image fails to load
+                self.c.setFillColor(colors.lightgrey)
+                self.c.rect(left + col_widths[0] + 5, y_top - line_h - 50, col_widths[1], 50, fill=1, stroke=0)
                 self.c.setFillColor(colors.black)
 
-                # Draw screenshot image below text
-                if entry["screenshots"]:
-                    img_path = entry["screenshots"][-1]
-                    try:
-                        img = ImageReader(img_path)
-                        iw, ih = img.getSize()
-                        max_w = col_widths[1]
-                        max_h = 100
-                        scale = min(max_w/iw, max_h/ih)
-                        w, h = iw*scale, ih*scale
-                        img_x = left + col_widths[0] + 5
-                        img_y = y_top - line_h - h - 5
-                        self.c.drawImage(img, img_x, img_y, width=w, height=h, preserveAspectRatio=True)
-                    except Exception:
-                        # Draw placeholder if image fails to load
-                        self.c.setFillColor(colors.lightgrey)
-                        self.c.rect(left + col_widths[0] + 5, y_top - line_h - 50, col_widths[1], 50, fill=1, stroke=0)
-                        self.c.setFillColor(colors.black)
-
-                self.y = y_top - line_h - 120 - 10    
+        self.y = y_top - line_h - 120 - 10
+
+    def add_cover(self, suite_path):
+        """Header, summary and the overview tables."""
+        # 1. Add header
+        self.add_header(os.path.basename(suite_path))
+
+        # 2. Add summary section
+        self.add_summary_section()
+
+        # 3. Add test case table (always first)
+        self.add_testcase_table()
+
+        # 3b. Slowest listener hooks (hooks_profile.json has all of them)
+        self.add_hook_profile_section()
+
+        # 4. Cucumber summary table
+        if self.results:
+            self.add_cucumber_summary_table()
+
+    def finalize(self, suite_path):
+        if self.incremental:
+            return self._finalize_incremental(suite_path)
+
+        self.add_cover(suite_path)
+
+        # 4. If we have cucumber results, add the detailed cucumber scenarios
+        if self.results:
+            # Group scenarios by feature and display them properly
+            for item in self.results:
+                self.add_result_section(item)
+
+        # 5. Screenshot-only summary when no cucumber scenarios but we have screenshots
+        elif self.testcase_screenshots:
+            self.add_screenshot_attachment_title()
+            for idx, entry in enumerate(self.testcase_screenshots, start=1):
+                self.add_screenshot_attachment_row(idx, entry)
 
         # 6. Add API sections for each test case
         # ✅ Only show test case API calls if no scenarios have API calls
@@ -865,10 +1134,55 @@ class ReportGenerator:
         
         # 7. Add footer and save
         self._add_footer()
+        self.scaler.release(self.run_dir)  # every image is embedded by now
         self.save_json()
         self.c.save()
         return self.run_dir
 
+    def _finalize_incremental(self, suite_path):
+        """Draw the cover, then merge cover and part pages and number them."""
+        self.add_cover(suite_path)
+        self.c.save()
+        # same choices as finalize(), now that every section is known
+        keep = ["scenarios"]
+        if not self.results:
+            keep.append("attachments")
+        if not any(item.get('api_calls') for item in self.results):
+            keep.append("api")
+        with self._lock:
+            merged = [self.cover_path]
+            for kind, part in self._parts.items():
+                if part["used"]:
+                    part["canvas"].save()
+                    if kind in keep:
+                        merged.append(part["path"])
+
+        writer = PdfWriter()
+        for path in merged:
+            writer.append(PdfReader(path))
+
+        # one footer page per merged page, laid over it
+        footers = io.BytesIO()
+        stamp = canvas.Canvas(footers, pagesize=letter)
+        for number in range(1, len(writer.pages) + 1):
+            self._draw_footer(stamp, number)
+            stamp.showPage()
+        stamp.save()
+        footers.seek(0)
+        for page, footer in zip(writer.pages, PdfReader(footers).pages):
+            page.merge_page(footer)
+            page.compress_content_streams()
+
+        with open(self.pdf_path, "wb") as f:
+            writer.write(f)
+        for path in [self.cover_path] + [part["path"] for part in self._parts.values()]:
+            if os.path.exists(path):
+                os.remove(path)
+
+        self.scaler.release(self.run_dir)  # every image is embedded by now
+        self.save_json()
+        return self.run_dir
+
 # Convenience function
 def create_suite_report(suite_path, results):
     rg = ReportGenerator()
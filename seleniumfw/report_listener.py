@@ -1,5 +1,6 @@
 # File: seleniumfw/report_listener.py
 
+import itertools
 import os
 import time
 from seleniumfw.report_generator import ReportGenerator
@@ -10,25 +11,58 @@ from seleniumfw.listener_manager import (
     BeforeTestCase, AfterTestCase
 )
 from seleniumfw.utils import Logger
-from seleniumfw.thread_context import get_context, set_context, clear_context
+from seleniumfw.thread_context import get_context, set_context, delete_context, clear_context
 
 logger = Logger.get_logger()
 
-_scenario_start = {}
-_steps_info = {}
-_step_start = {}
-_testcase_start = {}
-_suite_start = {}
-_start_time = {}
-_scenario_screenshot_start_index = {}  # Track starting index of screenshots for each scenario
-_scenario_api_calls_start_index = {}   # Track starting index of API calls for each scenario
+# Bookkeeping lives in the thread context ("suite_run", "scenario_run"), one
+# object per execution, so parallel suites or scenarios with the same name
+# never share timings and no lock is needed on the step path.
+_execution_ids = itertools.count(1)
+
+
+class SuiteExecution:
+    """One execution of a suite: its id and start time."""
+    __slots__ = ("id", "suite_path", "start")
+
+    def __init__(self, suite_path):
+        self.id = next(_execution_ids)
+        self.suite_path = suite_path
+        self.start = time.time()
+
+
+class ScenarioRun:
+    """
+    One execution of a behave scenario: timings, per-step results and where
+    its screenshots and API calls start in the case's context lists.
+    """
+    __slots__ = ("id", "name", "start", "step_start", "steps", "screenshot_index", "api_call_index")
+
+    def __init__(self, scenario):
+        self.id = next(_execution_ids)
+        self.name = scenario.name
+        self.start = time.time()
+        self.step_start = 0
+        self.steps = [
+            {
+                "keyword": getattr(step, "keyword", "STEP"),
+                "name": step.name,
+                "status": "SKIPPED",  # Default to SKIPPED
+                "duration": 0.0
+            }
+            for step in scenario.steps
+        ]
+        # Record the current length of the screenshot / API call lists as starting point for this scenario
+        self.screenshot_index = len(get_context("screenshots") or [])
+        self.api_call_index = len(get_context("api_calls") or [])
+
 
 @BeforeTestSuite
 def init_report(suite_path):
-    _suite_start[suite_path] = time.time()
-    _start_time[suite_path] = _suite_start[suite_path]
+    set_context("suite_run", SuiteExecution(suite_path))
 
     rg = ReportGenerator(base_dir="reports")
+    rg.rerun_of = get_context("rerun_of")  # set by Runner.rerun_failed
     set_context("report", rg)
     logger.info(f"Initialized reporting for suite: {suite_path}")
 
@@ -40,46 +74,31 @@ def init_report(suite_path):
 @BeforeTestCase
 def before_test_case(case, data=None):
     logger.info(f"Before test case: {case}")
-    _testcase_start[case] = time.time()
+    # kept per thread: with parallel_cases the same case path can run concurrently
+    set_context("testcase_start", time.time())
 
 @BeforeScenario
 def start_scenario_timer(context, scenario):
-    _scenario_start[scenario.name] = time.time()
-    _step_start[scenario.name] = 0
-    _steps_info[scenario.name] = [
-        {
-            "keyword": getattr(step, "keyword", "STEP"),
-            "name": step.name,
-            "status": "SKIPPED",  # Default to SKIPPED
-            "duration": 0.0
-        }
-        for step in scenario.steps
-    ]
-    
-    # Record the current length of screenshots list as starting point for this scenario
-    current_screenshots = get_context("screenshots") or []
-    _scenario_screenshot_start_index[scenario.name] = len(current_screenshots)
-    
-    # Record the current length of API calls list as starting point for this scenario
-    current_api_calls = get_context("api_calls") or []
-    _scenario_api_calls_start_index[scenario.name] = len(current_api_calls)
-    
-    logger.info(f"Scenario '{scenario.name}' started with {len(current_screenshots)} existing screenshots and {len(current_api_calls)} existing API calls")
+    run = ScenarioRun(scenario)
+    set_context("scenario_run", run)
+    logger.info(f"Scenario '{run.name}' (#{run.id}) started with {run.screenshot_index} existing screenshots and {run.api_call_index} existing API calls")
 
 @BeforeStep
 def start_step_timer(context, step):
-    scenario_name = context.scenario.name
-    _step_start[scenario_name] = time.time()
+    run = get_context("scenario_run")
+    if run is not None:
+        run.step_start = time.time()
 
 @AfterStep
 def record_step_info(context, step):
-    scenario_name = context.scenario.name
-    start = _step_start.get(scenario_name, time.time())
-    duration = time.time() - start
+    run = get_context("scenario_run")
+    if run is None:
+        return
+    duration = time.time() - (run.step_start or time.time())
     status = getattr(step.status, 'name', str(step.status)).upper()
 
     # Find and update matching step
-    for s in _steps_info[scenario_name]:
+    for s in run.steps:
         if s['name'] == step.name and s['status'] == 'SKIPPED':
             s['status'] = status
             s['duration'] = round(duration, 2)
@@ -89,12 +108,13 @@ def record_step_info(context, step):
 @AfterScenario
 def record_scenario_result(context, scenario):
     scenario_name = scenario.name
-    start = _scenario_start.pop(scenario_name, None) or 0
-    duration = time.time() - start
+    run = get_context("scenario_run")
+    delete_context("scenario_run")
+    duration = time.time() - run.start if run else 0
     status = getattr(scenario.status, 'name', str(scenario.status)).upper()
     tags = getattr(scenario, 'tags', [])
     category = tags[0] if tags else "Uncategorized"
-    steps = _steps_info.pop(scenario_name, [])
+    steps = run.steps if run else []
     feature = getattr(scenario, 'feature', None)
     feature_name = feature.name if feature else "Unknown Feature"
 
@@ -104,13 +124,11 @@ def record_scenario_result(context, scenario):
 
     # Get screenshots that were added during this scenario
     all_screenshots = get_context("screenshots") or []
-    screenshot_start_index = _scenario_screenshot_start_index.pop(scenario_name, 0)
-    scenario_screenshots = all_screenshots[screenshot_start_index:]
+    scenario_screenshots = all_screenshots[run.screenshot_index if run else 0:]
     
     # Get API calls that were made during this scenario
     all_api_calls = get_context("api_calls") or []
-    api_calls_start_index = _scenario_api_calls_start_index.pop(scenario_name, 0)
-    scenario_api_calls = all_api_calls[api_calls_start_index:]
+    scenario_api_calls = all_api_calls[run.api_call_index if run else 0:]
     
     logger.info(f"Scenario '{scenario_name}' captured {len(scenario_screenshots)} screenshots and {len(scenario_api_calls)} API calls")
 
@@ -123,7 +141,8 @@ def record_scenario_result(context, scenario):
         scenario_screenshots,  # Screenshots from this scenario
         steps,
         category=category,
-        api_calls=scenario_api_calls  # API calls from this scenario
+        api_calls=scenario_api_calls,  # API calls from this scenario
+        testcase=get_context("test_case"),
     )
 
     logger.info(f"Recorded scenario: {scenario_name} - {status} - {duration:.2f}s - Screenshots: {len(scenario_screenshots)} - API calls: {len(scenario_api_calls)}")
@@ -131,15 +150,24 @@ def record_scenario_result(context, scenario):
 @AfterTestCase
 def after_test_case(case, data=None):
     logger.info(f"After test case: {case}")
-    start = _testcase_start.pop(case, None) or 0
-    duration = time.time() - start
+    # skipped cases never went through before_test_case
+    start = get_context("testcase_start")
+    delete_context("testcase_start")
+    duration = time.time() - start if start else 0
     status = data.get('status', 'passed').upper() if data else 'PASSED'
 
     rg = get_context("report")
     if not rg:
         return
 
-    rg.record_test_case_result(case, status, round(duration, 2))
+    data = data or {}
+    rg.record_test_case_result(
+        case, status, round(duration, 2),
+        attempts=data.get("attempts"),
+        flakiness=data.get("flakiness"),
+        quarantined=data.get("quarantined", False),
+        timeout=data.get("timeout"),
+    )
 
     # Record all screenshots for the testcase (unchanged behavior)
     screenshots = get_context("screenshots") or []
@@ -149,7 +177,8 @@ def after_test_case(case, data=None):
     # Record all API calls for the testcase (unchanged behavior)
     api_calls = get_context("api_calls") or []
     if api_calls:
-        rg.testcase_api_calls[case] = api_calls
+        rg.record_api_calls(case, api_calls)
+    rg.finish_test_case(case)
 
     logger.info(f"Recorded testcase: {case} - {status} - {duration:.2f}s - Total Screenshots: {len(screenshots)} - Total API calls: {len(api_calls)}")
 
@@ -160,9 +189,10 @@ def after_test_case(case, data=None):
 @AfterTestSuite
 def finalize_report(suite_path):
     end_time = time.time()
-    start = _suite_start.pop(suite_path, None) or 0
-    start_time = _start_time.pop(suite_path, None) or start
-    duration = end_time - start
+    run = get_context("suite_run")
+    delete_context("suite_run")
+    start_time = run.start if run else end_time
+    duration = end_time - start_time
 
     rg = get_context("report")
     if not rg:
@@ -170,8 +200,4 @@ def finalize_report(suite_path):
 
     rg.record_overview(suite_path, round(duration, 2), start_time, end_time)
     run_dir = rg.finalize(suite_path)
-    logger.info(f"Report generated at: {run_dir}")
-    
-    # Clear any remaining tracking data
-    _scenario_screenshot_start_index.clear()
-    _scenario_api_calls_start_index.clear()
\ No newline at end of file
+    logger.info(f"Report generated at: {run_dir}")
\ No newline at end of file
@@ -0,0 +1,140 @@
+# File: seleniumfw/rerun.py
+import json
+import os
+from datetime import datetime
+
+# test case statuses in result.json that get rerun
+RERUN_CASE_STATUSES = ("FAILED", "TIMEOUT")
+# scenario statuses in cucumber.json that do not need a rerun
+PASSING_SCENARIO_STATUSES = ("PASSED", "SKIPPED", "UNTESTED")
+# reports/<COLLECTIONS_DIR>/<stamp>.json: which suite reports one collection run produced
+COLLECTIONS_DIR = "collections"
+
+
+def _report_stamps(reports_dir):
+    if not os.path.isdir(reports_dir):
+        return []
+    return [d for d in os.listdir(reports_dir) if os.path.isfile(os.path.join(reports_dir, d, "result.json"))]
+
+
+def _collection_stamps(reports_dir):
+    base = os.path.join(reports_dir, COLLECTIONS_DIR)
+    if not os.path.isdir(base):
+        return []
+    return [name[:-len(".json")] for name in os.listdir(base) if name.endswith(".json")]
+
+
+def resolve_report_dir(stamp="latest", reports_dir="reports"):
+    """Report folder for a stamp such as ``20250707_221530``, or the newest one for ``latest``."""
+    if stamp and stamp != "latest":
+        run_dir = os.path.join(reports_dir, stamp)
+        if not os.path.isfile(os.path.join(run_dir, "result.json")):
+            raise FileNotFoundError(f"No result.json in {run_dir}")
+        return run_dir
+
+    stamps = sorted(_report_stamps(reports_dir), reverse=True)
+    if not stamps:
+        raise FileNotFoundError(f"No previous reports found in {reports_dir}")
+    return os.path.join(reports_dir, stamps[0])
+
+
+def save_collection_run(collection_path, results, reports_dir="reports"):
+    """
+    Record the suite reports of a finished collection run under
+    ``reports/collections/<stamp>.json`` so ``--rerun-failed`` can find
+    them. The stamp is taken at the end, so it sorts after its suites'.
+    """
+    base = os.path.join(reports_dir, COLLECTIONS_DIR)
+    os.makedirs(base, exist_ok=True)
+    stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    candidate, i = stamp, 1
+    while True:
+        try:
+            path = os.path.join(base, f"{candidate}.json")
+            with open(path, "x") as f:
+                json.dump({
+                    "collection": collection_path,
+                    "suites": [
+                        {"suite_path": r["suite_path"], "report_dir": r.get("report_dir")}
+                        for r in results if not r.get("skipped")
+                    ],
+                }, f, indent=2)
+            return path
+        except FileExistsError:
+            candidate = f"{stamp}_{i}"
+            i += 1
+
+
+def build_rerun_plan(stamp="latest", reports_dir="reports"):
+    """
+    Reduced plan from a previous suite report, or from every suite report
+    of a previous collection run::
+
+        {"stamp": "...", "collection": "testsuite_collections/nightly.yml" or None,
+         "suites": [{"suite_path": "testsuites/login.yml", "report": "<suite report stamp>",
+                     "cases": [failed test cases],
+                     "scenarios": {test case: {feature name: [failed scenario names]}}}]}
+
+    ``latest`` is the newest suite report or collection run. ``scenarios``
+    comes from ``cucumber.json``; a case without entries is rerun whole.
+    Suites of a distributed run all point at its merged report; the
+    suite's own case list then narrows the failed cases down when it runs.
+    Reports written before scenarios recorded their test case key them
+    under ``None``, which applies to every case of the suite.
+    """
+    if not stamp or stamp == "latest":
+        # a collection is recorded after its suites; within the same second it wins
+        stamps = sorted(
+            [(s[:15], False, s) for s in _report_stamps(reports_dir)]
+            + [(s[:15], True, s) for s in _collection_stamps(reports_dir)],
+            reverse=True,
+        )
+        if not stamps:
+            raise FileNotFoundError(f"No previous reports found in {reports_dir}")
+        _, is_collection, stamp = stamps[0]
+    else:
+        is_collection = stamp in _collection_stamps(reports_dir)
+
+    if not is_collection:
+        run_dir = resolve_report_dir(stamp, reports_dir)
+        return {"stamp": os.path.basename(run_dir), "collection": None, "suites": [_suite_rerun(run_dir)]}
+
+    with open(os.path.join(reports_dir, COLLECTIONS_DIR, f"{stamp}.json")) as f:
+        record = json.load(f)
+    suites = []
+    for suite in record.get("suites", []):
+        run_dir = suite.get("report_dir")
+        if run_dir and os.path.isfile(os.path.join(run_dir, "result.json")):
+            # the recorded suite, not the report's testsuite_id: a merged report has the collection's
+            suites.append(dict(_suite_rerun(run_dir), suite_path=suite["suite_path"]))
+        else:
+            # the suite died before writing its report: rerun all of it
+            suites.append({"suite_path": suite["suite_path"], "report": None, "cases": None, "scenarios": {}})
+    return {"stamp": stamp, "collection": record.get("collection"), "suites": suites}
+
+
+def _suite_rerun(run_dir):
+    with open(os.path.join(run_dir, "result.json")) as f:
+        overview = json.load(f)
+
+    cases = [
+        r["name"] for r in overview.get("testcase_results", [])
+        if r.get("status", "").upper() in RERUN_CASE_STATUSES
+    ]
+
+    scenarios = {}
+    cucumber_path = os.path.join(run_dir, "cucumber.json")
+    if os.path.isfile(cucumber_path):
+        with open(cucumber_path) as f:
+            for item in json.load(f):
+                if item.get("status", "").upper() not in PASSING_SCENARIO_STATUSES:
+                    names = scenarios.setdefault(item.get("testcase"), {}).setdefault(item.get("feature"), [])
+                    if item["scenario"] not in names:
+                        names.append(item["scenario"])
+
+    return {
+        "suite_path": overview.get("testsuite_id"),
+        "report": os.path.basename(run_dir),
+        "cases": list(dict.fromkeys(cases)),
+        "scenarios": scenarios,
+    }
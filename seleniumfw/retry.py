@@ -0,0 +1,43 @@
+# File: seleniumfw/retry.py
+
+
+class RetryPolicy:
+    """
+    Inline retry settings of a suite, from its YAML::
+
+        retry:
+          count: 2                               # extra attempts after the first
+          on: [TimeoutException, AssertionError] # optional, default: any exception
+          fresh_driver: true                     # discard pooled drivers between attempts
+
+    Exception names match the class or any of its bases, by plain or dotted
+    name (``TimeoutException`` or ``selenium.common.exceptions.TimeoutException``).
+    """
+
+    def __init__(self, count=0, on=None, fresh_driver=False):
+        self.count = max(0, int(count or 0))
+        self.on = list(on or [])
+        self.fresh_driver = bool(fresh_driver)
+
+    @classmethod
+    def from_spec(cls, spec):
+        retry = spec.get("retry") or {}
+        if isinstance(retry, int):
+            return cls(count=retry)
+        return cls(retry.get("count", 0), retry.get("on"), retry.get("fresh_driver", False))
+
+    @property
+    def max_attempts(self):
+        return self.count + 1
+
+    def should_retry(self, exc, attempt):
+        """Whether attempt number ``attempt`` (1-based) failing with ``exc`` gets another try."""
+        if attempt >= self.max_attempts or exc is None:
+            return False
+        if not self.on:
+            return True
+        names = set()
+        for klass in type(exc).__mro__:
+            names.add(klass.__name__)
+            names.add(f"{klass.__module__}.{klass.__qualname__}")
+        return any(name in names for name in self.on)
@@ -1,21 +1,42 @@
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+import multiprocessing
 import os
+import re
 import time
 from dotenv import load_dotenv
-import yaml
 import inspect
-from behave.__main__ import main as behave_main
 from seleniumfw.loader import Loader
+from seleniumfw.behave_engine import get_behave_engine
+from seleniumfw.feature_index import get_feature_index
+from seleniumfw.history import RunHistory, schedule_longest_first
+from seleniumfw.plan import compile_plan, load_yaml
+from seleniumfw.rerun import build_rerun_plan, save_collection_run
+from seleniumfw.config import Config
 from seleniumfw.utils import Logger
-from seleniumfw.listener_manager import enabled_listeners, load_suite_listeners
-from seleniumfw.exception import FeatureException
+from seleniumfw.listener_manager import dispatch, load_suite_listeners, unload_suite_listeners, run_coroutine
+from seleniumfw.hook_queue import flush_background_hooks
+from seleniumfw.exception import FeatureException, CaseTimeout
+from seleniumfw.fail_fast import FailFast, FAILING_STATUSES
+from seleniumfw.watchdog import Timeouts, run_with_timeout
+from seleniumfw.retry import RetryPolicy
+from seleniumfw.driver_pool import release_leased_drivers
+from seleniumfw.driver_prewarmer import DriverPrewarmer
+from seleniumfw.distributed import DEFAULT_JOB_TIMEOUT, build_work_items, run_distributed
+from seleniumfw.ramp_up import AdaptiveLauncher
+from seleniumfw.memory import get_memory_monitor
+from seleniumfw.thread_context import (
+    get_context, set_context, delete_context, snapshot_context, restore_context
+)
 import sys
 
 
 class Runner:
     def __init__(self):
         self.logger = Logger.get_logger()
-        self.loader = Loader()
+        # reuse_test_modules=true skips re-executing unchanged test case files
+        reuse = str(Config().get("reuse_test_modules", "false")).lower() == "true"
+        self.loader = Loader(reuse_modules=reuse)
+        self.last_feature_result = None  # structured result of the last run_feature
     
     def _normalized_path(self, target):
         normalized_path = target.replace('\\', '/').replace('//', '/')
@@ -25,121 +46,559 @@ class Runner:
         self.logger.info(f"Running test case: {case_path}")
         mod = self.loader.load_module_from_path(case_path)
         if hasattr(mod, "run"):
-            mod.run()
+            result = mod.run()
+            if inspect.isawaitable(result):
+                # async def run(): drive it on its own event loop
+                run_coroutine(result)
         else:
             raise Exception(f"No 'run()' function found in {case_path}")
         
-    def _invoke_hook(self, hook, *args):
+    def run_suite(self, suite_path, abort=None, only_cases=None):
         """
-        Invoke a hook, matching its signature: if it expects no args, call without args,
-        otherwise pass the provided args.
+        Run one suite YAML. ``abort`` is an optional event set by a fail-fast
+        collection; once it is set the remaining cases are skipped.
+        ``only_cases`` restricts the run to those test cases (used by reruns).
         """
+        # 1) Give this run its own hook registry holding the suite-specific hooks
+        hook_registry = self._open_suite(suite_path)
+        # 🔹 Global BeforeTestSuite hooks
+        dispatch.fire('before_test_suite', suite_path)
+
+        # 🔹 Suite-specific SetUp hooks (@SetUp)
+        dispatch.fire('setup', suite_path)
+
+        run = SuiteRun(self, suite_path, abort, only_cases)
+        run.start_prewarmer()
         try:
-            sig = inspect.signature(hook)
-            if len(sig.parameters) == 0:
-                hook()
+            if run.parallel_cases > 1 and len(run.cases) > 1:
+                # Each worker thread starts from a copy of this thread's context
+                # (report, prewarmer, ...) but collects its own screenshots and API calls.
+                snapshot = snapshot_context()
+                with ThreadPoolExecutor(max_workers=run.parallel_cases) as exe:
+                    futures = [exe.submit(self._run_case_in_worker, snapshot, case, run) for case in run.cases]
+                    case_results = [f.result() for f in futures]
             else:
-                hook(*args)
-        except Exception as e:
-            self.logger.error(f"Error invoking hook {hook.__name__}: {e}", exc_info=True)
+                case_results = [self._run_or_skip(case, run) for case in run.cases]
+        finally:
+            run.stop_prewarmer()
 
-    def run_suite(self, suite_path):
-        # 1) Load ONLY the suite-specific hooks for this suite
-        load_suite_listeners(suite_path)
-        # 🔹 Global BeforeTestSuite hooks
-        for hook in enabled_listeners.get('before_test_suite', []):
-            self._invoke_hook(hook, suite_path)
+        case_results += [
+            self._skip_test_case(case, quarantined=True, flakiness=run.flakiness.get(case)) for case in run.quarantined
+        ]
 
-        # 🔹 Suite-specific SetUp hooks (@SetUp)
-        for hook in enabled_listeners.get('setup', []):
-            self._invoke_hook(hook, suite_path)
+        # 🔹 Suite-specific Teardown hooks (@Teardown)
+        dispatch.fire('teardown', suite_path)
+
+        rg = self._suite_report(run, hook_registry)
+
+        # 🔹 Global AfterTestSuite hooks
+        dispatch.fire('after_test_suite', suite_path)
+
+        return self._close_suite(run, hook_registry, rg, case_results)
+
+    # The suite steps around the hooks are shared with AsyncRunner.run_suite,
+    # which fires the same hooks on its event loop.
+
+    def _open_suite(self, suite_path):
+        # browsers launched from here on are attributed to this suite
+        set_context("suite_path", suite_path)
+        return load_suite_listeners(suite_path)
+
+    def _suite_report(self, run, hook_registry):
+        """After the teardown hooks: attach memory and hook timings to the suite's report."""
+        if run.timeouts.suite_expired():
+            self.logger.warning(f"Suite timeout ({run.timeouts.suite_timeout:.0f}s) reached; remaining cases were skipped")
+        rg = get_context("report")
+        if rg is not None:
+            rg.peak_memory_mb = get_memory_monitor().peak_mb(run.suite_path)
+            rg.hook_profile = hook_registry.profile
+        return rg
+
+    def _close_suite(self, run, hook_registry, rg, case_results):
+        """After the AfterTestSuite hooks: drain background hooks and drop the suite's context."""
+        # wait for this suite's background hooks (@AfterTestCase(background=True), ...)
+        flush_background_hooks(run.suite_path)
+        if hook_registry.profile is not None and rg is not None:
+            hook_registry.profile.save(os.path.join(rg.run_dir, "hooks_profile.json"))
+        unload_suite_listeners()
+        delete_context("suite_path")
+        return {
+            "suite_path": run.suite_path,
+            "report_dir": getattr(rg, "run_dir", None),
+            "testcase_results": case_results,
+        }
+
+    def _record_case(self, run, data):
+        run.fail_fast.record(data["status"] in FAILING_STATUSES)
+        if run.fail_fast.tripped():
+            self.logger.warning(f"Fail-fast threshold reached ({run.fail_fast.failures} failed); skipping remaining cases")
+        return data
+
+    def _apply_flaky_policy(self, cases, suite):
+        """
+        Score every case from report history and apply ``flaky_policy``:
+        ``last`` moves cases at or above ``flaky_threshold`` to the end,
+        ``quarantine`` skips them. Returns ``(cases to run, quarantined cases, {case: score})``.
+        """
+        history = RunHistory(max_runs=suite.get("history_runs", 10))
+        scores = {case: history.flakiness(case) for case in cases}
+        scores = {case: score for case, score in scores.items() if score is not None}
 
-        # Load the suite YAML
-        with open(suite_path) as f:
-            suite = yaml.safe_load(f)
+        policy = suite.get("flaky_policy")
+        threshold = float(suite.get("flaky_threshold", 0.3))
+        flaky = [case for case in cases if scores.get(case, 0) >= threshold]
+        if not flaky or policy not in ("last", "quarantine"):
+            return cases, [], scores
 
-        for case in suite.get("test_cases", []):
-            case = self._normalized_path(case)
-            # 🔹 Per-case SetupTestCase hooks (@SetupTestCase)
-            for hook in enabled_listeners.get('setup_test_case', []):
-                self._invoke_hook(hook, case, None)
+        self.logger.info(f"Flaky cases (score >= {threshold}, policy {policy}): "
+                         + ", ".join(f"{case} ({scores[case]})" for case in flaky))
+        stable = [case for case in cases if case not in flaky]
+        if policy == "last":
+            return stable + flaky, [], scores
+        return stable, flaky, scores
 
-            # 🔹 Global BeforeTestCase hooks
-            for hook in enabled_listeners.get('before_test_case', []):
-                self._invoke_hook(hook, case)
+    def _run_test_case(self, case, retry=None, flakiness=None, timeouts=None):
+        """Run a single test case wrapped in its per-case hooks."""
+        set_context("test_case", case)
+        # 🔹 Per-case SetupTestCase hooks (@SetupTestCase)
+        dispatch.fire('setup_test_case', case, None)
 
-            # Run the test case and capture status
-            status = "passed"
+        # 🔹 Global BeforeTestCase hooks
+        dispatch.fire('before_test_case', case)
+
+        # Run the test case and capture status, retrying inline per the suite's policy
+        retry = retry or RetryPolicy()
+        attempts = []
+        for attempt in range(1, retry.max_attempts + 1):
+            status, error, started = "passed", None, time.time()
+            seconds, scope = timeouts.for_case() if timeouts else (None, None)
             try:
-                self.run_case(case)
+                # with case_timeout/suite_timeout a watchdog abandons a hung case
+                run_with_timeout(lambda: self.run_case(case), case, seconds, scope)
+            except CaseTimeout as e:
+                status, error = "timeout", e
             except Exception as e:
                 self.logger.error(f"Error running test case {case}: {e}", exc_info=True)
-                status = "failed"
+                status, error = "failed", e
+            attempts.append({
+                "attempt": attempt,
+                "status": status.upper(),
+                "duration": round(time.time() - started, 2),
+                "error": f"{type(error).__name__}: {error}" if error else None,
+            })
+            if not retry.should_retry(error, attempt) or (timeouts and timeouts.suite_expired()):
+                break
+            self.logger.warning(f"🔁 Retrying test case {case} (attempt {attempt + 1}/{retry.max_attempts})")
+            if retry.fresh_driver:
+                release_leased_drivers(discard=True)
 
-            data = {"status": status, "name": case}
+        data = {"status": status, "name": case}
+        if retry.count:
+            data["attempts"] = attempts
+        if flakiness is not None:
+            data["flakiness"] = flakiness
+        if status == "timeout":
+            data["timeout"] = {"scope": error.scope, "seconds": round(error.seconds, 1)}
 
-            # 🔹 Global AfterTestCase hooks
-            for hook in enabled_listeners.get('after_test_case', []):
-                self._invoke_hook(hook, case, data)
+        # 🔹 Global AfterTestCase hooks
+        dispatch.fire('after_test_case', case, data)
 
-            # 🔹 Per-case TeardownTestCase hooks (@TeardownTestCase)
-            for hook in enabled_listeners.get('teardown_test_case', []):
-                self._invoke_hook(hook, case, data)
+        # 🔹 Per-case TeardownTestCase hooks (@TeardownTestCase)
+        dispatch.fire('teardown_test_case', case, data)
 
-        # 🔹 Suite-specific Teardown hooks (@Teardown)
-        for hook in enabled_listeners.get('teardown', []):
-            self._invoke_hook(hook, suite_path)
+        # Hand pooled drivers the case did not release back to the pool
+        # (a timed-out case's drivers were killed, so drop them)
+        release_leased_drivers(discard=status == "timeout")
 
-        # 🔹 Global AfterTestSuite hooks
-        for hook in enabled_listeners.get('after_test_suite', []):
-            self._invoke_hook(hook, suite_path)
+        delete_context("test_case")
+        return data
+
+    def _run_or_skip(self, case, run):
+        if run.should_skip():
+            return self._skip_test_case(case)
+        # with memory_budget_mb set, wait until one more browser fits
+        with get_memory_monitor().admission(case):
+            if run.should_skip():
+                return self._skip_test_case(case)
+            data = self._run_test_case(case, run.retry, run.flakiness.get(case), run.timeouts)
+        return self._record_case(run, data)
+
+    def _skip_test_case(self, case, quarantined=False, flakiness=None):
+        """Report a case that was not run; only the AfterTestCase hooks fire."""
+        self.logger.info(f"Skipping test case{' (quarantined as flaky)' if quarantined else ''}: {case}")
+        data = {"status": "skipped", "name": case}
+        if quarantined:
+            data.update(quarantined=True, flakiness=flakiness)
+        dispatch.fire('after_test_case', case, data)
+        return data
+
+    def _run_case_in_worker(self, snapshot, case, run):
+        restore_context(snapshot)
+        set_context("screenshots", [])
+        set_context("api_calls", [])
+        return self._run_or_skip(case, run)
+
+    def run_plan(self, plan):
+        """Execute a compiled ``ExecutionPlan`` (see ``seleniumfw.plan.compile_plan``)."""
+        if plan.kind == "collection":
+            return self.run_suite_collection(plan.source, plan=plan)
+        if plan.kind == "suite":
+            return self.run_suite(plan.source)
+        if plan.kind == "case":
+            return self.run_case(plan.source)
+        return self.run_feature(plan.source)
 
     def run_feature(self, feature_path, tags=None):
         self.logger.info(f"is feature {feature_path} exist: {os.path.exists(feature_path)}")
         self.logger.info(f"Running feature: {feature_path} with tags: {tags}")
-        args = []
-        if tags:
-            args.extend(["--tags", tags])
-        args.append(feature_path)
 
-        result_code = behave_main(args)  # <--- Capture the result code
+        if tags and os.path.exists(feature_path) and \
+                not get_feature_index().scenarios_matching(tags, [feature_path]):
+            # nothing to run: don't spin up behave at all
+            self.logger.info(f"No scenario in {feature_path} matches tags {tags}; skipping")
+            self.last_feature_result = {
+                "exit_code": 0, "failed": False, "error": None, "undefined_steps": 0, "features": []
+            }
+            return 0
+
+        # a rerun restricts features to the scenarios that failed before
+        names = self._rerun_scenarios(feature_path)
+        if names == []:
+            self.logger.info(f"No scenario of {feature_path} failed in report {get_context('rerun_of')}; skipping")
+            self.last_feature_result = {
+                "exit_code": 0, "failed": False, "error": None, "undefined_steps": 0, "features": []
+            }
+            return 0
+        names = [f"^{re.escape(name)}$" for name in names or []]
+
+        # steps and environment.py stay loaded between features
+        result = get_behave_engine().run(feature_path, tags=tags, names=names)
+        self.last_feature_result = result
+        result_code = result["exit_code"]
         if result_code != 0:
             self.logger.error(f"Feature run failed with code: {result_code}")
             raise FeatureException(f"Feature run failed with code: {result_code}")
-        # You can optionally store this somewhere to use in run_case
         return result_code
     
     
-    def run_suite_collection(self, collection_path):
+    def _rerun_scenarios(self, feature_path):
+        """
+        Scenario names a rerun limits ``feature_path`` to: ``None`` to run it
+        whole, ``[]`` to skip it (none of its scenarios failed in this case).
+        """
+        scenarios = get_context("scenario_filter")
+        if not scenarios:
+            return None
+        case = get_context("test_case")
+        if case in scenarios:
+            features, scoped = scenarios[case], True
+        elif None in scenarios:  # report from before scenarios recorded their case
+            features, scoped = scenarios[None], False
+        else:
+            return None  # the case failed outside its features' scenarios
+
+        if not os.path.isfile(feature_path):
+            return [name for names in features.values() for name in names]
+        doc = get_feature_index().get(feature_path)
+        names = features.get(doc["name"])
+        if names is None:
+            return [] if scoped else None
+        # outline rows are reported as "<outline> -- @<block>.<row> <name>"
+        if not {scenario["name"] for scenario in doc["scenarios"]} & {name.split(" -- @")[0] for name in names}:
+            self.logger.warning(f"None of the failed scenarios {names} exist in {feature_path} any more; "
+                                "rerunning the whole feature")
+            return None
+        return names
+
+    def rerun_failed(self, stamp="latest"):
+        """
+        Rerun only what failed in a previous report or collection run
+        (``<stamp>`` or ``latest``): the failed test cases of each suite, each
+        feature narrowed to the scenarios that failed in that case when
+        cucumber.json has them. Every new report records ``rerun_of``.
+        """
+        plan = build_rerun_plan(stamp)
+        for suite in plan["suites"]:
+            if suite["cases"]:
+                # a merged (distributed) report lists the failed cases of every suite
+                listed = {self._normalized_path(case) for case in load_yaml(suite["suite_path"]).get("test_cases", [])}
+                suite["cases"] = [case for case in suite["cases"] if self._normalized_path(case) in listed]
+        suites = [suite for suite in plan["suites"] if suite["cases"] is None or suite["cases"]]
+        if not suites:
+            self.logger.info(f"Nothing to rerun: report {plan['stamp']} has no failed test cases")
+            return None
+
+        results = []
+        for suite in suites:
+            what = "all cases" if suite["cases"] is None else f"{len(suite['cases'])} failed case(s)"
+            self.logger.info(f"Rerunning {what} of {suite['suite_path']} from report {suite['report'] or plan['stamp']}")
+            set_context("rerun_of", suite["report"] or plan["stamp"])
+            set_context("scenario_filter", suite["scenarios"])
+            try:
+                results.append(self.run_suite(suite["suite_path"], only_cases=suite["cases"]))
+            finally:
+                delete_context("rerun_of")
+                delete_context("scenario_filter")
+
+        if plan["collection"] is None:
+            return results[0]
+        save_collection_run(plan["collection"], results)
+        self._log_collection_summary(plan["collection"], results)
+        return results
+
+    def run_suite_collection(self, collection_path, plan=None):
         """
         Run a collection of test suites defined in a single YAML file.
         collection_path: path to collection YAML (with testsuites entries and settings)
+        plan: its compiled ExecutionPlan, if the caller already has one
         """
         if not os.path.exists(collection_path):
             raise FileNotFoundError(f"Collection file not found: {collection_path}")
 
+        # suites and cases are resolved and checked before anything starts
+        if plan is None:
+            plan = compile_plan(collection_path)
+            for warning in plan.warnings:
+                self.logger.warning(warning)
         project_root = os.getcwd()
-        spec         = yaml.safe_load(open(collection_path))
+        spec         = plan.settings
         method       = spec.get("execution_method", "sequential")
         max_inst     = spec.get("max_concurrent_instances", 1)
         delay        = spec.get("delay_between_instances(s)", 0)
-        suites       = spec.get("testsuites", [])
+        suites       = [suite.path for suite in plan.suites]  # already in run order
+
+        if method == "distributed":
+            return self._run_distributed(collection_path, spec)
+
+        if method in ("parallel", "process") and max_inst > 1 and spec.get("scheduling", "history") == "history":
+            self._log_schedule(plan, max_inst)
+
+        fail_fast = FailFast.from_spec(spec)
+        manager = None
+        if method == "process" and fail_fast.enabled:
+            # the abort flag has to reach the worker processes
+            manager = multiprocessing.Manager()
+            fail_fast.event = manager.Event()
 
         def _run_suite(path_str):
             suite_path = os.path.join(project_root, path_str)
-            self.logger.info(f"▶ Running suite: {suite_path}")
-            self.run_suite(suite_path)
+            with get_memory_monitor().admission(path_str, reserve=False):
+                self.logger.info(f"▶ Running suite: {suite_path}")
+                return self.run_suite(suite_path, abort=fail_fast.event if fail_fast.enabled else None)
 
-        if method == "parallel" and max_inst > 1:
-            with ThreadPoolExecutor(max_workers=max_inst) as exe:
-                futures = []
+        def _skipped(path_str):
+            suite_path = os.path.join(project_root, path_str)
+            self.logger.info(f"⏭ Skipping suite (fail-fast): {suite_path}")
+            return {"suite_path": suite_path, "report_dir": None, "skipped": True, "testcase_results": []}
+
+        def _record(result):
+            fail_fast.record(any(c["status"] in FAILING_STATUSES for c in result.get("testcase_results", [])))
+            return result
+
+        launcher = None
+        if spec.get("ramp_up") == "adaptive" and (method == "process" or (method == "parallel" and max_inst > 1)):
+            # concurrency follows host load instead of a fixed delay between suites
+            launcher = AdaptiveLauncher.from_spec(spec, max_inst).start()
+
+        results = []
+        try:
+            if method == "process" or (method == "parallel" and max_inst > 1):
+                if method == "process":
+                    # every suite gets its own interpreter: own listeners, own report
+                    exe = _fresh_process_executor(max(1, max_inst))
+                else:
+                    exe = ThreadPoolExecutor(max_workers=max_inst)
+
+                def _submit(path_str):
+                    if method == "process":
+                        suite_path = os.path.join(project_root, path_str)
+                        self.logger.info(f"▶ Running suite in worker process: {suite_path}")
+                        abort = fail_fast.event if fail_fast.enabled else None
+                        return exe.submit(_run_suite_in_process, suite_path, abort)
+                    return exe.submit(_run_suite, path_str)
+
+                def _on_done(future):
+                    if launcher is not None:
+                        launcher.release()
+                    # counted as soon as a suite ends, so fail-fast also stops submission
+                    if not future.cancelled() and future.exception() is None:
+                        _record(future.result())
+
+                with exe:
+                    futures = {}
+                    for idx, path_str in enumerate(suites):
+                        if fail_fast.tripped():
+                            break
+                        if launcher is not None and not launcher.acquire(should_stop=fail_fast.tripped):
+                            break
+                        future = _submit(path_str)
+                        future.add_done_callback(_on_done)
+                        futures[future] = idx
+                        if launcher is None:
+                            time.sleep(delay)
+                    done = {}
+                    for f in as_completed(futures):
+                        if f.cancelled():
+                            continue
+                        done[futures[f]] = f.result()
+                        if fail_fast.tripped():
+                            # queued suites never start; running ones wind down
+                            for pending in futures:
+                                pending.cancel()
+                    results = [done[i] if i in done else _skipped(p) for i, p in enumerate(suites)]
+            else:
                 for path_str in suites:
-                    futures.append(exe.submit(_run_suite, path_str))
-                    time.sleep(delay)
-                for f in futures:
-                    f.result()
-        else:
-            for path_str in suites:
-                _run_suite(path_str)
-                if delay:
-                    time.sleep(delay)
+                    if fail_fast.tripped():
+                        results.append(_skipped(path_str))
+                        continue
+                    results.append(_record(_run_suite(path_str)))
+                    if delay:
+                        time.sleep(delay)
+        finally:
+            if launcher is not None:
+                launcher.stop()
+            if manager is not None:
+                manager.shutdown()
+
+        self._log_collection_summary(collection_path, results)
+        save_collection_run(collection_path, results)
+        return results
+
+    def _run_distributed(self, collection_path, spec):
+        """
+        Hand the collection to a coordinator (``sfw serve``) at
+        ``coordinator_url`` and wait for its workers (``sfw worker``).
+        ``distribute: case`` queues every test case separately instead of
+        whole suites; ``job_timeout`` (seconds) bounds the wait.
+        """
+        url = spec.get("coordinator_url") or Config().get("coordinator_url", "http://localhost:5006")
+        items = build_work_items(spec, spec.get("distribute", "suite"))
+        rel_path = os.path.relpath(collection_path, os.getcwd()).replace("\\", "/")
+        job = run_distributed(url, rel_path, items, timeout=spec.get("job_timeout") or DEFAULT_JOB_TIMEOUT)
+
+        results = []
+        for item in job["items"]:
+            result = item["result"] or {}
+            self.logger.info(f"  • {item['suite']} {item['cases'] or ''} ran on {result.get('worker')} "
+                             f"({item['leases']} lease(s))")
+            results.append({
+                "suite_path": item["suite"],
+                "report_dir": result.get("report_dir"),
+                "worker": result.get("worker"),
+                "testcase_results": result.get("testcase_results", []),
+            })
+        self._log_collection_summary(collection_path, results)
+        self.logger.info(f"Report generated at: {job['report_dir']} (merged from {len(job['items'])} work items)")
+        # the workers' reports stay on the workers; reruns read the merged one
+        save_collection_run(collection_path, [
+            {"suite_path": suite, "report_dir": job["report_dir"]}
+            for suite in dict.fromkeys(item["suite"] for item in job["items"])
+        ])
+        return results
+
+    def _log_schedule(self, plan, workers):
+        """Log the expected per-worker load of a history-ordered plan."""
+        estimates = {suite.path: suite.estimate for suite in plan.suites}
+        if all(e is None for e in estimates.values()):
+            self.logger.info("No suite history in reports/; keeping YAML order")
+            return
+
+        _, bins = schedule_longest_first(list(estimates), estimates, workers)
+        self.logger.info(f"History-based schedule for {workers} workers:")
+        for i, b in enumerate(bins, start=1):
+            names = ", ".join(
+                f"{p} (~{estimates[p]:.0f}s)" if estimates[p] is not None else f"{p} (no history)"
+                for p in b["items"]
+            )
+            self.logger.info(f"  worker {i} ~{b['load']:.0f}s: {names}")
+
+    def _log_collection_summary(self, collection_path, results):
+        """Log the merged outcome of every suite in a collection."""
+        cases = [c for r in results for c in r.get("testcase_results", [])]
+        passed = sum(1 for c in cases if c["status"] == "passed")
+        failed = sum(1 for c in cases if c["status"] == "failed")
+        timed_out = sum(1 for c in cases if c["status"] == "timeout")
+        skipped = sum(1 for c in cases if c["status"] == "skipped")
+        flaky = sum(1 for c in cases if c["status"] == "passed" and len(c.get("attempts", [])) > 1)
+        skipped_suites = sum(1 for r in results if r.get("skipped"))
+        self.logger.info(
+            f"Collection {collection_path} finished: {len(results)} suites ({skipped_suites} skipped), "
+            f"{len(cases)} test cases, {passed} passed, {failed} failed, {timed_out} timed out, {skipped} skipped, {flaky} flaky"
+        )
+        for r in results:
+            self.logger.info(f"  • {r['suite_path']} → {r.get('report_dir')}")
+
+
+class SuiteRun:
+    """
+    Options and shared state of one suite run, read from the suite YAML:
+    the cases to run (after ``only_cases`` and ``flaky_policy``), fail-fast,
+    retries, timeouts and the driver pre-warmer. Used by ``Runner`` and
+    ``AsyncRunner`` alike.
+    """
+
+    def __init__(self, runner, suite_path, abort=None, only_cases=None):
+        suite = load_yaml(suite_path)
+        self.suite_path = suite_path
+        self.abort = abort
+        cases = [runner._normalized_path(case) for case in suite.get("test_cases", [])]
+        if only_cases is not None:
+            wanted = {runner._normalized_path(case) for case in only_cases}
+            cases = [case for case in cases if case in wanted]
+        self.parallel_cases = int(suite.get("parallel_cases", 1) or 1)
+        self.fail_fast = FailFast.from_spec(suite)
+        self.retry = RetryPolicy.from_spec(suite)
+        self.flakiness, self.quarantined = {}, []
+        if self.retry.count or suite.get("flaky_policy"):
+            cases, self.quarantined, self.flakiness = runner._apply_flaky_policy(cases, suite)
+        self.cases = cases
+        self.timeouts = Timeouts.from_spec(suite)
+        self.prewarm_depth = int(suite.get("prewarm_drivers", 0) or 0)
+        self.prewarmer = None
+
+    def should_skip(self):
+        return self.fail_fast.tripped() or (self.abort is not None and self.abort.is_set()) \
+            or self.timeouts.suite_expired()
+
+    def start_prewarmer(self):
+        if self.prewarm_depth > 0 and self.cases:
+            # boot the next drivers in the background while cases run
+            self.prewarmer = DriverPrewarmer(depth=self.prewarm_depth, max_launches=len(self.cases)).start()
+            set_context("prewarmer", self.prewarmer)
+
+    def stop_prewarmer(self):
+        if self.prewarmer is not None:
+            delete_context("prewarmer")
+            self.prewarmer.stop()
+            self.prewarmer = None
+
+
+def _fresh_process_executor(max_workers):
+    """
+    Executor running every submitted call in a new worker process, so no
+    module cache, listener or driver pool state leaks from one suite into
+    the next. 3.11+ retires each worker after one task; older Pythons get
+    one single-worker pool per call, ``max_workers`` at a time.
+    """
+    if sys.version_info >= (3, 11):
+        return ProcessPoolExecutor(max_workers=max_workers, max_tasks_per_child=1)
+    return _ProcessPerCallExecutor(max_workers)
+
+
+class _ProcessPerCallExecutor(ThreadPoolExecutor):
+    def submit(self, fn, *args, **kwargs):
+        return super().submit(_call_in_new_process, fn, *args, **kwargs)
+
+
+def _call_in_new_process(fn, *args, **kwargs):
+    with ProcessPoolExecutor(max_workers=1) as exe:
+        return exe.submit(fn, *args, **kwargs).result()
+
+
+def _run_suite_in_process(suite_path, abort=None):
+    """
+    Entry point for ``execution_method: process`` workers. Runs in a fresh
+    interpreter, so listeners and the report are loaded per worker; only the
+    picklable summary returned by ``run_suite`` travels back to the parent.
+    """
+    return Runner().run_suite(suite_path, abort=abort)
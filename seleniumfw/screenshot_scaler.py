@@ -0,0 +1,165 @@
+# File: seleniumfw/screenshot_scaler.py
+import hashlib
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from seleniumfw.config import Config
+from seleniumfw.utils import Logger
+
+try:
+    from PIL import Image
+except ImportError:  # optional: without Pillow the originals are embedded
+    Image = None
+
+# largest box a screenshot is drawn in (scenario sections), in PDF points
+MAX_DISPLAY_PT = (512, 300)
+
+
+class ScreenshotScaler:
+    """
+    Downscales screenshots to what the PDF report can show: at most
+    ``MAX_DISPLAY_PT`` at ``dpi``, re-encoded as JPEG. Screenshots are
+    submitted as soon as they are taken and scaled on a small thread pool
+    while the suite keeps running; the report then embeds the scaled copy.
+
+    Copies are cached next to the original in ``.scaled/``, keyed on the
+    original's path, size and mtime and on the settings, so reruns of the
+    report reuse them. Screenshots with the same content (the same page
+    shot twice, a file saved again under another name) are scaled once and
+    share that copy. Originals are never touched. Without Pillow, or for
+    images that would not get smaller, the original path is returned.
+
+    Jobs are grouped by ``scope``, the report folder they are embedded
+    in, so a report only shares copies among its own screenshots;
+    ``release(scope)`` forgets a finished report's jobs. Failed jobs are
+    not kept, so the next request tries again.
+    """
+
+    def __init__(self, dpi=144, quality=80, workers=2):
+        self.logger = Logger.get_logger()
+        self.dpi = dpi
+        self.quality = quality
+        self.max_px = tuple(int(pt * dpi / 72) for pt in MAX_DISPLAY_PT)
+        self.enabled = Image is not None and dpi > 0
+        self._pool = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="sfw-scaler") \
+            if self.enabled else None
+        self._scopes = {}  # report dir -> {"jobs": {(path, size, mtime): future}, "content": {hash: future}}
+        self._lock = threading.Lock()
+
+    def submit(self, path, scope=None):
+        """
+        Start scaling ``path`` for the report in ``scope`` in the background
+        (once per version of the file). Without a scope nothing is kept.
+        """
+        if not self.enabled or not path:
+            return None
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        if scope is None:
+            return self._pool.submit(self._scale, path)
+        key = (path, st.st_size, st.st_mtime_ns)
+        with self._lock:
+            jobs = self._scopes.setdefault(scope, {"jobs": {}, "content": {}})["jobs"]
+            job = jobs.get(key)
+            if job is None:
+                job = jobs[key] = self._pool.submit(self._scale_once, path, scope)
+                job.add_done_callback(lambda f: self._forget_failed(scope, "jobs", key, f))
+            return job
+
+    def scaled(self, path, scope=None):
+        """Path to embed for ``path``; waits for its scaling if still running."""
+        job = self.submit(path, scope)
+        if job is None:
+            return path
+        try:
+            return job.result()
+        except Exception as e:
+            self.logger.warning(f"Could not downscale screenshot {path}: {e}")
+            return path
+
+    def release(self, scope):
+        """Forget the jobs of a finished report (running ones still complete)."""
+        with self._lock:
+            self._scopes.pop(scope, None)
+
+    def _forget_failed(self, scope, kind, key, future):
+        if future.cancelled() or future.exception() is None:
+            return
+        with self._lock:
+            cache = self._scopes.get(scope, {}).get(kind, {})
+            if cache.get(key) is future:
+                del cache[key]
+
+    def _cache_path(self, path):
+        st = os.stat(path)
+        key = f"{os.path.abspath(path)}|{st.st_size}|{st.st_mtime_ns}|{self.max_px}|{self.quality}"
+        name = hashlib.sha1(key.encode("utf-8")).hexdigest()[:20] + ".jpg"
+        return os.path.join(os.path.dirname(path), ".scaled", name)
+
+    def _scale_once(self, path, scope):
+        sha = hashlib.sha1()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                sha.update(chunk)
+        digest = sha.hexdigest()
+        with self._lock:
+            content = self._scopes.setdefault(scope, {"jobs": {}, "content": {}})["content"]
+            shared = content.get(digest)
+            owner = shared is None
+            if owner:
+                shared = content[digest] = Future()
+                shared.add_done_callback(lambda f: self._forget_failed(scope, "content", digest, f))
+        if not owner:
+            # the copy scaled for the same content in this report, by a job already running
+            return shared.result()
+        try:
+            shared.set_result(self._scale(path))
+        except Exception as e:
+            shared.set_exception(e)
+        return shared.result()
+
+    def _scale(self, path):
+        target = self._cache_path(path)
+        if os.path.exists(target):
+            return target
+        with Image.open(path) as img:
+            if img.format == "JPEG" and img.width <= self.max_px[0] and img.height <= self.max_px[1]:
+                return path  # already small enough
+            img.draft("RGB", self.max_px)  # lets JPEG sources decode at reduced size
+            if img.mode in ("RGBA", "LA", "P"):
+                rgba = img.convert("RGBA")
+                img = Image.new("RGB", rgba.size, (255, 255, 255))
+                img.paste(rgba, mask=rgba.getchannel("A"))
+            elif img.mode != "RGB":
+                img = img.convert("RGB")
+            img.thumbnail(self.max_px, Image.LANCZOS)
+
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            partial = f"{target}.{threading.get_ident()}.tmp"
+            img.save(partial, "JPEG", quality=self.quality, optimize=True)
+        if os.path.getsize(partial) >= os.path.getsize(path):
+            os.remove(partial)
+            return path
+        os.replace(partial, target)
+        return target
+
+
+_scaler = None
+_scaler_lock = threading.Lock()
+
+
+def get_screenshot_scaler():
+    """Process-wide scaler configured from ``report_image_dpi``/``report_image_quality``/``report_image_workers``."""
+    global _scaler
+    with _scaler_lock:
+        if _scaler is None:
+            cfg = Config()
+            _scaler = ScreenshotScaler(
+                dpi=int(cfg.get("report_image_dpi", 144)),
+                quality=int(cfg.get("report_image_quality", 80)),
+                workers=int(cfg.get("report_image_workers", 2)),
+            )
+        return _scaler
@@ -1,22 +1,43 @@
 # File: seleniumfw/thread_context.py
-import threading
+from contextvars import ContextVar
 
-# Single thread-local storage
-_thread_context = threading.local()
+# One dict per execution context. Threads start with an empty context, so
+# this behaves like thread-local storage for threaded runs; asyncio tasks
+# call new_context() to get their own copy instead of sharing the parent's.
+_context = ContextVar("sfw_context", default=None)
+
+def _current():
+    ctx = _context.get()
+    if ctx is None:
+        ctx = {}
+        _context.set(ctx)
+    return ctx
 
 def set_context(key, value):
-    setattr(_thread_context, key, value)
+    _current()[key] = value
 
 def get_context(key, default=None):
-    return getattr(_thread_context, key, default)
+    return _current().get(key, default)
 
 def has_context(key):
-    return hasattr(_thread_context, key)
+    return key in _current()
 
 def delete_context(key):
-    if hasattr(_thread_context, key):
-        delattr(_thread_context, key)
+    _current().pop(key, None)
 
 def clear_context():
-    for key in list(vars(_thread_context).keys()):
-        delattr(_thread_context, key)
+    _context.set({})
+
+def snapshot_context():
+    """Shallow copy of the current thread's context, e.g. to seed a worker thread."""
+    return dict(_current())
+
+def restore_context(snapshot):
+    _context.set(dict(snapshot))
+
+def new_context():
+    """
+    Fork the current context: later set_context calls only affect this
+    thread or asyncio task. Run at the start of every concurrent task.
+    """
+    _context.set(dict(_current()))
@@ -0,0 +1,156 @@
+# File: seleniumfw/watchdog.py
+import contextvars
+import os
+import re
+import threading
+import time
+
+from seleniumfw.exception import CaseTimeout
+from seleniumfw.host_metrics import kill_process_tree
+from seleniumfw.thread_context import get_context, set_context, snapshot_context, restore_context
+from seleniumfw.utils import Logger
+
+logger = Logger.get_logger()
+
+
+class Timeouts:
+    """
+    ``case_timeout`` and ``suite_timeout`` (seconds) of a suite YAML. The
+    suite clock starts when the object is created; a case never gets more
+    time than the suite has left.
+    """
+
+    def __init__(self, case_timeout=None, suite_timeout=None):
+        self.case_timeout = float(case_timeout) if case_timeout else None
+        self.suite_timeout = float(suite_timeout) if suite_timeout else None
+        self.suite_deadline = time.time() + self.suite_timeout if self.suite_timeout else None
+
+    @classmethod
+    def from_spec(cls, spec):
+        return cls(spec.get("case_timeout"), spec.get("suite_timeout"))
+
+    @property
+    def enabled(self):
+        return bool(self.case_timeout or self.suite_timeout)
+
+    def suite_expired(self):
+        return self.suite_deadline is not None and time.time() >= self.suite_deadline
+
+    def for_case(self):
+        """``(seconds, scope)`` the next case may run, or ``(None, None)`` without a limit."""
+        remaining = self.suite_deadline - time.time() if self.suite_deadline else None
+        if self.case_timeout and (remaining is None or self.case_timeout <= remaining):
+            return self.case_timeout, "case"
+        if remaining is not None:
+            return max(0.0, remaining), "suite"
+        return None, None
+
+
+def run_with_timeout(func, case, seconds, scope="case"):
+    """
+    Run ``func()`` on a helper thread that shares this thread's context and
+    wait up to ``seconds``. On timeout the case's browsers are screenshotted
+    (if they still answer) and their process trees killed, this thread moves
+    to a fresh copy of its context so the abandoned helper cannot write into
+    the next case, and ``CaseTimeout`` is raised.
+    """
+    if seconds is None:
+        return func()
+    track_case_drivers()
+
+    outcome = {}
+
+    def _target():
+        try:
+            outcome["result"] = func()
+        except BaseException as e:
+            outcome["error"] = e
+
+    ctx = contextvars.copy_context()
+    helper = threading.Thread(target=ctx.run, args=(_target,), name=f"sfw-case-{os.path.basename(case)}", daemon=True)
+    helper.start()
+    helper.join(seconds)
+    if helper.is_alive():
+        raise abandon_case(case, seconds, scope)
+    if "error" in outcome:
+        raise outcome["error"]
+    return outcome.get("result")
+
+
+def track_case_drivers():
+    """Start collecting the drivers the current case launches or leases."""
+    for key in ("case_drivers", "leased_drivers"):
+        if get_context(key) is None:
+            set_context(key, [])
+
+
+def abandon_case(case, seconds, scope="case"):
+    """
+    Screenshot and kill the browsers of a case that ran out of time, then
+    move the caller to a fresh copy of its context so the still running
+    case cannot write into the next one. Returns the ``CaseTimeout`` to raise.
+    """
+    stop_case_drivers(case, seconds, scope)
+    restore_context(snapshot_context())
+    set_context("case_drivers", [])
+    return CaseTimeout(seconds, scope)
+
+
+def stop_case_drivers(case, seconds, scope="case"):
+    """
+    The browser half of ``abandon_case``: screenshot and kill the drivers
+    of the current context. The caller detaches from that context itself,
+    e.g. an asyncio task that offloads this call to a thread.
+    """
+    logger.error(f"⏰ Test case {case} exceeded its {scope} timeout ({seconds:.0f}s); killing its browsers")
+    drivers = _owned_drivers()
+    final_screenshot(drivers, case)
+    kill_drivers(drivers)
+
+
+def _owned_drivers():
+    drivers = []
+    for key in ("case_drivers", "leased_drivers"):
+        for driver in get_context(key) or []:
+            if all(driver is not d for d in drivers):
+                drivers.append(driver)
+    return drivers
+
+
+def final_screenshot(drivers, case, wait=10):
+    """Best effort screenshot of each driver; a hung driver is given ``wait`` seconds."""
+    name = re.sub(r"[^\w.-]+", "_", os.path.splitext(os.path.basename(case))[0])
+    for n, driver in enumerate(drivers):
+        ctx = contextvars.copy_context()
+        t = threading.Thread(
+            target=ctx.run,
+            args=(_safe_screenshot, driver, f"timeout_{name}{'_' + str(n) if n else ''}.png"),
+            daemon=True,
+        )
+        t.start()
+        t.join(wait)
+
+
+def _safe_screenshot(driver, filename):
+    try:
+        driver.save_screenshot(filename)
+    except Exception as e:
+        logger.warning(f"No final screenshot after timeout: {e}")
+
+
+def kill_drivers(drivers):
+    """Kill the local process tree (driver service plus browsers) of each driver."""
+    for driver in drivers:
+        process = getattr(getattr(driver, "service", None), "process", None)
+        if process is not None and getattr(process, "pid", None):
+            kill_process_tree(process.pid)
+        else:
+            # remote session: all we can do is ask politely, without waiting on it
+            threading.Thread(target=_quiet_quit, args=(driver,), daemon=True).start()
+
+
+def _quiet_quit(driver):
+    try:
+        driver.quit()
+    except Exception:
+        pass
@@ -3,6 +3,7 @@ from dotenv import load_dotenv
 import typer
 import shutil
 from pathlib import Path
+from typing import Optional
 from seleniumfw.utils import render_template
 from seleniumfw import run
 
@@ -123,30 +124,36 @@ def implement_feature(name: str):
         typer.secho(f"❌ Feature not found: {feature_path}", fg=typer.colors.RED)
         raise typer.Exit(1)
 
+    from seleniumfw.feature_index import get_feature_index
+    try:
+        feature = get_feature_index().get(feature_path)
+    except Exception as e:
+        typer.secho(f"❌ Failed to parse {feature_path}: {e}", fg=typer.colors.RED)
+        raise typer.Exit(1)
+
+    all_steps = list(feature["background"])
+    for scenario in feature["scenarios"]:
+        all_steps.extend(scenario["steps"])
+
     steps = ["from behave import given, when, then\n"]
-    last_decorator = "when"
-
-    with open(feature_path) as f:
-        for line in f:
-            line = line.strip()
-            if line.startswith(("Given", "When", "Then", "And", "*")):
-                parts = line.split(" ", 1)
-                if len(parts) != 2:
-                    continue  # skip malformed
-                keyword, rest = parts
-                decorator = keyword.lower() if keyword.lower() != "and" else last_decorator
-                last_decorator = decorator
-
-                # Convert <param> to {param}
-                pattern = re.sub(r"<([^>]+)>", r"{\1}", rest)
-
-                # Extract argument names from pattern
-                param_names = re.findall(r"{(.*?)}", pattern)
-                args = ", ".join(["context"] + param_names)
-
-                steps.append(f"@{decorator}('{pattern}')")
-                steps.append(f"def step_impl({args}):")
-                steps.append("    pass\n")
+    seen = set()
+    for step in all_steps:
+        # behave already resolved And/But/* to the preceding step type
+        decorator = step["step_type"] if step["step_type"] in ("given", "when", "then") else "when"
+
+        # Convert <param> to {param}
+        pattern = re.sub(r"<([^>]+)>", r"{\1}", step["name"])
+        if (decorator, pattern) in seen:
+            continue  # behave rejects duplicate step definitions
+        seen.add((decorator, pattern))
+
+        # Extract argument names from pattern
+        param_names = re.findall(r"{(.*?)}", pattern)
+        args = ", ".join(["context"] + param_names)
+
+        steps.append(f"@{decorator}('{pattern}')")
+        steps.append(f"def step_impl({args}):")
+        steps.append("    pass\n")
 
     steps_path.parent.mkdir(parents=True, exist_ok=True)
     steps_path.write_text("\n".join(steps))
@@ -156,8 +163,15 @@ def implement_feature(name: str):
 
 @app.command("run")
 def run_command(
-    target: str,
-    env_file: Path = typer.Option(None, "--env", "-e", help="Path to .env file to load before running")
+    target: Optional[str] = typer.Argument(
+        None, help="A .feature, .yml/.yaml or .py file; with --rerun-failed a report stamp or 'latest'"
+    ),
+    env_file: Path = typer.Option(None, "--env", "-e", help="Path to .env file to load before running"),
+    rerun_failed: bool = typer.Option(
+        False, "--rerun-failed",
+        help="Rerun the failed cases of a previous suite report or collection run (TARGET: <stamp>, default latest)"
+    ),
+    dry_run: bool = typer.Option(False, "--dry-run", help="Validate and print the execution plan without running it"),
 ):
     """Run a suite/case/feature with optional environment file"""
     # If a custom env file is provided, override defaults
@@ -167,8 +181,17 @@ def run_command(
             raise typer.Exit(1)
         load_dotenv(dotenv_path=env_file, override=True)
 
+    if rerun_failed:
+        from seleniumfw.runner import Runner
+        Runner().rerun_failed(target or "latest")
+        return
+
+    if not target:
+        typer.secho("❌ Provide a target to run or --rerun-failed [<stamp>|latest]", fg=typer.colors.RED)
+        raise typer.Exit(1)
+
     # Execute the run
-    run(target)
+    run(target, dry_run=dry_run)
 
 
 
@@ -178,5 +201,23 @@ def serve(port: int = typer.Option(None, help="Port to run the server")):
     from seleniumfw.api_server import start_server
     start_server(port)
 
+@app.command()
+def worker(
+    coordinator: str = typer.Option("http://localhost:5006", "--coordinator", "-c", help="URL of the `sfw serve` coordinator"),
+    name: Optional[str] = typer.Option(None, help="Worker name shown by the coordinator (default: host-pid)"),
+    capacity: int = typer.Option(1, help="Work items to run at the same time"),
+    idle_timeout: Optional[int] = typer.Option(None, help="Exit after this many seconds without work"),
+    env_file: Path = typer.Option(None, "--env", "-e", help="Path to .env file to load before running"),
+):
+    """Pull and run work items from a coordinator (execution_method: distributed)."""
+    if env_file:
+        if not env_file.exists():
+            typer.secho(f"❌ Env file not found: {env_file}", fg=typer.colors.RED)
+            raise typer.Exit(1)
+        load_dotenv(dotenv_path=env_file, override=True)
+
+    from seleniumfw.distributed import Worker
+    Worker(coordinator, name=name, capacity=capacity, idle_timeout=idle_timeout).run()
+
 if __name__ == "__main__":
     app()
@@ -1,26 +1,29 @@
 # tests/include/environment.py
-from seleniumfw.listener_manager import enabled_listeners
+from seleniumfw.listener_manager import dispatch
+
+# dispatch.calls() returns the precompiled hooks of an event; behave calls
+# the step hooks for every step, so they loop over it directly.
 
 def before_feature(context, feature):
-    for func in enabled_listeners['before_feature']:
-        func(context, feature)
+    for call in dispatch.calls('before_feature'):
+        call(context, feature)
 
 def after_feature(context, feature):
-    for func in enabled_listeners['after_feature']:
-        func(context, feature)
+    for call in dispatch.calls('after_feature'):
+        call(context, feature)
 
 def before_scenario(context, scenario):
-    for func in enabled_listeners['before_scenario']:
-        func(context, scenario)
+    for call in dispatch.calls('before_scenario'):
+        call(context, scenario)
 
 def after_scenario(context, scenario):
-    for func in enabled_listeners['after_scenario']:
-        func(context, scenario)
+    for call in dispatch.calls('after_scenario'):
+        call(context, scenario)
 
 def before_step(context, step):
-    for func in enabled_listeners['before_step']:
-        func(context, step)
+    for call in dispatch.calls('before_step'):
+        call(context, step)
 
 def after_step(context, step):
-    for func in enabled_listeners['after_step']:
-        func(context, step)
\ No newline at end of file
+    for call in dispatch.calls('after_step'):
+        call(context, step)
@@ -1,2 +1,6 @@
 from seleniumfw import run
-run()
+
+# the guard is required for `execution_method: process`, which re-imports
+# this module in every worker process
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,41 @@
+"""
+AsyncRunner memory admission: a case cancelled while it waits for memory
+hands its reservation back once the wait ends.
+"""
+import asyncio
+import time
+
+import pytest
+
+pytest.importorskip("behave")
+
+
+def test_cancelled_admission_is_released(monkeypatch):
+    from seleniumfw import memory
+    from seleniumfw.async_runner import AsyncRunner
+
+    mon = memory.MemoryMonitor(budget_mb=100, per_browser_mb=80, interval=0.05)
+    monkeypatch.setattr(memory, "_monitor", mon)
+    monkeypatch.setattr(memory, "available_memory_mb", lambda: None)
+    mon._usage = {1: 60.0}  # one busy browser of ours: the next one does not fit
+    runner = AsyncRunner()
+
+    async def main():
+        task = asyncio.ensure_future(runner._admit(mon.admission("testcases/a.py")))
+        await asyncio.sleep(0.2)
+        assert not task.done()
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    try:
+        asyncio.run(main())
+        with mon._cond:
+            mon._usage = {}  # the busy browser quit: the abandoned wait is admitted
+            mon._cond.notify_all()
+        deadline = time.time() + 5
+        while time.time() < deadline and (mon._active or mon._reserved):
+            time.sleep(0.05)
+        assert (mon._active, mon._reserved) == (0, 0)
+    finally:
+        runner.close()
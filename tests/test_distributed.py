@@ -0,0 +1,150 @@
+"""
+Coordinator and two workers on localhost, all in this process: the API
+server's Flask app is served on a free port and each worker pulls test
+cases over HTTP until the job's merged report is written.
+"""
+import importlib
+import json
+import os
+import threading
+
+import pytest
+
+werkzeug_serving = pytest.importorskip("werkzeug.serving")
+
+CASE = """import time
+def run():
+    time.sleep(0.5)
+    assert {ok}
+"""
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    (tmp_path / "testcases").mkdir()
+    (tmp_path / "testsuites").mkdir()
+    (tmp_path / "testsuite_collections").mkdir()
+    (tmp_path / "settings").mkdir()
+    cases = {"a.py": True, "b.py": True, "c.py": False, "d.py": True}
+    for name, ok in cases.items():
+        (tmp_path / "testcases" / name).write_text(CASE.format(ok=ok))
+    (tmp_path / "testsuites" / "one.yml").write_text("test_cases:\n  - testcases/a.py\n  - testcases/b.py\n")
+    (tmp_path / "testsuites" / "two.yml").write_text("test_cases:\n  - testcases/c.py\n  - testcases/d.py\n")
+    (tmp_path / "testsuite_collections" / "dist.yml").write_text(
+        "execution_method: distributed\ndistribute: case\nscheduling: yaml\n"
+        "testsuites:\n  - testsuites/one.yml\n  - testsuites/two.yml\n"
+    )
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def coordinator_url(project):
+    api_server = importlib.import_module("seleniumfw.api_server")
+    server = werkzeug_serving.make_server("127.0.0.1", 0, api_server.app, threaded=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_port}"
+    finally:
+        server.shutdown()
+        thread.join()
+
+
+def test_two_workers_merge_into_one_report(coordinator_url):
+    from seleniumfw.distributed import Worker, build_work_items, run_distributed
+    from seleniumfw.plan import load_yaml
+
+    workers = [
+        Worker(coordinator_url, name=name, heartbeat_interval=1, poll_interval=0.1, idle_timeout=5)
+        for name in ("w1", "w2")
+    ]
+    threads = [threading.Thread(target=w.run, daemon=True) for w in workers]
+    for t in threads:
+        t.start()
+
+    spec = load_yaml("testsuite_collections/dist.yml")
+    items = build_work_items(spec, "case")
+    job = run_distributed(coordinator_url, "testsuite_collections/dist.yml", items, poll_interval=0.1, timeout=60)
+    for w in workers:
+        w._stop.set()
+    for t in threads:
+        t.join(timeout=10)
+
+    assert job["status"] == "finished"
+    assert job["done"] == job["total"] == 4
+    assert {item["result"]["worker"] for item in job["items"]} == {"w1", "w2"}
+
+    with open(os.path.join(job["report_dir"], "result.json")) as f:
+        merged = json.load(f)
+    statuses = {case["name"]: case["status"] for case in merged["testcase_results"]}
+    assert statuses == {
+        "testcases/a.py": "PASSED", "testcases/b.py": "PASSED",
+        "testcases/c.py": "FAILED", "testcases/d.py": "PASSED",
+    }
+    # every item's report was unpacked before the merge ran
+    for item in merged["distributed"]["items"]:
+        assert item["artifacts"] and os.path.isfile(os.path.join(item["artifacts"], "result.json"))
+
+
+def test_stuck_lease_is_reassigned_while_worker_is_alive(tmp_path):
+    import time
+    from seleniumfw.distributed import Coordinator
+
+    coordinator = Coordinator(reports_dir=str(tmp_path), lease_timeout=0.2)
+    worker = coordinator.register("w1")
+    job = coordinator.submit("c.yml", [{"suite": "testsuites/one.yml", "cases": None}])
+    item = coordinator.next_item(worker["id"])
+    time.sleep(0.3)
+    assert coordinator.heartbeat(worker["id"])
+    assert coordinator.reap() == [item["id"]]
+    assert coordinator.job_status(job["id"])["pending"] == 1
+    assert coordinator.next_item(worker["id"])["leases"] == 2
+
+
+def test_undelivered_result_releases_the_item(coordinator_url, monkeypatch):
+    import requests
+    from seleniumfw import distributed
+
+    api_server = importlib.import_module("seleniumfw.api_server")
+    real_post = requests.post
+
+    def post(url, *args, **kwargs):
+        if url.endswith("/result"):
+            raise requests.ConnectionError("coordinator unreachable")
+        return real_post(url, *args, **kwargs)
+
+    monkeypatch.setattr(distributed.requests, "post", post)
+    worker = distributed.Worker(coordinator_url, name="w1", poll_interval=0.01)
+    worker.register()
+    job = api_server.coordinator.submit("c.yml", [{"suite": "testsuites/one.yml", "cases": ["testcases/a.py"]}])
+    item = worker._next_item()
+
+    assert worker._post_result(item, {"suite_path": item["suite"], "report_dir": None, "testcase_results": []}) is False
+    status = api_server.coordinator.job_status(job["id"])
+    assert (status["pending"], status["leased"]) == (1, 0)
+
+
+def test_distributed_run_can_be_rerun(coordinator_url):
+    from seleniumfw.distributed import Worker
+    from seleniumfw.plan import load_yaml
+    from seleniumfw.rerun import build_rerun_plan
+    from seleniumfw.runner import Runner
+
+    worker = Worker(coordinator_url, name="w1", heartbeat_interval=1, poll_interval=0.1, idle_timeout=5)
+    thread = threading.Thread(target=worker.run, daemon=True)
+    thread.start()
+    spec = dict(load_yaml("testsuite_collections/dist.yml"), coordinator_url=coordinator_url)
+    Runner()._run_distributed("testsuite_collections/dist.yml", spec)
+    worker._stop.set()
+    thread.join(timeout=10)
+
+    plan = build_rerun_plan("latest")
+    assert plan["collection"] == "testsuite_collections/dist.yml"
+    assert {s["suite_path"] for s in plan["suites"]} == {"testsuites/one.yml", "testsuites/two.yml"}
+    # both point at the merged report; rerun_failed keeps each suite's own cases
+    assert all(s["cases"] == ["testcases/c.py"] for s in plan["suites"])
+    rerun = Runner().rerun_failed("latest")
+    assert [(r["suite_path"], [c["name"] for c in r["testcase_results"]]) for r in rerun] == [
+        ("testsuites/two.yml", ["testcases/c.py"]),
+    ]
@@ -0,0 +1,67 @@
+"""
+Memory of pre-warmed browsers: the prewarmer launches on its own thread,
+yet the RSS of what it starts is charged to the suite that created it.
+"""
+import subprocess
+import sys
+import types
+
+import pytest
+
+pytest.importorskip("selenium")
+
+# a stand-in "browser": a process holding ~40MB of touched memory
+BROWSER = "b = bytearray(40 * 1024 * 1024)\nfor i in range(0, len(b), 4096): b[i] = 1\nimport time; time.sleep(60)"
+
+
+@pytest.fixture
+def monitor(monkeypatch):
+    from seleniumfw import memory
+    mon = memory.MemoryMonitor(interval=0.1)
+    monkeypatch.setattr(memory, "_monitor", mon)
+    return mon
+
+
+@pytest.fixture
+def fake_chrome(monkeypatch):
+    from seleniumfw import browser_factory
+    procs = []
+
+    def chrome(options=None):
+        proc = subprocess.Popen([sys.executable, "-c", BROWSER])
+        procs.append(proc)
+        return types.SimpleNamespace(
+            service=types.SimpleNamespace(process=proc),
+            save_screenshot=lambda *a, **kw: True,
+            quit=lambda: (proc.kill(), proc.wait()),
+        )
+
+    monkeypatch.setattr(browser_factory.webdriver, "Chrome", chrome)
+    yield procs
+    for proc in procs:
+        proc.kill()
+        proc.wait()
+
+
+def test_prewarmed_driver_counts_toward_its_suite(monitor, fake_chrome):
+    import time
+    from seleniumfw.driver_prewarmer import DriverPrewarmer
+    from seleniumfw.thread_context import delete_context, set_context
+
+    set_context("suite_path", "testsuites/warm.yml")
+    try:
+        prewarmer = DriverPrewarmer(depth=1, browser="chrome", args=[], max_launches=1).start()
+    finally:
+        delete_context("suite_path")
+    driver = prewarmer.take("chrome", [])
+    assert driver is not None
+
+    # let the stand-in touch its memory, then sample it
+    deadline = time.time() + 10
+    while time.time() < deadline and (monitor.peak_mb("testsuites/warm.yml") or 0) < 30:
+        time.sleep(0.2)
+        monitor.sample()
+    prewarmer.stop()
+
+    assert monitor.peak_mb("testsuites/warm.yml") >= 30
+    assert monitor.peak_mb(None) is None
@@ -0,0 +1,50 @@
+"""
+ScreenshotScaler caches: scaled copies are shared only within one report,
+forgotten when the report is released, and failures are not kept.
+"""
+import shutil
+import time
+
+import pytest
+
+Image = pytest.importorskip("PIL.Image")
+
+
+@pytest.fixture
+def scaler():
+    from seleniumfw.screenshot_scaler import ScreenshotScaler
+    return ScreenshotScaler(dpi=72, workers=2)
+
+
+def _screenshot(path):
+    Image.new("RGB", (1600, 1000), (200, 30, 30)).save(path)
+    return str(path)
+
+
+def test_copies_are_shared_within_a_report_only(tmp_path, scaler):
+    a, b = tmp_path / "a", tmp_path / "b"
+    a.mkdir()
+    b.mkdir()
+    first = _screenshot(a / "one.png")
+    second = shutil.copy(first, a / "two.png")
+    other = shutil.copy(first, b / "one.png")
+
+    assert scaler.scaled(first, str(a)) == scaler.scaled(second, str(a))
+    embedded = scaler.scaled(other, str(b))
+    assert embedded.startswith(str(b))
+
+    scaler.release(str(a))
+    scaler.release(str(b))
+    assert scaler._scopes == {}
+
+
+def test_failed_jobs_are_not_cached(tmp_path, scaler):
+    broken = tmp_path / "broken.png"
+    broken.write_bytes(b"not an image")
+
+    assert scaler.scaled(str(broken), str(tmp_path)) == str(broken)
+    scope = scaler._scopes[str(tmp_path)]
+    deadline = time.time() + 5  # dropped by the futures' done callbacks
+    while time.time() < deadline and (scope["jobs"] or scope["content"]):
+        time.sleep(0.01)
+    assert scope["jobs"] == {} and scope["content"] == {}